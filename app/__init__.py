@@ -1,6 +1,24 @@
-from flask import Flask
-from .server import bp, SECRET_KEY
+def create_app():
+    """Flask 앱을 만들고 로깅·기본 회의 DB 를 준비합니다.
 
-app = Flask(__name__, template_folder="templates", static_folder="static")
-app.secret_key = SECRET_KEY
-app.register_blueprint(bp)
+    무거운 초기화는 여기서만 일어나므로, QR 프로세스 풀처럼 ``app`` 패키지의
+    하위 모듈만 import 하는 곳에서는 DB 를 열거나 로깅을 설정하지 않습니다.
+    """
+    from flask import Flask
+
+    from . import server
+
+    app = Flask(__name__, template_folder="templates", static_folder="static")
+    server.init_app(app)
+    # 기본 회의는 기존 경로 그대로, 나머지 회의는 /m/<회의ID>/... 아래에서 같은 라우트를 사용
+    app.register_blueprint(server.bp)
+    app.register_blueprint(server.bp, url_prefix="/m/<meeting_id>", name="meeting")
+    return app
+
+
+def __getattr__(name):
+    # gunicorn app:app / flask --app app 이 처음 찾을 때 앱을 만듦
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
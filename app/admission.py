@@ -0,0 +1,94 @@
+"""요청 종류별 동시 실행 수 제한과 과부하 시 빠른 거절 (admission control).
+
+투표가 몰리면 모든 요청이 SQLite 쓰기 잠금·커넥션 풀 앞에서 함께 느려지고
+gevent greenlet 이 시간 초과까지 쌓입니다. 요청을 종류(class)별로 나눠
+
+- 종류마다 동시에 실행하는 요청 수(``limit``)와 기다릴 수 있는 요청 수(``queue``)를
+  제한하고, 대기열이 가득 찼거나 ``max_wait`` 안에 차례가 오지 않으면 바로 거절하며
+- ``yields_to`` 에 적은 종류의 요청이 기다리는 동안에는 들어가지 않게 해
+  (예: 토큰 생성·내보내기는 투표 제출이 밀려 있으면 양보) 우선순위를 줍니다.
+
+워커(프로세스)별 제한이며 gevent 워커에서는 ``threading`` 이 greenlet 용으로
+바뀌므로 같은 코드가 greenlet 사이에서 동작합니다.
+"""
+import threading
+import time
+
+QUEUE_FULL = "queue_full"
+TIMEOUT = "timeout"
+
+
+class AdmissionClass:
+    """요청 종류 하나의 제한. ``limit`` 이 0 이면 제한하지 않습니다."""
+
+    def __init__(self, name, limit, queue=0, yields_to=()):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.yields_to = tuple(yields_to)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = {QUEUE_FULL: 0, TIMEOUT: 0}
+
+
+class AdmissionController:
+    def __init__(self, classes, max_wait=5.0):
+        self.classes = {c.name: c for c in classes}
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+
+    def _can_enter(self, c):
+        if c.limit and c.active >= c.limit:
+            return False
+        return not any(self.classes[name].waiting for name in c.yields_to)
+
+    def acquire(self, name):
+        """``name`` 종류의 실행 자리를 얻으면 ``(True, 대기 시간)``, 거절되면
+        ``(False, 사유)`` 를 돌려줍니다. 자리를 얻었으면 ``release`` 로 반납해야 합니다."""
+        c = self.classes[name]
+        with self._cond:
+            if self._can_enter(c):
+                c.active += 1
+                return True, 0.0
+            if c.waiting >= c.queue:
+                c.rejected[QUEUE_FULL] += 1
+                return False, QUEUE_FULL
+            start = time.monotonic()
+            deadline = start + self.max_wait
+            c.waiting += 1
+            try:
+                while not self._can_enter(c):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        c.rejected[TIMEOUT] += 1
+                        return False, TIMEOUT
+                    self._cond.wait(remaining)
+                c.active += 1
+                return True, time.monotonic() - start
+            finally:
+                c.waiting -= 1
+                # 대기자가 줄면 이 종류에 양보하던 요청이 들어갈 수 있음
+                self._cond.notify_all()
+
+    def release(self, name):
+        with self._cond:
+            self.classes[name].active -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        """{(종류, 상태): 값} — 실행 중(active)·대기 중(waiting) 요청 수."""
+        with self._cond:
+            values = {}
+            for c in self.classes.values():
+                values[(c.name, "active")] = c.active
+                values[(c.name, "waiting")] = c.waiting
+            return values
+
+    def rejections(self):
+        """{(종류, 사유): 거절 수}"""
+        with self._cond:
+            return {
+                (c.name, reason): count
+                for c in self.classes.values()
+                for reason, count in c.rejected.items()
+            }
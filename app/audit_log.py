@@ -0,0 +1,56 @@
+import csv
+import io
+from datetime import datetime
+
+AUDIT_HEADER = ['timestamp', 'vote_id', 'token', 'choice']
+
+INSERT_AUDIT_SQL = "INSERT INTO audit_log (timestamp, vote_id, token, choice) VALUES (?, ?, ?, ?)"
+
+
+class AuditLog:
+    """투표 감사 로그.
+
+    - 투표 INSERT 와 같은 트랜잭션에서 append-only ``audit_log`` 테이블에 쓰므로,
+      커밋된 투표는 빠짐없이 (커밋 직후 프로세스가 죽어도), 롤백된 투표는 전혀 남지 않습니다.
+    - 모든 워커·머신이 같은 DB 에 쓰므로 줄이 섞이지 않고, 토큰·표결을 지워도 남습니다.
+    - 내보낼 때 CSV 로 만들며, 이전 버전이 ``log_dir`` 에 남긴 ``votes_*.csv`` 도 함께 내보냅니다.
+    """
+
+    def __init__(self, log_dir):
+        self.log_dir = log_dir
+
+    @staticmethod
+    def record(conn, ballots):
+        """(vote_id, token, choice) 목록을 호출한 쪽의 트랜잭션 안에서 기록합니다."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn.executemany(
+            INSERT_AUDIT_SQL, [(now, vote_id, token, choice) for vote_id, token, choice in ballots]
+        )
+
+    def segment_files(self):
+        """이전 버전이 파일로 남긴 감사 로그 세그먼트 경로 (이름순)."""
+        return sorted(p for p in self.log_dir.glob("votes_*.csv") if p.is_file())
+
+    @staticmethod
+    def stream_csv(connect, fetch_size=500):
+        """감사 로그 테이블을 기록 순서대로 CSV 조각으로 생성합니다 (메모리는 ``fetch_size`` 행 분량)."""
+        conn = connect()
+        try:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(AUDIT_HEADER)
+            cursor = conn.execute(
+                "SELECT timestamp, vote_id, token, choice FROM audit_log ORDER BY id"
+            )
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                yield buf.getvalue().encode("utf-8")
+                buf.seek(0)
+                buf.truncate()
+            yield buf.getvalue().encode("utf-8")
+        finally:
+            conn.rollback()
+            conn.close()
@@ -0,0 +1,62 @@
+import threading
+
+BALLOT_VERSION_KEY = "ballot_version"
+
+BUMP_VERSION_SQL = (
+    "INSERT INTO settings (key, value) VALUES ('ballot_version', '1') "
+    "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(settings.value AS INTEGER) + 1 AS VARCHAR)"
+)
+
+
+class BallotSnapshot:
+    __slots__ = ("version", "meeting_title", "grouped_votes", "html")
+
+    def __init__(self, version, meeting_title, grouped_votes, html):
+        self.version = version
+        self.meeting_title = meeting_title
+        self.grouped_votes = grouped_votes
+        self.html = html
+
+
+class BallotCache:
+    """활성 투표지(/vote)의 세대별 스냅샷 캐시.
+
+    세대 번호는 ``settings`` 테이블의 ``ballot_version`` 행에 있으며 투표지를
+    바꾸는 관리자 라우트가 같은 트랜잭션에서 ``bump()`` 합니다. 워커들은 요청마다
+    이 한 행만 읽고, 세대가 바뀌었을 때만 스냅샷을 다시 만듭니다.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def bump(conn):
+        conn.execute(BUMP_VERSION_SQL)
+
+    @staticmethod
+    def version(conn):
+        row = conn.execute(
+            "SELECT value FROM settings WHERE key = ?", (BALLOT_VERSION_KEY,)
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def get(self, conn, build):
+        """현재 세대의 스냅샷을 반환합니다. ``build(conn, version)`` 으로 새로 만듭니다."""
+        version = self.version(conn)
+        snap = self._snapshot
+        if snap is not None and snap.version == version:
+            self.hits += 1
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            if snap is not None and snap.version == version:
+                self.hits += 1
+                return snap
+            self.misses += 1
+            # 세대를 먼저 읽고 데이터를 읽으므로, 그 사이 변경이 있으면 다음 요청에서 다시 만듦
+            snap = build(conn, version)
+            self._snapshot = snap
+            return snap
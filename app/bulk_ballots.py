@@ -0,0 +1,98 @@
+from .keys import VOTES_BY_UUID
+from .vote_options import normalize_label
+
+OK = "ok"
+INVALID = "invalid"
+INVALID_TOKEN = "invalid_token"
+INACTIVE_VOTE = "inactive_vote"
+INVALID_CHOICE = "invalid_choice"
+DUPLICATE = "duplicate"
+
+# SQLite 바인딩 변수 한도(기본 999) 아래로 IN (...) 을 나눔
+_CHUNK = 500
+
+
+def _chunks(values):
+    values = list(values)
+    for i in range(0, len(values), _CHUNK):
+        yield values[i:i + _CHUNK]
+
+
+def _select_in(conn, sql, values):
+    rows = []
+    for chunk in _chunks(values):
+        placeholders = ",".join("?" * len(chunk))
+        rows.extend(conn.execute(sql.format(placeholders), chunk).fetchall())
+    return rows
+
+
+def parse_ballots(payload):
+    """요청 JSON 에서 투표 목록을 꺼냅니다. ``[...]`` 와 ``{"ballots": [...]}`` 를 모두 받습니다."""
+    if isinstance(payload, dict):
+        payload = payload.get("ballots")
+    if not isinstance(payload, list):
+        raise ValueError("ballots 배열이 필요합니다.")
+    return payload
+
+
+def validate_ballots(conn, ballots, active_options):
+    """투표 목록을 집합 단위로 검증합니다.
+
+    토큰과 기존 투표 내역을 각각 한 번의 IN 조회로 읽고, 활성 표결·선택지는
+    ``active_options`` ({vote_id: VoteOptions}) 에서 찾으므로 투표 수와 무관하게
+    쿼리 수가 일정합니다. 선택은 ``option_id`` (정수) 또는 ``choice`` (선택지 이름) 로 받습니다.
+    (vote_id, token, option_id) 삽입 목록과 요청 순서대로의 결과 목록을 반환합니다.
+    """
+    results = []
+    candidates = []
+    for index, ballot in enumerate(ballots):
+        if not isinstance(ballot, dict):
+            results.append({"index": index, "status": INVALID})
+            continue
+        token, vote_id = ballot.get("token"), ballot.get("vote_id")
+        choice = ballot.get("option_id", ballot.get("choice"))
+        result = {"index": index, "token": token, "vote_id": vote_id, "status": OK}
+        if not all(isinstance(v, str) and v for v in (token, vote_id)) or not (
+            (isinstance(choice, int) and not isinstance(choice, bool))
+            or (isinstance(choice, str) and choice)
+        ):
+            result["status"] = INVALID
+        else:
+            candidates.append((result, vote_id, token, choice))
+        results.append(result)
+
+    tokens = {token for _, _, token, _ in candidates}
+
+    known_tokens = {
+        row[0] for row in _select_in(conn, "SELECT token FROM tokens WHERE token IN ({})", tokens)
+    }
+    already_voted = {
+        (row[0], row[1])
+        for row in _select_in(
+            conn,
+            f"SELECT tokens.token, vote_items.vote_id FROM {VOTES_BY_UUID} WHERE tokens.token IN ({{}})",
+            tokens,
+        )
+    }
+
+    insert_queue = []
+    for result, vote_id, token, choice in candidates:
+        options = active_options.get(vote_id)
+        if isinstance(choice, int):
+            option_id = choice if options and 1 <= choice <= len(options.labels) else None
+        else:
+            option_id = options.ids.get(normalize_label(choice)) if options else None
+        if token not in known_tokens:
+            result["status"] = INVALID_TOKEN
+        elif options is None:
+            result["status"] = INACTIVE_VOTE
+        elif option_id is None:
+            result["status"] = INVALID_CHOICE
+        elif (token, vote_id) in already_voted:
+            result["status"] = DUPLICATE
+        else:
+            # 같은 요청 안의 중복도 두 번째부터 제외
+            already_voted.add((token, vote_id))
+            result["option_id"] = option_id
+            insert_queue.append((vote_id, token, option_id))
+    return insert_queue, results
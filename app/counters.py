@@ -0,0 +1,159 @@
+from collections import Counter
+
+from .keys import TOKEN_ID, item_ids_sql
+
+USED_TOKENS = "used_tokens"
+TOTAL_TOKENS = "total_tokens"
+TOTAL_AGENDAS = "total_agendas"
+TOTAL_ITEMS = "total_items"
+ACTIVE_ITEMS = "active_items"
+
+COUNTER_NAMES = (USED_TOKENS, TOTAL_TOKENS, TOTAL_AGENDAS, TOTAL_ITEMS, ACTIVE_ITEMS)
+
+
+class DashboardCounters:
+    """관리자 대시보드 통계를 요약 테이블로 유지합니다.
+
+    - ``dashboard_counters`` : 이름별 전체 카운터 (사용/전체 토큰, 안건, 표결, 진행 중 표결)
+    - ``agenda_counters``    : 안건별 표결 수와 진행 중 표결 수
+
+    각 카운터는 원본 테이블을 바꾸는 라우트와 같은 트랜잭션에서 갱신되므로
+    대시보드는 투표·토큰 수와 무관하게 몇 행만 읽습니다. 어긋난 경우
+    ``recompute()`` 로 원본 테이블에서 다시 계산합니다 (시작 시와 ``flask recompute-counters``).
+    """
+
+    @staticmethod
+    def _add(conn, name, delta):
+        if delta:
+            conn.execute(
+                "INSERT INTO dashboard_counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = dashboard_counters.value + excluded.value",
+                (name, delta),
+            )
+
+    @staticmethod
+    def _add_agenda(conn, agenda_id, items=0, active=0):
+        conn.execute(
+            "INSERT INTO agenda_counters (agenda_id, items, active_items) VALUES (?, ?, ?) "
+            "ON CONFLICT(agenda_id) DO UPDATE SET items = agenda_counters.items + excluded.items, "
+            "active_items = agenda_counters.active_items + excluded.active_items",
+            (agenda_id, items, active),
+        )
+
+    def record(self, conn, ballots):
+        """투표 INSERT 직후 같은 트랜잭션에서 호출합니다. 첫 투표인 토큰만 사용 토큰으로 셉니다."""
+        first = 0
+        for token, inserted in Counter(token for _vote_id, token, _ in ballots).items():
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM votes WHERE token_id = {TOKEN_ID}", (token,)
+            ).fetchone()[0]
+            if total == inserted:
+                first += 1
+        self._add(conn, USED_TOKENS, first)
+
+    def tokens_added(self, conn, count):
+        self._add(conn, TOTAL_TOKENS, count)
+
+    def tokens_cleared(self, conn):
+        # 토큰을 지워도 투표 기록은 남으므로 사용 토큰 수는 유지
+        conn.execute(
+            "INSERT INTO dashboard_counters (name, value) VALUES (?, 0) "
+            "ON CONFLICT(name) DO UPDATE SET value = 0",
+            (TOTAL_TOKENS,),
+        )
+
+    def agenda_created(self, conn, agenda_id):
+        self._add(conn, TOTAL_AGENDAS, 1)
+        self._add_agenda(conn, agenda_id)
+
+    def item_created(self, conn, agenda_id):
+        self._add(conn, TOTAL_ITEMS, 1)
+        self._add_agenda(conn, agenda_id, items=1)
+
+    def item_activity(self, conn, vote_id, delta):
+        """표결 시작(+1)/종료(-1)로 실제 상태가 바뀐 경우에만 호출합니다."""
+        self._add(conn, ACTIVE_ITEMS, delta)
+        conn.execute(
+            "UPDATE agenda_counters SET active_items = active_items + ? "
+            "WHERE agenda_id = (SELECT agenda_id FROM vote_items WHERE vote_id = ?)",
+            (delta, vote_id),
+        )
+
+    def forget_items(self, conn, vote_ids):
+        """표결과 그 투표를 지우기 전에 같은 트랜잭션에서 호출합니다."""
+        if not vote_ids:
+            return
+        placeholders = ",".join("?" * len(vote_ids))
+        item_ids = item_ids_sql(len(vote_ids))
+        # 지울 표결에만 투표한 토큰은 더 이상 사용 토큰이 아님
+        lost = conn.execute(
+            f"""
+            SELECT COUNT(DISTINCT v.token_id) FROM votes v
+            WHERE v.item_id IN {item_ids}
+              AND NOT EXISTS (
+                  SELECT 1 FROM votes o
+                  WHERE o.token_id = v.token_id AND o.item_id NOT IN {item_ids}
+              )
+            """,
+            list(vote_ids) * 2,
+        ).fetchone()[0]
+        self._add(conn, USED_TOKENS, -lost)
+
+        for agenda_id, items, active in conn.execute(
+            "SELECT agenda_id, COUNT(*), SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) "
+            f"FROM vote_items WHERE vote_id IN ({placeholders}) GROUP BY agenda_id",
+            list(vote_ids),
+        ).fetchall():
+            self._add(conn, TOTAL_ITEMS, -items)
+            self._add(conn, ACTIVE_ITEMS, -active)
+            self._add_agenda(conn, agenda_id, items=-items, active=-active)
+
+    def agenda_deleted(self, conn, agenda_id):
+        if conn.execute(
+            "DELETE FROM agenda_counters WHERE agenda_id = ?", (agenda_id,)
+        ).rowcount:
+            self._add(conn, TOTAL_AGENDAS, -1)
+
+    def recompute(self, conn):
+        """원본 테이블로부터 모든 카운터를 다시 계산합니다."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM dashboard_counters")
+            conn.execute("DELETE FROM agenda_counters")
+            values = {
+                USED_TOKENS: "SELECT COUNT(DISTINCT token_id) FROM votes",
+                TOTAL_TOKENS: "SELECT COUNT(*) FROM tokens",
+                TOTAL_AGENDAS: "SELECT COUNT(*) FROM vote_agendas",
+                TOTAL_ITEMS: "SELECT COUNT(*) FROM vote_items",
+                ACTIVE_ITEMS: "SELECT COUNT(*) FROM vote_items WHERE is_active = TRUE",
+            }
+            conn.executemany(
+                "INSERT INTO dashboard_counters (name, value) VALUES (?, ?)",
+                [(name, conn.execute(sql).fetchone()[0]) for name, sql in values.items()],
+            )
+            conn.execute(
+                """
+                INSERT INTO agenda_counters (agenda_id, items, active_items)
+                SELECT va.agenda_id, COUNT(vi.vote_id),
+                       COALESCE(SUM(CASE WHEN vi.is_active = TRUE THEN 1 ELSE 0 END), 0)
+                FROM vote_agendas va
+                LEFT JOIN vote_items vi ON vi.agenda_id = va.agenda_id
+                GROUP BY va.agenda_id
+                """
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def snapshot(self, conn):
+        """({이름: 값}, {agenda_id: (표결 수, 진행 중 수)}) 를 반환합니다."""
+        totals = dict.fromkeys(COUNTER_NAMES, 0)
+        totals.update(
+            (r[0], r[1]) for r in conn.execute("SELECT name, value FROM dashboard_counters")
+        )
+        agendas = {
+            r[0]: (r[1], r[2])
+            for r in conn.execute("SELECT agenda_id, items, active_items FROM agenda_counters")
+        }
+        return totals, agendas
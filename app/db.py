@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import weakref
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+# 커넥션 풀 / SQLite PRAGMA 설정 (환경 변수로 조정 가능)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "16"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+# 여러 머신이 동시에 스키마를 만들거나 마이그레이션하지 않도록 잡는 PostgreSQL advisory lock 키
+SCHEMA_LOCK_KEY = 0x766F7465  # "vote"
+
+# gunicorn --preload: 마스터가 create_app 에서 연 풀 커넥션을 fork 한 워커들이 함께 물려받지
+# 않도록, 자식 프로세스에서는 풀을 비우고 새로 연결함 (close=False: 부모의 커넥션은 닫지 않음)
+_engines = weakref.WeakSet()
+
+
+def _dispose_after_fork():
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
+def _apply_pragmas(dbapi_conn):
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+        cur.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        # 음수 값은 KiB 단위 페이지 캐시 크기
+        cur.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cur.close()
+
+
+def is_database_url(target):
+    return "://" in str(target)
+
+
+def postgres_url(url):
+    # Fly/Heroku 형식(postgres://)도 받아 psycopg(3) 드라이버로 연결
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("postgres", "postgresql"):
+        scheme = "postgresql+psycopg"
+    return f"{scheme}{sep}{rest}"
+
+
+def create_db_engine(target, create=True):
+    """커넥션 풀을 가진 엔진을 생성합니다.
+
+    ``target`` 이 파일 경로면 WAL 모드 SQLite, ``postgresql://`` URL 이면 PostgreSQL
+    (여러 앱 머신이 한 DB 를 공유). SQLAlchemy 세션과 ``db()`` 의 raw 커넥션이 모두
+    이 풀을 공유합니다. ``create=False`` 면 SQLite 파일이 없을 때 새로 만들지 않고
+    연결이 실패합니다 (다른 워커가 옮긴 회의 샤드 자리에 빈 DB 가 생기지 않게).
+    """
+    if is_database_url(target):
+        engine = create_engine(
+            postgres_url(target),
+            poolclass=QueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            # 머신이 멈췄다 깨어나면 끊긴 커넥션이 남아 있을 수 있음
+            pool_pre_ping=True,
+        )
+        _engines.add(engine)
+        return engine
+
+    db_path = target
+    connect_args = {
+        "check_same_thread": False,
+        "timeout": BUSY_TIMEOUT_MS / 1000,
+        # 커넥션별 prepared statement 캐시
+        "cached_statements": STATEMENT_CACHE_SIZE,
+    }
+    if create:
+        url, connect = f"sqlite:///{db_path}", {"connect_args": connect_args}
+    else:
+        # mode=rw: 파일이 없으면 만들지 않고 연결이 실패함
+        uri = f"file:{quote(str(db_path))}?mode=rw"
+        url, connect = "sqlite://", {"creator": lambda: sqlite3.connect(uri, uri=True, **connect_args)}
+    engine = create_engine(
+        url,
+        poolclass=QueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_pre_ping=False,
+        **connect,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, connection_record):
+        _apply_pragmas(dbapi_conn)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, connection_record):
+        # db() 에서 지정한 row_factory 가 ORM 세션으로 새지 않도록 초기화
+        if dbapi_conn is not None:
+            dbapi_conn.row_factory = None
+
+    _engines.add(engine)
+    return engine
+
+
+def raw_connection(engine):
+    """풀에서 sqlite3 커넥션을 빌려옵니다. ``close()`` 시 풀로 반환됩니다.
+
+    PostgreSQL 이면 같은 인터페이스로 감싼 커넥션을 돌려줍니다 (``app.postgres``).
+    """
+    conn = engine.raw_connection()
+    if engine.dialect.name == "postgresql":
+        from .postgres import PgConnection
+        return PgConnection(conn, engine.dialect.dbapi)
+    conn.driver_connection.row_factory = sqlite3.Row
+    return conn
+
+
+def table_names(engine, conn):
+    if engine.dialect.name == "postgresql":
+        sql = "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()"
+    else:
+        sql = "SELECT name FROM sqlite_master WHERE type = 'table'"
+    return {row[0] for row in conn.execute(sql)}
+
+
+@contextmanager
+def schema_lock(engine, conn):
+    """스키마 생성·마이그레이션을 DB 단위로 직렬화합니다.
+
+    SQLite 는 ``--preload`` 로 한 프로세스만 시작 작업을 하고 마이그레이션은
+    BEGIN IMMEDIATE 로 직렬화되므로 따로 잠그지 않습니다.
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    conn.execute("SELECT pg_advisory_lock(?)", (SCHEMA_LOCK_KEY,))
+    try:
+        yield
+    finally:
+        conn.execute("SELECT pg_advisory_unlock(?)", (SCHEMA_LOCK_KEY,))
+
+
+def pool_stats(engine):
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "timeout": POOL_TIMEOUT,
+    }
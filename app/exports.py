@@ -0,0 +1,148 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from .keys import ITEM_ID
+from .qr_batch import ZipStreamBuffer
+from .vote_options import VoteOptions, parse_options
+
+EXPORT_KINDS = ("tallies", "ballots")
+EXPORT_FORMATS = ("csv", "ndjson")
+
+TALLY_COLUMNS = [
+    "agenda_id", "agenda_title", "vote_id", "vote_title", "is_active",
+    "option_id", "option", "count", "total", "percent",
+]
+# 익명 투표 기록: 토큰·시각 없이 표결별 순번과 선택만 내보냄
+BALLOT_COLUMNS = ["agenda_id", "agenda_title", "vote_id", "vote_title", "seq", "option_id", "option"]
+
+_ITEMS_SQL = """
+    SELECT va.agenda_id, va.title, vi.vote_id, vi.title, vi.options, vi.is_active,
+           COALESCE(t.total, 0)
+    FROM vote_items vi
+    JOIN vote_agendas va ON vi.agenda_id = va.agenda_id
+    LEFT JOIN vote_tally_totals t ON t.vote_id = vi.vote_id
+    {where}
+    ORDER BY va.created_at ASC, vi.created_at ASC, vi.vote_id ASC
+"""
+
+
+def _fetch(cursor, size):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def _items(conn, agenda_id):
+    where, params = ("WHERE vi.agenda_id = ?", (agenda_id,)) if agenda_id else ("", ())
+    return conn.execute(_ITEMS_SQL.format(where=where), params).fetchall()
+
+
+def iter_tally_rows(conn, agenda_id=None, fetch_size=500):
+    """표결·선택지별 득표 행을 집계 요약 테이블에서 읽어 생성합니다 (득표 0 인 선택지 포함)."""
+    for a_id, a_title, vote_id, v_title, raw_options, is_active, total in _items(conn, agenda_id):
+        counts = dict(conn.execute(
+            "SELECT option_id, count FROM vote_tallies WHERE vote_id = ?", (vote_id,)
+        ).fetchall())
+        options = VoteOptions(vote_id, parse_options(raw_options), bool(is_active))
+        option_ids = [option_id for option_id, _ in options.choices()]
+        option_ids += sorted(set(counts) - set(option_ids))
+        for option_id in option_ids:
+            count = counts.get(option_id, 0)
+            yield [
+                a_id, a_title, vote_id, v_title, int(bool(is_active)),
+                option_id, options.label(option_id), count, total,
+                round(count / total * 100, 1) if total else 0.0,
+            ]
+
+
+def iter_ballot_rows(conn, agenda_id=None, fetch_size=500):
+    """익명 투표 기록을 표결별로 ``fetchmany`` 단위로 읽어 생성합니다."""
+    for a_id, a_title, vote_id, v_title, raw_options, is_active, _total in _items(conn, agenda_id):
+        options = VoteOptions(vote_id, parse_options(raw_options), bool(is_active))
+        cursor = conn.execute(
+            f"SELECT option_id FROM votes WHERE item_id = {ITEM_ID} ORDER BY option_id", (vote_id,)
+        )
+        for seq, (option_id,) in enumerate(_fetch(cursor, fetch_size), 1):
+            yield [a_id, a_title, vote_id, v_title, seq, option_id, options.label(option_id)]
+
+
+def stream_results(connect, kind, fmt, agenda_id=None, fetch_size=500):
+    """결과를 CSV/NDJSON 조각으로 생성합니다.
+
+    응답이 끝날 때까지 커넥션 하나를 빌려 한 읽기 트랜잭션(WAL 스냅샷)에서 읽으므로,
+    내보내는 동안 들어온 투표와 섞이지 않고 메모리는 ``fetch_size`` 행 분량만 씁니다.
+    """
+    columns, rows = (
+        (TALLY_COLUMNS, iter_tally_rows) if kind == "tallies" else (BALLOT_COLUMNS, iter_ballot_rows)
+    )
+    conn = connect()
+    try:
+        conn.execute("BEGIN")
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            # Excel 에서 한글이 깨지지 않도록 BOM 을 붙임
+            buf.write("\ufeff")
+            writer.writerow(columns)
+            for i, row in enumerate(rows(conn, agenda_id, fetch_size), 1):
+                writer.writerow(row)
+                if i % fetch_size == 0:
+                    yield buf.getvalue().encode("utf-8")
+                    buf.seek(0)
+                    buf.truncate()
+            yield buf.getvalue().encode("utf-8")
+        else:
+            chunk = []
+            for row in rows(conn, agenda_id, fetch_size):
+                chunk.append(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                if len(chunk) >= fetch_size:
+                    yield ("\n".join(chunk) + "\n").encode("utf-8")
+                    chunk = []
+            if chunk:
+                yield ("\n".join(chunk) + "\n").encode("utf-8")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def stream_files_zip(paths, chunk_size=64 * 1024, members=()):
+    """파일들을 통째로 읽지 않고 ``chunk_size`` 씩 압축하며 ZIP 조각을 생성합니다.
+
+    ``members`` 의 (이름, bytes 조각 iterable) 는 파일 없이 만들어지는 대로 압축해 넣습니다.
+    """
+    buf = ZipStreamBuffer()
+    with ZipFile(buf, 'w', compression=ZIP_DEFLATED) as zipf:
+        for path in paths:
+            try:
+                info = ZipInfo.from_file(path, path.name)
+                info.compress_type = ZIP_DEFLATED
+                with open(path, 'rb') as src, zipf.open(info, 'w', force_zip64=True) as dst:
+                    while True:
+                        data = src.read(chunk_size)
+                        if not data:
+                            break
+                        dst.write(data)
+                        chunk = buf.drain()
+                        if chunk:
+                            yield chunk
+            except OSError as e:
+                logging.exception("ZIP에 파일 추가 실패: %s", e)
+            chunk = buf.drain()
+            if chunk:
+                yield chunk
+        for name, chunks in members:
+            info = ZipInfo(name, date_time=datetime.now().timetuple()[:6])
+            info.compress_type = ZIP_DEFLATED
+            with zipf.open(info, 'w', force_zip64=True) as dst:
+                for data in chunks:
+                    dst.write(data)
+                    chunk = buf.drain()
+                    if chunk:
+                        yield chunk
+    yield buf.drain()
@@ -0,0 +1,179 @@
+"""응답 캐시·압축 계층: 정적 파일 지문과 장기 캐시, gzip/brotli 압축, 투표지 ETag.
+
+행사장 Wi-Fi 처럼 대역폭이 좁은 곳에서 같은 화면을 여러 번 여는 휴대폰이 매번
+전체 바이트를 받지 않도록 합니다.
+
+- 정적 파일 URL 에는 내용 해시(``?v=``)를 붙이고, 해시가 맞는 요청은 1년 동안
+  재검증 없이 캐시하게 합니다 (배포로 내용이 바뀌면 URL 이 바뀜).
+- 정적 파일은 최고 압축률로 한 번만 압축해 메모리에 두고, HTML/JSON 응답은
+  일정 크기 이상일 때 요청마다 빠른 설정으로 압축합니다.
+- 투표지(/vote)는 투표지 세대·토큰 상태로 만든 ETag 가 같으면 렌더링 없이 304.
+
+brotli 는 선택 의존성이며 설치되어 있지 않으면 gzip 만 씁니다.
+"""
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+# 압축할 만한 Content-Type (이미지·폰트 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = frozenset({
+    "text/html", "text/css", "text/plain", "text/csv", "text/javascript",
+    "application/javascript", "application/json", "image/svg+xml",
+})
+# 지문이 붙은 정적 파일: 내용이 바뀌면 URL 이 바뀌므로 재검증 없이 캐시
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def accepted_encodings():
+    """클라이언트가 받는 압축 방식 (선호 순서)."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(request):
+    """``Accept-Encoding`` 에서 쓸 압축 방식을 고르고, 없으면 None."""
+    return request.accept_encodings.best_match(accepted_encodings())
+
+
+def compress(data, encoding, best=False):
+    """요청마다 압축하는 응답은 빠른 설정, 한 번만 압축하는 정적 파일은 최고 압축률."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+
+def _replace_body(response, data):
+    # send_file 의 파일 래퍼는 WSGI 서버가 닫지 않게 되므로 여기서 닫음
+    body = response.response
+    if hasattr(body, "close"):
+        body.close()
+    response.direct_passthrough = False
+    response.set_data(data)
+
+
+def is_compressible(response):
+    return response.mimetype in COMPRESSIBLE_TYPES
+
+
+def compress_response(response, encoding, min_size):
+    """완성된(스트리밍이 아닌) 응답 본문을 압축합니다. ``min_size`` 미만이면 그대로 둡니다."""
+    if (
+        encoding is None
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+class StaticAssets:
+    """정적 파일의 내용 해시(지문)와 미리 압축한 본문을 파일 mtime 기준으로 캐시합니다."""
+
+    def __init__(self, static_dir, template_dir=None):
+        self.static_dir = Path(static_dir)
+        self.template_dir = Path(template_dir) if template_dir else None
+        self._versions = {}
+        self._compressed = {}
+        self._build = None
+        self._lock = threading.Lock()
+
+    def _path(self, filename):
+        path = safe_join(str(self.static_dir), filename)
+        return Path(path) if path else None
+
+    def version(self, filename):
+        """``filename`` 내용의 짧은 해시. 파일이 없으면 None."""
+        path = self._path(filename)
+        try:
+            stat = path.stat() if path else None
+        except OSError:
+            return None
+        if stat is None:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._versions.get(filename)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+        with self._lock:
+            self._versions[filename] = (key, digest)
+        return digest
+
+    def compressed(self, filename, encoding):
+        """``filename`` 을 ``encoding`` 으로 압축한 본문 (처음 한 번만 압축)."""
+        path = self._path(filename)
+        stat = path.stat()
+        key = (filename, encoding)
+        cached = self._compressed.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns:
+            return cached[1]
+        data = compress(path.read_bytes(), encoding, best=True)
+        with self._lock:
+            self._compressed[key] = (stat.st_mtime_ns, data)
+        return data
+
+    def build(self):
+        """정적 파일·템플릿 전체의 해시. 배포로 화면이 바뀌면 투표지 ETag 도 바뀌게 합니다."""
+        if self._build is None:
+            digest = hashlib.sha256()
+            for root in filter(None, (self.static_dir, self.template_dir)):
+                for path in sorted(root.rglob("*")):
+                    if path.is_file():
+                        digest.update(str(path.relative_to(root)).encode())
+                        digest.update(path.read_bytes())
+            self._build = digest.hexdigest()[:12]
+        return self._build
+
+    def static_response(self, response, request, encoding, max_age):
+        """정적 파일 응답에 캐시 정책을 정하고, 받을 수 있으면 미리 압축한 본문으로 바꿉니다."""
+        filename = (request.view_args or {}).get("filename")
+        if filename is None:
+            return response
+        current = self.version(filename)
+        if current is not None and request.args.get("v") == current:
+            response.headers["Cache-Control"] = IMMUTABLE
+        elif max_age:
+            response.headers["Cache-Control"] = f"public, max-age={max_age}"
+        if not is_compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        if encoding is None or response.status_code != 200:
+            return response
+
+        # 압축한 표현은 ETag 를 구분하고, 그 ETag 로 재검증하면 304
+        etag, _ = response.get_etag()
+        if etag:
+            encoded_etag = f"{etag}-{encoding}"
+            if request.if_none_match.contains(encoded_etag):
+                response.status_code = 304
+                _replace_body(response, b"")
+                response.headers.pop("Accept-Ranges", None)
+                response.set_etag(encoded_etag)
+                return response
+        _replace_body(response, self.compressed(filename, encoding))
+        response.headers.pop("Accept-Ranges", None)
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            response.set_etag(encoded_etag)
+        return response
+
+
+def ballot_etag(*parts):
+    """투표지 화면의 (약한) ETag 값. 투표지 세대·회의·토큰 상태·빌드 해시로 만듭니다."""
+    return hashlib.sha256(
+        "\x1f".join(str(part) for part in parts).encode()
+    ).hexdigest()[:20]
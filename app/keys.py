@@ -0,0 +1,24 @@
+"""토큰·표결 UUID 와 DB 안의 정수 키 사이의 변환.
+
+``votes`` 와 그 UNIQUE/검색 인덱스는 36자 UUID 문자열 대신 ``tokens.id`` 와
+``vote_items.id`` (정수) 를 저장합니다. UUID 는 URL·폼·감사 로그·내보내기 같은
+바깥쪽에서만 쓰고, SQL 안에서는 아래 서브쿼리로 정수 키로 바꿉니다 (각각 UNIQUE
+인덱스 조회 한 번). 정수 키는 삭제 후에도 다시 쓰지 않으므로 (SQLite
+AUTOINCREMENT, PostgreSQL SERIAL) 토큰을 모두 지워도 남은 투표 기록이 새 토큰에
+붙지 않습니다.
+"""
+
+# 파라미터: token / vote_id (UUID 문자열)
+TOKEN_ID = "(SELECT id FROM tokens WHERE token = ?)"
+ITEM_ID = "(SELECT id FROM vote_items WHERE vote_id = ?)"
+
+# votes 를 UUID 로 읽을 때 (토큰을 지운 뒤 남은 투표는 빠짐)
+VOTES_BY_UUID = (
+    "votes JOIN tokens ON tokens.id = votes.token_id "
+    "JOIN vote_items ON vote_items.id = votes.item_id"
+)
+
+
+def item_ids_sql(count):
+    """표결 UUID ``count`` 개를 정수 키로 바꾸는 ``IN (...)`` 용 서브쿼리."""
+    return f"(SELECT id FROM vote_items WHERE vote_id IN ({','.join('?' * count)}))"
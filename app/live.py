@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import threading
+import time
+
+
+class _Subscriber:
+    """구독자 하나. 최신 payload 한 개만 보관하므로 밀린 갱신은 자연히 합쳐집니다."""
+
+    __slots__ = ("vote_id", "primed", "_latest", "_event", "_lock")
+
+    def __init__(self, vote_id):
+        self.vote_id = vote_id
+        self.primed = False
+        self._latest = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+
+    def push(self, payload):
+        with self._lock:
+            self._latest = payload
+            self.primed = True
+        self._event.set()
+
+    def get(self, timeout):
+        if not self._event.wait(timeout):
+            return None
+        with self._lock:
+            payload, self._latest = self._latest, None
+            self._event.clear()
+        return payload
+
+
+class TallyBroadcaster:
+    """표결 집계 변화를 구독자들에게 fan-out 합니다.
+
+    프로세스당 하나의 poller 가 ``1 / max_rate`` 초마다 구독 중인 vote_id 들의
+    총계를 한 번의 쿼리로 확인하고, 바뀐 표결만 스냅샷을 읽어 모든 구독자에게
+    전달합니다. DB 읽기 횟수는 구독자 수와 무관합니다.
+    """
+
+    def __init__(self, connect, tallies, max_rate=2.0, heartbeat=15.0):
+        self._connect = connect
+        self._tallies = tallies
+        self.interval = 1.0 / max_rate
+        self.heartbeat = heartbeat
+        self._subs = {}
+        self._last = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self.polls = 0
+
+    def _ensure_started(self):
+        if (self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+                and not self._stop.is_set()):
+            return
+        with self._lock:
+            if (self._thread is None or self._pid != os.getpid() or not self._thread.is_alive()
+                    or self._stop.is_set()):
+                self._pid = os.getpid()
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name="tally-broadcaster", daemon=True
+                )
+                self._thread.start()
+
+    def subscribe(self, vote_id, start=True):
+        sub = _Subscriber(vote_id)
+        with self._lock:
+            self._subs.setdefault(vote_id, set()).add(sub)
+            last = self._last.get(vote_id)
+        if last is not None:
+            sub.push(self._payload(last, None))
+        if start:
+            self._ensure_started()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subs.get(sub.vote_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.vote_id]
+                    self._last.pop(sub.vote_id, None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(s) for s in self._subs.values())
+
+    @staticmethod
+    def _payload(snap, prev):
+        prev_counts = prev.counts if prev is not None else {}
+        delta = {
+            choice: count - prev_counts.get(choice, 0)
+            for choice, count in snap.counts.items()
+            if count != prev_counts.get(choice, 0)
+        }
+        data = snap.as_dict()
+        data["delta"] = delta
+        return data
+
+    def poll_once(self):
+        with self._lock:
+            watched = {vid: list(subs) for vid, subs in self._subs.items()}
+        if not watched:
+            return
+        self.polls += 1
+        conn = self._connect()
+        try:
+            vote_ids = list(watched)
+            placeholders = ",".join("?" * len(vote_ids))
+            totals = dict.fromkeys(vote_ids, 0)
+            totals.update(
+                (r[0], r[1])
+                for r in conn.execute(
+                    f"SELECT vote_id, total FROM vote_tally_totals WHERE vote_id IN ({placeholders})",
+                    vote_ids,
+                )
+            )
+            for vote_id, subs in watched.items():
+                prev = self._last.get(vote_id)
+                if prev is not None and prev.total == totals[vote_id]:
+                    payload = self._payload(prev, None)
+                    targets = [s for s in subs if not s.primed]
+                else:
+                    snap = self._tallies.snapshot(conn, vote_id)
+                    payload = self._payload(snap, prev)
+                    with self._lock:
+                        if vote_id in self._subs:
+                            self._last[vote_id] = snap
+                    targets = subs
+                for sub in targets:
+                    sub.push(payload)
+        finally:
+            conn.close()
+
+    def close(self):
+        """poller 스레드를 멈춥니다. 다시 구독하면 새로 띄웁니다."""
+        self._stop.set()
+
+    def _run(self, stop):
+        while not stop.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                logging.exception("실시간 집계 폴링 실패: %s", e)
+
+    def stream(self, vote_id):
+        """text/event-stream 본문을 생성합니다."""
+        sub = self.subscribe(vote_id)
+        try:
+            yield f"retry: {int(self.interval * 1000) * 4}\n\n"
+            while True:
+                payload = sub.get(self.heartbeat)
+                if payload is None:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: tally\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+    def wait_for_change(self, vote_id, since, timeout):
+        """long-poll: 총계가 ``since`` 와 달라지면 payload 를, 시간 초과면 None 을 반환합니다."""
+        sub = self.subscribe(vote_id)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                payload = sub.get(remaining)
+                if payload is not None and payload["total"] != since:
+                    return payload
+        finally:
+            self.unsubscribe(sub)
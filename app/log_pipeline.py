@@ -0,0 +1,182 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+OVERFLOW_DROP_NEW = "drop_new"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEW, OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK)
+
+_request_id = ContextVar("request_id", default=None)
+
+
+def set_request_id(request_id):
+    _request_id.set(request_id)
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 기록합니다."""
+
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """콘솔용: 기존 ``[시각] 메시지`` 형식에 요청 ID 를 붙입니다."""
+
+    def __init__(self):
+        super().__init__('[%(asctime)s] %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        request_id = getattr(record, "request_id", None)
+        return f"{line} (req={request_id})" if request_id else line
+
+
+def _gevent_patched():
+    # gunicorn -k gevent 워커: threading 이 greenlet 용으로 바뀌어 있음
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+class _HubThreadpoolListener(QueueListener):
+    """gevent 워커용 listener.
+
+    monkey patch 된 ``threading`` 으로 띄운 listener 는 greenlet 이라 파일·콘솔 쓰기가
+    hub 를 막으므로, 레코드마다 실제 쓰기를 hub 의 OS 스레드풀에서 하고 listener
+    greenlet 은 끝날 때까지 양보하며 기다립니다 (쓰기 순서는 그대로).
+    """
+
+    def handle(self, record):
+        from gevent import get_hub
+
+        get_hub().threadpool.apply(QueueListener.handle, (self, record))
+
+
+class QueuedLogHandler(QueueHandler):
+    """로그 레코드를 제한된 큐에 넣기만 하고, 파일/콘솔 쓰기는 listener 스레드가 합니다.
+
+    - 레코드에 현재 요청 ID 를 붙인 뒤 메시지·예외를 문자열로 만들어 넣습니다.
+    - 큐가 가득 차면 ``overflow`` 정책에 따라 새 레코드를 버리거나(drop_new),
+      가장 오래된 레코드를 버리거나(drop_oldest), 자리가 날 때까지 기다립니다(block).
+    - gunicorn --preload 로 fork 된 워커에서는 첫 기록 시 큐와 listener 를 새로 띄웁니다.
+    - gevent 워커에서는 쓰기를 hub 스레드풀로 넘겨 요청 greenlet 들이 멈추지 않게 합니다.
+    """
+
+    def __init__(self, handlers, max_queue=10000, overflow=OVERFLOW_DROP_NEW):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"LOG_OVERFLOW 는 {', '.join(OVERFLOW_POLICIES)} 중 하나여야 합니다.")
+        super().__init__(queue.Queue(maxsize=max_queue))
+        self.handlers = handlers
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._listener is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._listener is None or self._pid != os.getpid():
+                if self._pid is not None:
+                    # fork 이전 프로세스의 큐·스레드는 물려받지 않음
+                    self.queue = queue.Queue(maxsize=self.max_queue)
+                self._pid = os.getpid()
+                listener_class = _HubThreadpoolListener if _gevent_patched() else QueueListener
+                self._listener = listener_class(self.queue, *self.handlers, respect_handler_level=True)
+                self._listener.start()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.request_id = _request_id.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.overflow == OVERFLOW_BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+    def emit(self, record):
+        self._ensure_started()
+        super().emit(record)
+
+    def depth(self):
+        return self.queue.qsize()
+
+    def stop(self):
+        """남은 레코드를 모두 쓰고 listener 를 멈춥니다."""
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+        for handler in self.handlers:
+            handler.close()
+
+
+def configure_logging(log_file, max_queue=10000, overflow=OVERFLOW_DROP_NEW,
+                      max_bytes=10 * 1024 * 1024, backup_count=5, level=logging.INFO):
+    """root 로거에 큐 기반 핸들러를 답니다.
+
+    ``log_file`` 에는 JSON 줄을 ``max_bytes`` 마다 회전하며 쓰고, 표준출력에는 사람이
+    읽는 형식으로 씁니다. 다시 호출하면 이전에 단 핸들러를 정리하고 교체합니다.
+    """
+    root = logging.getLogger()
+    for old in [h for h in root.handlers if isinstance(h, QueuedLogHandler)]:
+        root.removeHandler(old)
+        old.stop()
+
+    file_handler = RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(TextFormatter())
+
+    handler = QueuedLogHandler([file_handler, console_handler], max_queue, overflow)
+    root.addHandler(handler)
+    root.setLevel(level)
+    atexit.register(handler.stop)
+    return handler
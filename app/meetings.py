@@ -0,0 +1,247 @@
+import logging
+import re
+import shutil
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy.orm import sessionmaker
+
+from .db import raw_connection
+
+DEFAULT_MEETING = "default"
+MEETING_ID_RE = re.compile(r"[a-z0-9][a-z0-9-]{0,31}")
+
+
+def valid_meeting_id(meeting_id):
+    return bool(meeting_id) and MEETING_ID_RE.fullmatch(meeting_id) is not None
+
+
+def new_meeting_id():
+    return uuid.uuid4().hex[:8]
+
+
+def token_meeting_id(token):
+    """``<회의ID>.<uuid>`` 형식 토큰의 회의 ID 를 반환합니다 (기본 회의 토큰이면 None)."""
+    meeting_id, sep, _ = (token or "").partition(".")
+    return meeting_id if sep and valid_meeting_id(meeting_id) else None
+
+
+class Meeting:
+    """회의 하나의 DB 샤드와, 그 DB 에 묶인 집계·캐시·writer 들.
+
+    ``server.open_meeting()`` 이 엔진과 스키마를 준비한 뒤 ``tallies``, ``counters``,
+    ``ballot_cache``, ``option_cache``, ``token_cache``, ``audit_log``, ``vote_writer``,
+    ``live`` 를 채웁니다. 회의마다 SQLite 파일이 따로라 쓰기 잠금도 따로입니다.
+    """
+
+    def __init__(self, meeting_id, db_path, engine, wrap=None):
+        self.meeting_id = meeting_id
+        self.db_path = db_path
+        self.engine = engine
+        self._wrap = wrap or (lambda conn: conn)
+        self._sessions = sessionmaker(bind=engine)
+        # 이 회의를 쓰고 있는 요청 수 (MeetingRegistry.checkout / release)
+        self.in_use = 0
+        # 다른 워커가 보관해 목록에서 뺀 회의 (마지막 요청이 끝나면 닫음)
+        self.retired = False
+        self.closed = False
+
+    @property
+    def is_default(self):
+        return self.meeting_id == DEFAULT_MEETING
+
+    def db(self):
+        # 워커별 커넥션 풀에서 대여 (close() 시 풀로 반환)
+        return self._wrap(raw_connection(self.engine))
+
+    def session(self):
+        return self._sessions()
+
+    def new_token(self):
+        token = str(uuid.uuid4())
+        return token if self.is_default else f"{self.meeting_id}.{token}"
+
+    def record_ballots(self, conn, ballots):
+        """투표 INSERT 와 같은 트랜잭션에서 집계·대시보드 카운터를 갱신하고, (vote_id,
+        token, option_id) 를 선택지 이름으로 감사 로그에 남깁니다."""
+        self.tallies.record(conn, ballots)
+        self.counters.record(conn, ballots)
+        self.audit_log.record(conn, self.option_cache.labelled(ballots))
+
+    def busy(self):
+        """처리 중인 요청, 실시간 구독자나 커밋 대기 투표가 있으면 닫지 않습니다."""
+        return (
+            self.in_use > 0
+            or self.live.subscriber_count() > 0
+            or self.vote_writer.depth() > 0
+        )
+
+    def close(self, checkpoint=False):
+        self.closed = True
+        self.live.close()
+        self.token_pool.close()
+        self.vote_writer.close()
+        if checkpoint and self.engine.dialect.name == "sqlite":
+            # WAL 내용을 본 파일로 옮겨 파일 하나만 옮겨도 되게 함
+            conn = raw_connection(self.engine)
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+        self.engine.dispose()
+
+
+class MeetingRegistry:
+    """회의별 DB 샤드(``<shard_dir>/<회의ID>.db``)를 필요할 때 열고, 최근에 쓰지 않은
+    샤드부터 닫아 워커당 열린 샤드 수를 ``max_open`` 이하로 유지합니다.
+
+    기본 회의(기존 ``DB_PATH``)는 항상 열려 있으며 닫지 않습니다. 샤드 파일이 곧
+    회의 목록이므로, 회의를 보관하려면 파일을 ``archive/`` 로 옮기기만 하면 됩니다.
+    다른 워커가 보관한 회의는 ``get()`` 이 파일이 없어진 것을 보고 목록에서 빼며,
+    처리 중인 요청이 끝나면 닫습니다 (샤드 엔진은 없는 파일을 새로 만들지 않음).
+
+    요청은 ``checkout()`` 으로 회의를 잡고 끝나면 ``release()`` 합니다. 잡혀 있는
+    회의는 LRU 로 닫지 않습니다.
+    """
+
+    def __init__(self, shard_dir, open_meeting, default, max_open=8):
+        self.shard_dir = shard_dir
+        self.archive_dir = shard_dir / "archive"
+        self._open_meeting = open_meeting
+        self.default = default
+        self.max_open = max_open
+        self._meetings = OrderedDict()
+        self._lock = threading.RLock()
+        self.opens = 0
+        self.evictions = 0
+
+    def path(self, meeting_id):
+        return self.shard_dir / f"{meeting_id}.db"
+
+    def exists(self, meeting_id):
+        return meeting_id == DEFAULT_MEETING or (
+            valid_meeting_id(meeting_id) and self.path(meeting_id).is_file()
+        )
+
+    def ids(self):
+        if not self.shard_dir.is_dir():
+            return []
+        return sorted(p.stem for p in self.shard_dir.glob("*.db") if valid_meeting_id(p.stem))
+
+    def catalog(self):
+        """[(회의ID, 회의명)] — 샤드를 열지 않고 읽기 전용으로 회의명만 읽습니다."""
+        entries = []
+        for meeting_id in self.ids():
+            title = None
+            try:
+                conn = sqlite3.connect(f"file:{self.path(meeting_id)}?mode=ro", uri=True)
+                try:
+                    row = conn.execute(
+                        "SELECT value FROM settings WHERE key = 'meeting_title'"
+                    ).fetchone()
+                    title = row[0] if row else None
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logging.warning("회의 %s 정보를 읽지 못했습니다: %s", meeting_id, e)
+            entries.append((meeting_id, title))
+        return entries
+
+    def get(self, meeting_id):
+        """열린 회의를 반환하고, 처음이면 샤드를 엽니다. 없는 회의면 ``KeyError``."""
+        if meeting_id == DEFAULT_MEETING:
+            return self.default
+        with self._lock:
+            meeting = self._meetings.get(meeting_id)
+            if meeting is not None:
+                if self.path(meeting_id).is_file():
+                    self._meetings.move_to_end(meeting_id)
+                    return meeting
+                # 다른 워커가 보관함: 옮겨진 파일에 더 쓰지 않도록 목록에서 뺌
+                del self._meetings[meeting_id]
+                meeting.retired = True
+                if meeting.in_use == 0:
+                    meeting.close()
+                raise KeyError(meeting_id)
+            if not self.exists(meeting_id):
+                raise KeyError(meeting_id)
+            return self._open(meeting_id)
+
+    def checkout(self, meeting_id):
+        """``get()`` 과 같고, ``release()`` 할 때까지 이 회의를 닫지 않습니다."""
+        with self._lock:
+            meeting = self.get(meeting_id)
+            meeting.in_use += 1
+            return meeting
+
+    def release(self, meeting):
+        with self._lock:
+            meeting.in_use -= 1
+            if meeting.retired and meeting.in_use == 0 and not meeting.closed:
+                meeting.close()
+
+    def create(self, meeting_id=None):
+        """새 회의 샤드를 만들고 엽니다."""
+        meeting_id = meeting_id or new_meeting_id()
+        if not valid_meeting_id(meeting_id) or meeting_id == DEFAULT_MEETING:
+            raise ValueError(f"사용할 수 없는 회의 ID 입니다: {meeting_id}")
+        with self._lock:
+            if self.exists(meeting_id):
+                raise ValueError(f"이미 있는 회의 ID 입니다: {meeting_id}")
+            self.shard_dir.mkdir(parents=True, exist_ok=True)
+            # 샤드 엔진은 파일을 만들지 않으므로 빈 DB 파일을 먼저 만듦
+            sqlite3.connect(self.path(meeting_id)).close()
+            return self._open(meeting_id)
+
+    def _open(self, meeting_id):
+        meeting = self._open_meeting(meeting_id, self.path(meeting_id))
+        self._meetings[meeting_id] = meeting
+        self.opens += 1
+        self._evict()
+        return meeting
+
+    def _evict(self):
+        # 방금 연 회의(맨 뒤)는 닫지 않음
+        for meeting_id in list(self._meetings)[:-1]:
+            if len(self._meetings) <= self.max_open:
+                return
+            meeting = self._meetings[meeting_id]
+            if meeting.busy():
+                continue
+            del self._meetings[meeting_id]
+            meeting.close()
+            self.evictions += 1
+
+    def archive(self, meeting_id):
+        """회의 샤드를 닫고 ``archive/`` 로 옮깁니다. 옮긴 경로를 반환합니다.
+
+        이 워커에서 처리 중인 요청이 있으면 ``RuntimeError`` (다른 워커는 다음 요청 때
+        파일이 없어진 것을 보고 닫음)."""
+        if meeting_id == DEFAULT_MEETING or not self.exists(meeting_id):
+            raise KeyError(meeting_id)
+        with self._lock:
+            meeting = self._meetings.get(meeting_id)
+            if meeting is not None:
+                if meeting.in_use > 0:
+                    raise RuntimeError(f"처리 중인 요청이 있는 회의입니다: {meeting_id}")
+                del self._meetings[meeting_id]
+                meeting.close(checkpoint=True)
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            target = self.archive_dir / self.path(meeting_id).name
+            for suffix in ("", "-wal", "-shm"):
+                src = self.path(meeting_id).with_name(self.path(meeting_id).name + suffix)
+                if src.exists():
+                    shutil.move(str(src), str(target.with_name(target.name + suffix)))
+        return target
+
+    def opened(self):
+        with self._lock:
+            return [self.default, *self._meetings.values()]
+
+    def close_all(self):
+        with self._lock:
+            meetings, self._meetings = list(self._meetings.values()), OrderedDict()
+        for meeting in meetings:
+            meeting.close()
@@ -0,0 +1,283 @@
+import cProfile
+import logging
+import math
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [버킷별 누적 전 개수..., 합계, 개수]
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return series[-1] if series else 0
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        names = self.labelnames + ("le",)
+        for labels, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                yield f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}"
+
+
+class Callback:
+    """렌더링 시점에 값을 읽는 게이지/카운터 (캐시 적중 수, 큐 길이 등)."""
+
+    def __init__(self, name, help, fn, kind="gauge", labelnames=()):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+
+    def render(self):
+        try:
+            value = self.fn()
+        except Exception as e:
+            logging.warning("메트릭 %s 수집 실패: %s", self.name, e)
+            return
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        if isinstance(value, dict):
+            for labels, v in sorted(value.items()):
+                labels = labels if isinstance(labels, tuple) else (labels,)
+                yield f"{self.name}{_labels(self.labelnames, labels)} {_number(v)}"
+        else:
+            yield f"{self.name} {_number(value)}"
+
+
+class RequestStats:
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+_current = ContextVar("request_stats", default=None)
+
+
+class InstrumentedConnection:
+    """``db()`` 커넥션 래퍼. execute/executemany 시간을 재고 나머지는 그대로 위임합니다."""
+
+    __slots__ = ("_conn", "_metrics")
+
+    def __init__(self, conn, metrics):
+        self._conn = conn
+        self._metrics = metrics
+
+    def execute(self, *args):
+        start = time.perf_counter()
+        try:
+            return self._conn.execute(*args)
+        finally:
+            self._metrics.observe_query("raw", time.perf_counter() - start)
+
+    def executemany(self, *args):
+        start = time.perf_counter()
+        try:
+            return self._conn.executemany(*args)
+        finally:
+            self._metrics.observe_query("raw", time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class Metrics:
+    """프로세스(워커)별 메트릭 레지스트리와 요청 단위 계측.
+
+    - 라우트별 지연 히스토그램과 상태 코드별 요청 수
+    - 요청당 DB 쿼리 수, 쿼리 시간 (``db()`` 커넥션과 SQLAlchemy 엔진 모두)
+    - ``register()`` 로 등록한 캐시 적중 수·큐 길이 등의 콜백 값
+
+    ``/admin/metrics`` 는 Prometheus text format (0.0.4) 으로 출력합니다.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self.request_seconds = self.add(Histogram(
+            "vote_http_request_duration_seconds", "요청 처리 시간 (응답 본문 스트리밍 제외)",
+            ("route", "method"),
+        ))
+        self.requests = self.add(Counter(
+            "vote_http_requests_total", "상태 코드별 요청 수", ("route", "method", "status"),
+        ))
+        self.request_queries = self.add(Histogram(
+            "vote_db_queries_per_request", "요청당 DB 쿼리 수", ("route",), QUERY_COUNT_BUCKETS,
+        ))
+        self.query_seconds = self.add(Histogram(
+            "vote_db_query_duration_seconds", "DB 쿼리 실행 시간", ("source",), QUERY_BUCKETS,
+        ))
+
+    def add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register(self, name, help, fn, kind="gauge", labelnames=()):
+        self.add(Callback(name, help, fn, kind, labelnames))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    # ── DB 계측 ────────────────────────────────────
+    def observe_query(self, source, seconds):
+        self.query_seconds.observe(seconds, source)
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += seconds
+
+    def wrap(self, conn):
+        return InstrumentedConnection(conn, self)
+
+    def instrument_engine(self, engine):
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            start = conn.info["query_start"].pop()
+            self.observe_query("orm", time.perf_counter() - start)
+
+    # ── 요청 계측 ──────────────────────────────────
+    def begin_request(self):
+        stats = RequestStats()
+        _current.set(stats)
+        return stats
+
+    def end_request(self, stats, route, method, status, seconds):
+        _current.set(None)
+        self.request_seconds.observe(seconds, route, method)
+        self.requests.inc(route, method, str(status))
+        self.request_queries.observe(stats.queries, route)
+
+
+class SlowRequestProfiler:
+    """``threshold_ms`` 보다 오래 걸린 요청의 cProfile 결과를 ``<dir>/*.prof`` 로 남깁니다.
+
+    요청마다 프로파일러를 켜므로 진단할 때만 켭니다. 프로파일러는 스레드 단위라
+    한 번에 하나의 요청만 프로파일링하며, 다른 요청이 프로파일링 중이면 건너뜁니다.
+    (gevent 워커에서는 같은 스레드의 다른 greenlet 실행도 결과에 섞일 수 있습니다.)
+    """
+
+    def __init__(self, directory, threshold_ms):
+        self.directory = directory
+        self.threshold = threshold_ms / 1000
+        self._busy = threading.Lock()
+        self.dumps = 0
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    def start(self):
+        if not self.enabled or not self._busy.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 다른 프로파일러(디버거 등)가 이미 동작 중
+            self._busy.release()
+            return None
+        return profile
+
+    def finish(self, profile, route, seconds):
+        if profile is None:
+            return None
+        try:
+            profile.disable()
+            if seconds < self.threshold:
+                return None
+            self.directory.mkdir(parents=True, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+            path = self.directory / (
+                f"{datetime.now():%Y%m%d_%H%M%S_%f}_{os.getpid()}_{slug}_{int(seconds * 1000)}ms.prof"
+            )
+            profile.dump_stats(path)
+            self.dumps += 1
+            logging.warning("느린 요청 프로파일 저장: %s (%.0fms)", path.name, seconds * 1000)
+            return path
+        finally:
+            self._busy.release()
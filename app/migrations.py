@@ -0,0 +1,305 @@
+import logging
+
+from .vote_options import normalize_label, parse_options
+
+SCHEMA_VERSION_KEY = "schema_version"
+
+
+def _add_hot_query_indexes(conn):
+    # 표결 삭제(DELETE ... WHERE vote_id)와 집계 재구성(GROUP BY vote_id, choice)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_votes_vote_id_choice ON votes (vote_id, choice)"
+    )
+    # /vote 활성 표결 조회
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_vote_items_is_active ON vote_items (is_active)"
+    )
+    # 안건 삭제, 대시보드의 ORDER BY agenda_id, created_at
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_vote_items_agenda_id_created_at "
+        "ON vote_items (agenda_id, created_at)"
+    )
+    # 토큰 생성 시 MAX(serial_number)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tokens_serial_number ON tokens (serial_number)"
+    )
+
+
+def _store_option_ids(conn):
+    # vote_items.options 를 정규화하고, 선택지에 없던 기존 투표 문자열은 선택지 끝에 보존
+    options = {
+        vote_id: list(parse_options(raw))
+        for vote_id, raw in conn.execute("SELECT vote_id, options FROM vote_items")
+    }
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(votes)")}
+    if "choice" in columns:
+        ballots = []
+        for id_, vote_id, token, choice, timestamp, voter_name in conn.execute(
+            "SELECT id, vote_id, token, choice, timestamp, voter_name FROM votes"
+        ).fetchall():
+            labels = options.setdefault(vote_id, [])
+            label = normalize_label((choice or "").replace(",", " ")) or "-"
+            if label not in labels:
+                logging.warning("표결 %s 의 선택지에 없는 기존 투표 '%s' 를 선택지로 추가", vote_id, label)
+                labels.append(label)
+            ballots.append((id_, vote_id, token, labels.index(label) + 1, timestamp, voter_name))
+
+        # 선택지 문자열 대신 option_id(정수)를 저장하도록 votes 재구성
+        conn.execute("ALTER TABLE votes RENAME TO votes_old")
+        conn.execute(
+            """
+            CREATE TABLE votes (
+                id INTEGER NOT NULL PRIMARY KEY,
+                vote_id VARCHAR REFERENCES vote_items (vote_id),
+                token VARCHAR REFERENCES tokens (token),
+                option_id INTEGER NOT NULL,
+                timestamp DATETIME,
+                voter_name VARCHAR,
+                UNIQUE (token, vote_id)
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO votes (id, vote_id, token, option_id, timestamp, voter_name) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ballots,
+        )
+        conn.execute("DROP TABLE votes_old")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_votes_vote_id_option_id ON votes (vote_id, option_id)"
+    )
+    conn.executemany(
+        "UPDATE vote_items SET options = ? WHERE vote_id = ?",
+        [(",".join(labels), vote_id) for vote_id, labels in options.items()],
+    )
+
+    # 집계 요약 테이블은 votes 로부터 다시 만들 수 있으므로 새 형식으로 교체
+    conn.execute("DROP TABLE IF EXISTS vote_tallies")
+    conn.execute("DROP TABLE IF EXISTS vote_tally_recent")
+    conn.execute(
+        """
+        CREATE TABLE vote_tallies (
+            vote_id VARCHAR NOT NULL,
+            option_id INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (vote_id, option_id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE vote_tally_recent (
+            vote_id VARCHAR NOT NULL,
+            slot INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            option_id INTEGER,
+            timestamp VARCHAR,
+            PRIMARY KEY (vote_id, slot)
+        )
+        """
+    )
+
+
+def _create_summary_tables(conn):
+    # 스키마가 최신이면 시작할 때 create_all 을 건너뛰므로, 버전 2 로 표시된 뒤에
+    # 모델에 추가된 요약 테이블을 여기서 만듦 (내용은 시작 시 원본 테이블로부터 재계산)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS vote_tally_totals ("
+        "vote_id VARCHAR NOT NULL PRIMARY KEY, total INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS dashboard_counters ("
+        "name VARCHAR NOT NULL PRIMARY KEY, value INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS agenda_counters ("
+        "agenda_id VARCHAR NOT NULL PRIMARY KEY, items INTEGER NOT NULL, "
+        "active_items INTEGER NOT NULL)"
+    )
+
+
+def _add_serial_sequence(conn):
+    # 토큰 일련번호를 MAX(serial_number) 대신 시퀀스 행에서 할당 (token_pool 테이블은 create_all)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sequences ("
+        "name VARCHAR NOT NULL PRIMARY KEY, value INTEGER NOT NULL)"
+    )
+    current = conn.execute("SELECT COALESCE(MAX(serial_number), 0) FROM tokens").fetchone()[0]
+    conn.execute(
+        "INSERT INTO sequences (name, value) VALUES ('token_serial', ?) "
+        "ON CONFLICT(name) DO NOTHING",
+        (current,),
+    )
+
+
+def _columns(conn, table):
+    return {col[0] for col in conn.execute(f"SELECT * FROM {table} LIMIT 0").description}
+
+
+def _use_integer_keys(conn):
+    # votes 와 그 인덱스에 UUID 문자열 대신 tokens.id / vote_items.id 정수 키를 저장 (app.keys).
+    # PostgreSQL 은 테이블 이름을 바꿔도 제약 이름이 남으므로 *_new 로 만들어 옮긴 뒤 이름을 바꿈
+    if "token_id" in _columns(conn, "votes"):
+        return
+    postgres = getattr(conn, "dialect_name", "sqlite") == "postgresql"
+    # 지운 토큰·표결의 키를 다시 쓰지 않아야 남은 투표 기록이 새 토큰에 붙지 않음
+    serial = "SERIAL PRIMARY KEY" if postgres else "INTEGER PRIMARY KEY AUTOINCREMENT"
+    conn.execute(
+        f"""
+        CREATE TABLE tokens_new (
+            id {serial},
+            token VARCHAR NOT NULL UNIQUE,
+            serial_number INTEGER,
+            created_at TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE vote_items_new (
+            id {serial},
+            vote_id VARCHAR NOT NULL UNIQUE,
+            agenda_id VARCHAR NOT NULL REFERENCES vote_agendas (agenda_id),
+            title VARCHAR NOT NULL,
+            options VARCHAR NOT NULL,
+            is_active BOOLEAN,
+            created_at TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE votes_new (
+            id {serial},
+            item_id INTEGER NOT NULL REFERENCES vote_items_new (id),
+            token_id INTEGER NOT NULL,
+            option_id INTEGER NOT NULL,
+            timestamp TIMESTAMP,
+            voter_name VARCHAR,
+            UNIQUE (token_id, item_id)
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO tokens_new (token, serial_number, created_at) "
+        "SELECT token, serial_number, created_at FROM tokens ORDER BY serial_number, token"
+    )
+    # 이미 지운 토큰의 투표 기록도 보존: 키만 잡아 두고 옮긴 뒤 토큰 행은 다시 지움
+    conn.execute(
+        "INSERT INTO tokens_new (token) SELECT DISTINCT token FROM votes "
+        "WHERE token IS NOT NULL AND token NOT IN (SELECT token FROM tokens)"
+    )
+    conn.execute(
+        "INSERT INTO vote_items_new (vote_id, agenda_id, title, options, is_active, created_at) "
+        "SELECT vote_id, agenda_id, title, options, is_active, created_at FROM vote_items "
+        "ORDER BY created_at, vote_id"
+    )
+    conn.execute(
+        """
+        INSERT INTO votes_new (item_id, token_id, option_id, timestamp, voter_name)
+        SELECT i.id, t.id, v.option_id, v.timestamp, v.voter_name
+        FROM votes v
+        JOIN vote_items_new i ON i.vote_id = v.vote_id
+        JOIN tokens_new t ON t.token = v.token
+        ORDER BY v.id
+        """
+    )
+    dropped = (
+        conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+        - conn.execute("SELECT COUNT(*) FROM votes_new").fetchone()[0]
+    )
+    if dropped:
+        logging.warning("토큰 또는 표결이 없는 기존 투표 %d건은 옮기지 않음", dropped)
+    conn.execute("DELETE FROM tokens_new WHERE token NOT IN (SELECT token FROM tokens)")
+
+    for table in ("votes", "vote_items", "tokens"):
+        conn.execute(f"DROP TABLE {table}")
+    for table in ("tokens", "vote_items", "votes"):
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    conn.execute("CREATE INDEX ix_tokens_serial_number ON tokens (serial_number)")
+    conn.execute("CREATE INDEX ix_vote_items_is_active ON vote_items (is_active)")
+    conn.execute(
+        "CREATE INDEX ix_vote_items_agenda_id_created_at ON vote_items (agenda_id, created_at)"
+    )
+    conn.execute("CREATE INDEX ix_votes_item_id_option_id ON votes (item_id, option_id)")
+
+
+def _add_audit_log_table(conn):
+    # 감사 로그를 CSV 버퍼 대신 투표와 같은 트랜잭션에서 이 테이블에 씀 (app.audit_log).
+    # 이전 버전의 CSV 세그먼트는 LOG_DIR 에 그대로 두고 내보낼 때 함께 묶음
+    postgres = getattr(conn, "dialect_name", "sqlite") == "postgresql"
+    serial = "SERIAL PRIMARY KEY" if postgres else "INTEGER PRIMARY KEY AUTOINCREMENT"
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id {serial},
+            timestamp VARCHAR NOT NULL,
+            vote_id VARCHAR NOT NULL,
+            token VARCHAR NOT NULL,
+            choice VARCHAR NOT NULL
+        )
+        """
+    )
+
+
+# (버전, 설명, 함수) — 순서대로 한 번씩 적용되며 각 단계는 재실행해도 안전해야 함
+MIGRATIONS = [
+    (1, "hot query indexes", _add_hot_query_indexes),
+    (2, "integer option ids", _store_option_ids),
+    (3, "summary tables", _create_summary_tables),
+    (4, "token serial sequence", _add_serial_sequence),
+    (5, "integer token and item keys", _use_integer_keys),
+    (6, "audit log table", _add_audit_log_table),
+]
+
+
+def schema_version(conn):
+    row = conn.execute(
+        "SELECT value FROM settings WHERE key = ?", (SCHEMA_VERSION_KEY,)
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def stamp(conn, migrations=MIGRATIONS):
+    """모델로 새로 만든 DB 는 이미 최신 스키마이므로 마이그레이션 없이 버전만 기록합니다."""
+    conn.execute(
+        "INSERT INTO settings (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (SCHEMA_VERSION_KEY, str(migrations[-1][0])),
+    )
+    conn.commit()
+
+
+def migrate(conn, migrations=MIGRATIONS):
+    """``settings.schema_version`` 이후의 마이그레이션을 적용하고 적용한 버전 목록을 반환합니다.
+
+    여러 워커가 동시에 시작해도 BEGIN IMMEDIATE 로 직렬화되며, 잠금을 잡은 뒤
+    버전을 다시 읽으므로 같은 단계가 두 번 적용되지 않습니다.
+    """
+    if migrations and schema_version(conn) >= migrations[-1][0]:
+        return []
+
+    applied = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = schema_version(conn)
+        for version, description, step in migrations:
+            if version <= current:
+                continue
+            logging.info("스키마 마이그레이션 %d 적용: %s", version, description)
+            step(conn)
+            conn.execute(
+                "INSERT INTO settings (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (SCHEMA_VERSION_KEY, str(version)),
+            )
+            applied.append(version)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    if applied:
+        # 테이블을 다시 만든 단계가 남긴 빈 페이지를 돌려주고 통계 갱신
+        conn.execute("VACUUM")
+        conn.execute("ANALYZE")
+    return applied
@@ -0,0 +1,197 @@
+"""PostgreSQL 커넥션을 ``db()`` 가 약속하는 sqlite3 커넥션 인터페이스로 감쌉니다.
+
+앱의 raw SQL 은 물음표 파라미터, ``row["컬럼"]``/``row[0]`` 행 접근, sqlite3 예외,
+sqlite3 모듈식 암묵적 트랜잭션(DML 전에 BEGIN, ``commit()`` 으로 끝)을 전제로
+작성되어 있습니다. 여기서 그 규칙을 PostgreSQL 드라이버(psycopg) 위에 맞추므로
+호출하는 쪽 코드는 백엔드를 구분하지 않습니다. SQL 자체는 두 DB 가 모두 이해하는
+문법(``ON CONFLICT``, ``TRUE``/``FALSE``, ``CURRENT_TIMESTAMP``)으로 작성합니다.
+"""
+import re
+import sqlite3
+from functools import lru_cache
+
+# 문자열 리터럴('...'), 물음표, 퍼센트 — 리터럴 안의 ? 는 그대로 둠
+_SQL_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\?|%")
+_DML_RE = re.compile(r"\s*(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+_BEGIN_RE = re.compile(r"\s*BEGIN(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?\s*;?\s*$", re.IGNORECASE)
+
+# 쓰기 트랜잭션을 SQLite 처럼 DB 단위로 직렬화하는 advisory lock 키 (db.SCHEMA_LOCK_KEY 와 다름)
+WRITE_LOCK_KEY = 0x77726974  # "writ"
+
+
+@lru_cache(maxsize=512)
+def translate_sql(sql):
+    """qmark(``?``) 파라미터를 psycopg 의 ``%s`` 로 바꾸고 리터럴 ``%`` 는 ``%%`` 로 이스케이프합니다."""
+    def replace(match):
+        token = match.group(0)
+        if token == "?":
+            return "%s"
+        if token == "%":
+            return "%%"
+        return token.replace("%", "%%")
+    return _SQL_TOKEN_RE.sub(replace, sql)
+
+
+def _translate_error(exc):
+    """드라이버 예외를 같은 종류의 sqlite3 예외로 바꿉니다 (``except sqlite3.Error`` 그대로 사용)."""
+    name = type(exc).__name__
+    for cls in type(exc).__mro__:
+        if cls.__name__ == "IntegrityError":
+            return sqlite3.IntegrityError(str(exc))
+        if cls.__name__ == "OperationalError":
+            return sqlite3.OperationalError(str(exc))
+        if cls.__name__ == "ProgrammingError":
+            return sqlite3.ProgrammingError(str(exc))
+    return sqlite3.DatabaseError(f"{name}: {exc}")
+
+
+class Row:
+    """``sqlite3.Row`` 처럼 인덱스·컬럼 이름으로 모두 읽을 수 있는 행."""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys, values):
+        self._keys = keys
+        self._values = tuple(values)
+
+    def keys(self):
+        return list(self._keys)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return self._values[self._keys.index(key)]
+            except ValueError:
+                raise IndexError(f"No item with that key: {key}") from None
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return self._keys == other._keys and self._values == other._values
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((tuple(self._keys), self._values))
+
+    def __repr__(self):
+        return f"Row({dict(zip(self._keys, self._values))!r})"
+
+
+class PgCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _row(self, values):
+        if values is None:
+            return None
+        return Row([col[0] for col in self._cursor.description], values)
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        return [self._row(values) for values in rows]
+
+    def fetchall(self):
+        return [self._row(values) for values in self._cursor.fetchall()]
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._cursor.close()
+
+
+class PgConnection:
+    """풀에서 빌린 PostgreSQL 커넥션을 sqlite3 커넥션처럼 다룹니다.
+
+    드라이버는 autocommit 으로 두고 트랜잭션을 여기서 직접 엽니다. sqlite3 모듈과
+    같이 SELECT 는 트랜잭션 없이 실행하고 INSERT/UPDATE/DELETE 앞에서 BEGIN 을
+    보냅니다. 앱의 쓰기 경로(검증 후 삽입, 첫 투표인 토큰만 세는 카운터 등)는 SQLite 가
+    쓰기 트랜잭션을 하나씩만 실행한다는 전제로 작성되어 있으므로, 쓰기 트랜잭션
+    (``BEGIN IMMEDIATE``/``EXCLUSIVE`` 와 DML 앞의 암묵적 BEGIN)은 시작하자마자
+    ``pg_advisory_xact_lock(WRITE_LOCK_KEY)`` 를 잡아 모든 머신에서 하나씩 실행합니다
+    (커밋·롤백 시 풀림). READ COMMITTED 라 잠금을 얻은 뒤의 문장은 앞선 쓰기의 커밋
+    결과를 봅니다. 읽기는 잠그지 않으며, 읽기용 ``BEGIN`` 은 WAL 스냅샷과 같은 효과를
+    내도록 REPEATABLE READ 로 엽니다.
+    """
+
+    # 방언별 DDL 이 필요한 마이그레이션에서 확인 (sqlite3 커넥션에는 없음)
+    dialect_name = "postgresql"
+
+    def __init__(self, pooled, dbapi):
+        self._pooled = pooled
+        self._errors = dbapi.Error
+        self._conn = pooled.driver_connection
+        self._conn.autocommit = True
+        self.in_transaction = False
+
+    def _run(self, method, sql, params):
+        cursor = self._conn.cursor()
+        try:
+            getattr(cursor, method)(translate_sql(sql), params)
+        except Exception as e:
+            cursor.close()
+            if isinstance(e, self._errors):
+                raise _translate_error(e) from e
+            raise
+        return PgCursor(cursor)
+
+    def _begin(self, sql="BEGIN", write=True):
+        cursor = self._run("execute", sql, ())
+        self.in_transaction = True
+        if write:
+            self._run("execute", "SELECT pg_advisory_xact_lock(?)", (WRITE_LOCK_KEY,))
+        return cursor
+
+    def execute(self, sql, params=()):
+        begin = _BEGIN_RE.match(sql)
+        if begin:
+            if (begin.group(2) or "DEFERRED").upper() == "DEFERRED":
+                return self._begin("BEGIN ISOLATION LEVEL REPEATABLE READ", write=False)
+            return self._begin()
+        if not self.in_transaction and _DML_RE.match(sql):
+            self._begin()
+        return self._run("execute", sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        if not self.in_transaction and _DML_RE.match(sql):
+            self._begin()
+        return self._run("executemany", sql, list(seq_of_params))
+
+    def commit(self):
+        if self.in_transaction:
+            self.in_transaction = False
+            self._run("execute", "COMMIT", ())
+
+    def rollback(self):
+        if self.in_transaction:
+            self.in_transaction = False
+            self._run("execute", "ROLLBACK", ())
+
+    def close(self):
+        try:
+            self.rollback()
+        finally:
+            # ORM 세션이 같은 풀을 쓰므로 드라이버 기본 트랜잭션 모드로 돌려놓고 반납
+            self._conn.autocommit = False
+            self._pooled.close()
@@ -0,0 +1,143 @@
+import io
+import logging
+import os
+import threading
+from collections import deque
+from itertools import chain
+from zipfile import ZipFile, ZIP_STORED
+
+
+def render_qr_png(item):
+    """(url, serial) 을 받아 일련번호가 찍힌 QR PNG 바이트를 반환합니다.
+
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 둡니다.
+    """
+    import qrcode
+    from PIL import ImageDraw
+
+    url, serial = item
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(url)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
+
+    try:
+        draw = ImageDraw.Draw(img)
+        text = f"{serial:03d}"
+        bbox = draw.textbbox((0, 0), text)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        img_width, img_height = img.size
+        draw.text(
+            ((img_width - text_width) / 2, img_height - text_height - 10),
+            text, fill="black"
+        )
+    except Exception as draw_err:
+        logging.exception("텍스트 추가 실패: %s", draw_err)
+
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return serial, buf.getvalue()
+
+
+class QrRenderer:
+    """QR PNG 를 프로세스 풀에서 병렬 렌더링합니다.
+
+    ``workers`` 가 0 이거나 배치가 ``min_batch`` 보다 작으면 현재 프로세스에서
+    순차 렌더링합니다. 풀은 워커 프로세스마다 처음 필요할 때 spawn 방식으로
+    만들어 재사용합니다 (gevent 워커에서 fork 는 안전하지 않음).
+    """
+
+    def __init__(self, workers, min_batch=32, window=256):
+        self.workers = workers
+        self.min_batch = min_batch
+        self.window = window
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # 풀 관련 모듈은 실제로 병렬 렌더링할 때만 불러옴
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def render(self, items):
+        """(url, serial) 목록을 입력 순서대로 (serial, png) 로 내보냅니다."""
+        if self.workers <= 0 or len(items) < self.min_batch:
+            for item in items:
+                yield render_qr_png(item)
+            return
+
+        executor = self._get_executor()
+        # 진행 중인 작업 수를 window 로 제한해 결과가 메모리에 쌓이지 않게 함
+        pending = deque()
+        it = iter(items)
+        for item in it:
+            pending.append(executor.submit(render_qr_png, item))
+            if len(pending) >= self.window:
+                break
+        while pending:
+            yield pending.popleft().result()
+            for item in it:
+                pending.append(executor.submit(render_qr_png, item))
+                break
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """seek 불가능한 쓰기 버퍼. ZipFile 이 data descriptor 방식으로 씁니다."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_qr_zip(tokens, base_url, renderer, rendered=None):
+    """(token, serial) 목록의 QR ZIP 을 항목이 완성되는 대로 조각내어 생성합니다.
+
+    ``rendered`` ({serial: png}) 에 있는 항목은 다시 그리지 않고 그대로 씁니다.
+    """
+    logging.info("QR ZIP 생성 시작: %d개", len(tokens))
+    rendered = rendered or {}
+    items = [
+        (f"{base_url}/vote?token={token}", serial)
+        for token, serial in tokens if serial not in rendered
+    ]
+    buf = ZipStreamBuffer()
+    # PNG 는 이미 압축되어 있으므로 ZIP 에서는 저장만 함
+    with ZipFile(buf, 'w', compression=ZIP_STORED) as zipf:
+        for serial, png in chain(rendered.items(), renderer.render(items)):
+            try:
+                zipf.writestr(f'token_{serial:03d}.png', png)
+            except Exception as zip_err:
+                logging.exception("ZIP에 쓰기 실패: %s", zip_err)
+            chunk = buf.drain()
+            if chunk:
+                yield chunk
+    yield buf.drain()
+    logging.info("QR ZIP 생성 완료")
@@ -0,0 +1,108 @@
+import io
+import logging
+from zipfile import ZipFile, ZIP_STORED
+
+from .qr_batch import ZipStreamBuffer
+
+# A4 @ 150 DPI
+PAGE_DPI = 150
+PAGE_SIZE = (1240, 1754)
+PAGE_MARGIN = 60
+LABEL_HEIGHT = 24
+QUIET_ZONE = 2  # 셀 안에서 QR 주변 여백 (모듈 단위)
+
+
+def qr_matrix(url):
+    """URL 의 QR 모듈 행렬(테두리 제외)을 반환합니다. 비트맵은 만들지 않습니다."""
+    import qrcode
+
+    qr = qrcode.QRCode(border=0)
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def _matrix_image(matrix, module_px):
+    from PIL import Image
+
+    n = len(matrix)
+    # 1 모듈 = 1 픽셀로 만든 뒤 최근접 보간으로 확대 (모듈별 사각형 그리기 없음)
+    img = Image.new("1", (n, n), 1)
+    img.putdata([0 if cell else 1 for row in matrix for cell in row])
+    return img.resize((n * module_px, n * module_px), Image.NEAREST)
+
+
+def render_pages(items, cols=4, rows=5):
+    """(url, serial) 목록을 cols x rows 격자의 1-bit 페이지 이미지로 배치합니다."""
+    from PIL import Image, ImageDraw
+
+    page_w, page_h = PAGE_SIZE
+    cell_w = (page_w - 2 * PAGE_MARGIN) // cols
+    cell_h = (page_h - 2 * PAGE_MARGIN) // rows
+    per_page = cols * rows
+
+    for start in range(0, len(items), per_page):
+        page = Image.new("1", PAGE_SIZE, 1)
+        draw = ImageDraw.Draw(page)
+        for idx, (url, serial) in enumerate(items[start:start + per_page]):
+            matrix = qr_matrix(url)
+            n = len(matrix) + 2 * QUIET_ZONE
+            module_px = max(1, min(cell_w, cell_h - LABEL_HEIGHT) // n)
+            qr_img = _matrix_image(matrix, module_px)
+
+            col, row = idx % cols, idx // cols
+            x0 = PAGE_MARGIN + col * cell_w
+            y0 = PAGE_MARGIN + row * cell_h
+            qx = x0 + (cell_w - qr_img.width) // 2
+            qy = y0 + QUIET_ZONE * module_px
+            page.paste(qr_img, (qx, qy))
+
+            try:
+                text = f"{serial:03d}"
+                bbox = draw.textbbox((0, 0), text)
+                text_width = bbox[2] - bbox[0]
+                draw.text(
+                    (x0 + (cell_w - text_width) / 2, qy + qr_img.height + QUIET_ZONE * module_px // 2),
+                    text, fill=0
+                )
+            except Exception as draw_err:
+                logging.exception("텍스트 추가 실패: %s", draw_err)
+        yield page
+
+
+def build_qr_pdf(tokens, base_url, cols=4, rows=5):
+    """(token, serial) 목록을 여러 장의 QR 을 배치한 단일 PDF 바이트로 만듭니다.
+
+    빈 PDF 는 만들 수 없으므로 ``tokens`` 가 비어 있으면 ValueError 를 냅니다.
+    """
+    if not tokens:
+        raise ValueError("PDF 로 출력할 토큰이 없습니다.")
+    logging.info("QR PDF 생성 시작: %d개", len(tokens))
+    items = [(f"{base_url}/vote?token={token}", serial) for token, serial in tokens]
+    pages = list(render_pages(items, cols, rows))
+    buf = io.BytesIO()
+    pages[0].save(
+        buf, format="PDF", resolution=PAGE_DPI, save_all=True, append_images=pages[1:]
+    )
+    logging.info("QR PDF 생성 완료: %d쪽", len(pages))
+    return buf.getvalue()
+
+
+def stream_qr_sheets_zip(tokens, base_url, cols=4, rows=5):
+    """격자 배치한 PNG 시트들을 ZIP 으로 한 장씩 스트리밍합니다."""
+    logging.info("QR 시트 ZIP 생성 시작: %d개", len(tokens))
+    items = [(f"{base_url}/vote?token={token}", serial) for token, serial in tokens]
+    per_page = cols * rows
+    buf = ZipStreamBuffer()
+    with ZipFile(buf, 'w', compression=ZIP_STORED) as zipf:
+        for page_no, page in enumerate(render_pages(items, cols, rows)):
+            first = items[page_no * per_page][1]
+            last = items[min(len(items), (page_no + 1) * per_page) - 1][1]
+            png = io.BytesIO()
+            page.save(png, format="PNG", optimize=False)
+            zipf.writestr(f"tokens_{first:03d}-{last:03d}.png", png.getvalue())
+            chunk = buf.drain()
+            if chunk:
+                yield chunk
+    yield buf.drain()
+    logging.info("QR 시트 ZIP 생성 완료")
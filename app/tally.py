@@ -0,0 +1,166 @@
+import threading
+from datetime import datetime, timezone
+
+from .vote_options import VoteOptions, parse_options
+
+# 요약 테이블은 표결 UUID 로 묶으므로 votes.item_id 를 vote_items 와 조인해 읽음
+_VOTES_BY_ITEM = "votes JOIN vote_items ON vote_items.id = votes.item_id"
+
+RECENT_SIZE = 10
+
+
+class TallySnapshot:
+    __slots__ = ("vote_id", "total", "counts", "recent")
+
+    def __init__(self, vote_id, total, counts, recent):
+        self.vote_id = vote_id
+        self.total = total
+        self.counts = counts
+        self.recent = recent
+
+    def as_dict(self):
+        return {
+            "vote_id": self.vote_id,
+            "total": self.total,
+            "counts": dict(self.counts),
+            "recent": [dict(r) for r in self.recent],
+        }
+
+
+class TallyEngine:
+    """표결별 집계를 요약 테이블로 증분 유지하고, 워커 메모리에 스냅샷을 둡니다.
+
+    - ``vote_tally_totals``  : vote_id 별 총 투표 수 (스냅샷 버전으로도 사용)
+    - ``vote_tallies``       : vote_id, option_id 별 득표 수
+    - ``vote_tally_recent``  : vote_id 별 최근 투표 링 버퍼 (slot = 순번 % RECENT_SIZE)
+
+    요약 테이블은 투표 INSERT 와 같은 트랜잭션에서 갱신되므로 모든 gunicorn
+    워커가 같은 값을 봅니다. 각 워커는 총 투표 수가 바뀐 경우에만 O(선택지)
+    만큼 다시 읽습니다.
+    """
+
+    def __init__(self, recent_size=RECENT_SIZE):
+        self.recent_size = recent_size
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def record(self, conn, ballots):
+        """투표 INSERT 와 같은 트랜잭션 안에서 호출합니다."""
+        # 백엔드와 상관없이 같은 형식으로 남기도록 시각은 여기서 문자열로 만듦 (UTC)
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        for vote_id, _token, option_id in ballots:
+            conn.execute(
+                "INSERT INTO vote_tally_totals (vote_id, total) VALUES (?, 1) "
+                "ON CONFLICT(vote_id) DO UPDATE SET total = vote_tally_totals.total + 1",
+                (vote_id,),
+            )
+            conn.execute(
+                "INSERT INTO vote_tallies (vote_id, option_id, count) VALUES (?, ?, 1) "
+                "ON CONFLICT(vote_id, option_id) DO UPDATE SET count = vote_tallies.count + 1",
+                (vote_id, option_id),
+            )
+            total = conn.execute(
+                "SELECT total FROM vote_tally_totals WHERE vote_id = ?", (vote_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO vote_tally_recent (vote_id, slot, seq, option_id, timestamp) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(vote_id, slot) DO UPDATE SET seq = excluded.seq, "
+                "option_id = excluded.option_id, timestamp = excluded.timestamp",
+                (vote_id, total % self.recent_size, total, option_id, now),
+            )
+
+    def forget(self, conn, vote_ids):
+        """표결 삭제와 같은 트랜잭션 안에서 호출합니다."""
+        params = [(vid,) for vid in vote_ids]
+        for table in ("vote_tally_totals", "vote_tallies", "vote_tally_recent"):
+            conn.executemany(f"DELETE FROM {table} WHERE vote_id = ?", params)
+        with self._lock:
+            for vid in vote_ids:
+                self._cache.pop(vid, None)
+
+    def rebuild(self, conn):
+        """votes 테이블로부터 요약 테이블 전체를 다시 계산합니다."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("vote_tally_totals", "vote_tallies", "vote_tally_recent"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute(
+                "INSERT INTO vote_tally_totals (vote_id, total) "
+                f"SELECT vote_items.vote_id, COUNT(*) FROM {_VOTES_BY_ITEM} GROUP BY vote_items.vote_id"
+            )
+            conn.execute(
+                "INSERT INTO vote_tallies (vote_id, option_id, count) "
+                f"SELECT vote_items.vote_id, votes.option_id, COUNT(*) FROM {_VOTES_BY_ITEM} "
+                "GROUP BY vote_items.vote_id, votes.option_id"
+            )
+            conn.execute(
+                f"""
+                INSERT INTO vote_tally_recent (vote_id, slot, seq, option_id, timestamp)
+                SELECT r.vote_id, (t.total - r.rn + 1) % ?, t.total - r.rn + 1,
+                       r.option_id, r.timestamp
+                FROM (
+                    SELECT vote_items.vote_id, votes.option_id, votes.timestamp,
+                           ROW_NUMBER() OVER (PARTITION BY votes.item_id ORDER BY votes.id DESC) AS rn
+                    FROM {_VOTES_BY_ITEM}
+                ) r
+                JOIN vote_tally_totals t ON t.vote_id = r.vote_id
+                WHERE r.rn <= ?
+                """,
+                (self.recent_size, self.recent_size),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        with self._lock:
+            self._cache.clear()
+
+    def _total(self, conn, vote_id):
+        row = conn.execute(
+            "SELECT total FROM vote_tally_totals WHERE vote_id = ?", (vote_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def snapshot(self, conn, vote_id):
+        total = self._total(conn, vote_id)
+        with self._lock:
+            cached = self._cache.get(vote_id)
+        if cached is not None and cached.total == total:
+            return cached
+
+        # 총계·득표·최근 내역을 한 읽기 트랜잭션에서 일관되게 읽음
+        own_txn = not conn.in_transaction
+        if own_txn:
+            conn.execute("BEGIN")
+        try:
+            total = self._total(conn, vote_id)
+            # 요약 테이블은 option_id 로 저장하고, 화면용 선택지 이름은 여기서 붙임
+            row = conn.execute(
+                "SELECT options FROM vote_items WHERE vote_id = ?", (vote_id,)
+            ).fetchone()
+            label = VoteOptions(vote_id, parse_options(row[0]) if row else (), False).label
+            counts = {
+                label(r[0]): r[1]
+                for r in conn.execute(
+                    "SELECT option_id, count FROM vote_tallies WHERE vote_id = ? "
+                    "ORDER BY option_id",
+                    (vote_id,),
+                )
+            }
+            recent = [
+                {"choice": label(r[0]), "timestamp": r[1]}
+                for r in conn.execute(
+                    "SELECT option_id, timestamp FROM vote_tally_recent "
+                    "WHERE vote_id = ? ORDER BY seq DESC",
+                    (vote_id,),
+                )
+            ]
+        finally:
+            if own_txn:
+                conn.commit()
+
+        snap = TallySnapshot(vote_id, total, counts, recent)
+        with self._lock:
+            self._cache[vote_id] = snap
+        return snap
@@ -0,0 +1,175 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+TOKEN_VERSION_KEY = "token_version"
+
+BUMP_TOKEN_VERSION_SQL = (
+    "INSERT INTO settings (key, value) VALUES ('token_version', '1') "
+    "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(settings.value AS INTEGER) + 1 AS VARCHAR)"
+)
+
+
+class BloomFilter:
+    """유효 토큰 집합의 Bloom filter. '없음' 판정은 확정적입니다."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TokenEntry:
+    __slots__ = ("serial_number", "voted", "expires")
+
+    def __init__(self, serial_number, voted, expires):
+        self.serial_number = serial_number
+        self.voted = voted
+        self.expires = expires
+
+
+class TokenCache:
+    """토큰 유효성 / 기존 투표 내역 캐시.
+
+    - 유효 토큰: TTL 이 있는 LRU 에 일련번호와 이미 투표한 vote_id 집합을 보관
+    - 없는 토큰: 전체 토큰으로 만든 Bloom filter 로 DB 조회 없이 거절하고,
+      Bloom filter 를 통과한 오탐은 음성 LRU 에 보관
+    - ``settings.token_version`` 을 ``check_interval`` 초마다 확인해 다른 워커의
+      토큰 생성/삭제를 반영 (이 워커의 변경은 ``invalidate()`` 로 즉시 반영)
+
+    캐시된 투표 내역은 다른 워커의 투표로 오래될 수 있으나, 실제 중복은
+    UniqueConstraint 가 막고 호출 측이 ``refresh()`` 후 다시 판단합니다.
+    """
+
+    def __init__(self, max_entries=50000, ttl=300.0, negative_ttl=60.0, check_interval=1.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.check_interval = check_interval
+        self._entries = OrderedDict()
+        self._negative = OrderedDict()
+        self._bloom = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.bloom_rejects = 0
+
+    @staticmethod
+    def bump(conn):
+        conn.execute(BUMP_TOKEN_VERSION_SQL)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._negative.clear()
+            self._bloom = None
+            self._version = None
+            self._checked_at = 0.0
+
+    def _sync(self, conn, now):
+        if self._bloom is not None and now - self._checked_at < self.check_interval:
+            return
+        row = conn.execute(
+            "SELECT value FROM settings WHERE key = ?", (TOKEN_VERSION_KEY,)
+        ).fetchone()
+        version = int(row[0]) if row else 0
+        if self._bloom is None or version != self._version:
+            tokens = [r[0] for r in conn.execute("SELECT token FROM tokens")]
+            bloom = BloomFilter(max(len(tokens) * 2, 1024))
+            for token in tokens:
+                bloom.add(token)
+            with self._lock:
+                self._entries.clear()
+                self._negative.clear()
+                self._bloom = bloom
+                self._version = version
+        self._checked_at = now
+
+    def _load(self, conn, token, now):
+        row = conn.execute(
+            "SELECT id, serial_number FROM tokens WHERE token = ?", (token,)
+        ).fetchone()
+        with self._lock:
+            if not row:
+                self._negative[token] = now + self.negative_ttl
+                self._negative.move_to_end(token)
+                if len(self._negative) > self.max_entries:
+                    self._negative.popitem(last=False)
+                return None
+        voted = {
+            r[0] for r in conn.execute(
+                "SELECT vote_items.vote_id FROM votes "
+                "JOIN vote_items ON vote_items.id = votes.item_id WHERE votes.token_id = ?",
+                (row[0],),
+            )
+        }
+        entry = TokenEntry(row[1], voted, now + self.ttl)
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, conn, token):
+        """유효하면 TokenEntry, 없는 토큰이면 None 을 반환합니다."""
+        now = time.monotonic()
+        self._sync(conn, now)
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry.expires > now:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return entry
+            if token not in self._bloom:
+                self.bloom_rejects += 1
+                return None
+            expires = self._negative.get(token)
+            if expires is not None and expires > now:
+                self.negative_hits += 1
+                return None
+            self.misses += 1
+        return self._load(conn, token, now)
+
+    def refresh(self, conn, token):
+        """캐시를 무시하고 DB 에서 다시 읽습니다."""
+        with self._lock:
+            self._entries.pop(token, None)
+            self._negative.pop(token, None)
+        return self._load(conn, token, time.monotonic())
+
+    def mark_voted(self, token, vote_ids):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                entry.voted = entry.voted | set(vote_ids)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "negative_entries": len(self._negative),
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "bloom_rejects": self.bloom_rejects,
+            }
@@ -0,0 +1,233 @@
+import logging
+import os
+import threading
+import time
+
+TOKEN_SERIAL_SEQUENCE = "token_serial"
+# "모든 의결권 삭제"로 일련번호를 처음부터 다시 쓸 때마다 1 씩 증가
+TOKEN_SERIAL_EPOCH = "token_serial_epoch"
+
+INSERT_TOKENS_SQL = (
+    "INSERT INTO tokens (token, serial_number, created_at) VALUES (?, ?, CURRENT_TIMESTAMP)"
+)
+
+# 예비분을 채우는 프로세스 하나만 잡는 임대 (settings 행, 값은 만료 시각 epoch 초)
+FILL_LEASE_KEY = "token_pool_fill_lease"
+
+_MAX_TOKEN_SERIAL = "(SELECT COALESCE(MAX(serial_number), 0) FROM tokens)"
+_ALLOCATE_TOKEN_SERIALS_SQL = (
+    f"UPDATE sequences SET value = CASE WHEN value < {_MAX_TOKEN_SERIAL} "
+    f"THEN {_MAX_TOKEN_SERIAL} ELSE value END + ? WHERE name = ?"
+)
+
+
+def sequence_value(conn, name):
+    row = conn.execute("SELECT value FROM sequences WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+
+def allocate_serials(conn, count, name=TOKEN_SERIAL_SEQUENCE):
+    """``sequences`` 에서 연속된 번호 ``count`` 개를 잡아 range 로 반환합니다.
+
+    호출 측 트랜잭션 안에서 시퀀스 행을 갱신(잠금)하므로 동시에 발급해도 범위가
+    겹치지 않습니다. 커밋은 호출 측이 합니다. 토큰 일련번호는 직접 넣은 토큰
+    (가져오기 등)을 건너뛰도록 ``tokens`` 의 최댓값(인덱스 조회) 아래로 내려가지 않습니다.
+    """
+    conn.execute(
+        "INSERT INTO sequences (name, value) VALUES (?, 0) ON CONFLICT(name) DO NOTHING", (name,)
+    )
+    if name == TOKEN_SERIAL_SEQUENCE:
+        conn.execute(_ALLOCATE_TOKEN_SERIALS_SQL, (count, name))
+    else:
+        conn.execute("UPDATE sequences SET value = value + ? WHERE name = ?", (count, name))
+    last = sequence_value(conn, name)
+    return range(last - count + 1, last + 1)
+
+
+def reset_serials(conn):
+    """토큰을 모두 지운 뒤 일련번호를 1 부터 다시 쓰도록 시퀀스를 되돌리고 예비분을 비웁니다."""
+    conn.execute("DELETE FROM token_pool")
+    conn.execute("UPDATE sequences SET value = 0 WHERE name = ?", (TOKEN_SERIAL_SEQUENCE,))
+    allocate_serials(conn, 1, TOKEN_SERIAL_EPOCH)
+
+
+class TokenPool:
+    """미리 발급한 토큰과 렌더링해 둔 QR PNG 의 예비분 (``token_pool`` 테이블).
+
+    ``claim()`` 은 예비분에서 일련번호 순으로 꺼내 ``tokens`` 로 옮기고, 모자라면
+    그 자리에서 일련번호를 잡아 새로 발급합니다. 꺼낸 뒤 ``kick()`` 하면 백그라운드
+    스레드가 ``target`` 개가 될 때까지 ``batch`` 개씩 다시 채웁니다 (``target`` 이 0 이면 끔).
+    예비 토큰은 ``tokens`` 에 없으므로 꺼내기 전에는 투표에 쓸 수 없습니다.
+
+    채우기는 DB 의 임대(``FILL_LEASE_KEY``)를 잡은 워커·머신 하나만 하므로 워커마다
+    따로 채워 ``target`` 을 넘기지 않습니다. 잡은 프로세스가 죽으면 ``lease`` 초 뒤 풀립니다.
+    """
+
+    def __init__(self, connect, new_token, renderer, target=0, batch=100, base_url=None, lease=120.0):
+        self._connect = connect
+        self._new_token = new_token
+        # () -> QrRenderer. QR 모듈은 처음 채울 때 불러옴
+        self._renderer = renderer
+        self.target = target
+        self.batch = batch
+        self.lease = lease
+        self._lease_value = None
+        # QR 에 넣을 주소. BASE_URL 이 없으면 첫 관리자 요청의 주소를 씀
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self.minted = 0
+        self.claimed = 0
+        self.shortfall = 0
+
+    def size(self, conn):
+        return conn.execute("SELECT COUNT(*) FROM token_pool").fetchone()[0]
+
+    def claim(self, conn, count, base_url):
+        """토큰 ``count`` 개를 발급해 일련번호 순의 [(token, serial, png 또는 None)] 을 반환합니다.
+
+        호출 측 트랜잭션 안에서 실행하며 커밋은 호출 측이 합니다. 다른 주소로 렌더링해
+        둔 PNG 는 None 으로 돌려주어 출력할 때 다시 그리게 합니다.
+        """
+        rows = conn.execute(
+            "DELETE FROM token_pool WHERE serial_number IN ("
+            "SELECT serial_number FROM token_pool ORDER BY serial_number LIMIT ?) "
+            "RETURNING token, serial_number, base_url, png",
+            (count,),
+        ).fetchall()
+        issued = sorted(
+            (
+                (token, serial, bytes(png) if png is not None and url == base_url else None)
+                for token, serial, url, png in rows
+            ),
+            key=lambda item: item[1],
+        )
+        missing = count - len(issued)
+        if missing:
+            issued.extend(
+                (self._new_token(), serial, None) for serial in allocate_serials(conn, missing)
+            )
+        conn.executemany(INSERT_TOKENS_SQL, [(token, serial) for token, serial, _ in issued])
+        self.claimed += len(rows)
+        self.shortfall += missing
+        return issued
+
+    def _acquire_lease(self):
+        now = time.time()
+        value = repr(now + self.lease)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO settings (key, value) VALUES (?, '0') ON CONFLICT(key) DO NOTHING",
+                (FILL_LEASE_KEY,),
+            )
+            cur = conn.execute(
+                "UPDATE settings SET value = ? WHERE key = ? AND CAST(value AS REAL) < ?",
+                (value, FILL_LEASE_KEY, now),
+            )
+            acquired = cur.rowcount == 1
+            conn.commit()
+        finally:
+            conn.close()
+        self._lease_value = value if acquired else None
+        return acquired
+
+    def _release_lease(self):
+        value, self._lease_value = self._lease_value, None
+        conn = self._connect()
+        try:
+            # 만료 뒤 다른 프로세스가 잡은 임대는 건드리지 않음
+            conn.execute(
+                "UPDATE settings SET value = '0' WHERE key = ? AND value = ?", (FILL_LEASE_KEY, value)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def fill(self):
+        """예비분이 ``target`` 보다 적으면 최대 ``batch`` 개를 발급·렌더링해 넣고 넣은 수를 반환합니다.
+
+        다른 프로세스가 채우는 중이면 (임대를 잡지 못하면) 0 을 반환합니다.
+        """
+        base_url = self.base_url
+        if not self.target or not base_url:
+            return 0
+        if not self._acquire_lease():
+            return 0
+        try:
+            return self._fill(base_url)
+        finally:
+            self._release_lease()
+
+    def _fill(self, base_url):
+        conn = self._connect()
+        try:
+            missing = min(self.batch, self.target - self.size(conn))
+            if missing <= 0:
+                return 0
+            epoch = sequence_value(conn, TOKEN_SERIAL_EPOCH)
+            serials = allocate_serials(conn, missing)
+            conn.commit()
+        finally:
+            conn.close()
+
+        # 렌더링은 트랜잭션 밖에서 (일련번호는 이미 잡아 두었으므로 다른 발급과 겹치지 않음)
+        tokens = [(self._new_token(), serial) for serial in serials]
+        pngs = dict(self._renderer().render(
+            [(f"{base_url}/vote?token={token}", serial) for token, serial in tokens]
+        ))
+
+        conn = self._connect()
+        try:
+            # 그 사이 "모든 의결권 삭제"로 일련번호가 초기화됐으면 이번 분량은 버림
+            if sequence_value(conn, TOKEN_SERIAL_EPOCH) != epoch:
+                return 0
+            conn.executemany(
+                "INSERT INTO token_pool (token, serial_number, base_url, png, created_at) "
+                "VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                [(token, serial, base_url, pngs[serial]) for token, serial in tokens],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self.minted += len(tokens)
+        return len(tokens)
+
+    def kick(self, base_url=None):
+        """예비분을 백그라운드에서 채우기 시작합니다 (이미 채우는 중이면 그대로 둠)."""
+        if base_url:
+            self.base_url = base_url
+        if not self.target or not self.base_url:
+            return
+        with self._lock:
+            # gunicorn --preload 로 fork 된 워커에서는 스레드를 새로 띄워야 함
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop = threading.Event()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop,), name="vote-token-pool", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, stop):
+        try:
+            while not stop.is_set() and self.fill():
+                pass
+        except Exception as e:
+            logging.exception("토큰 예비분 채우기 실패: %s", e)
+
+    def stats(self):
+        return {"minted": self.minted, "claimed": self.claimed, "shortfall": self.shortfall}
+
+    def close(self, timeout=5.0):
+        """채우는 중인 분량까지만 넣고 멈춥니다. 다시 kick 하면 새로 띄웁니다."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid() and thread.is_alive():
+            thread.join(timeout)
@@ -0,0 +1,108 @@
+import threading
+import unicodedata
+
+from .ballot_cache import BallotCache
+
+
+def normalize_label(label):
+    """선택지 문자열을 NFC 로 정규화하고 앞뒤·연속 공백을 정리합니다."""
+    return " ".join(unicodedata.normalize("NFC", label).split())
+
+
+def parse_options(raw):
+    """쉼표로 구분된 선택지를 정규화된 튜플로 변환합니다 (빈 값·중복 제거, 순서 유지)."""
+    labels = []
+    for part in (raw or "").split(","):
+        label = normalize_label(part)
+        if label and label not in labels:
+            labels.append(label)
+    return tuple(labels)
+
+
+# 투표지 라디오 버튼 값의 접두사: 숫자로 된 선택지 이름과 option_id 를 구분
+FORM_ID_PREFIX = "id:"
+
+
+class VoteOptions:
+    """표결 하나의 선택지. option_id 는 정규화된 목록의 1부터 시작하는 위치입니다."""
+
+    __slots__ = ("vote_id", "is_active", "labels", "ids")
+
+    def __init__(self, vote_id, labels, is_active):
+        self.vote_id = vote_id
+        self.is_active = is_active
+        self.labels = labels
+        self.ids = {label: i for i, label in enumerate(labels, 1)}
+
+    def choices(self):
+        return list(enumerate(self.labels, 1))
+
+    def label(self, option_id):
+        if 1 <= option_id <= len(self.labels):
+            return self.labels[option_id - 1]
+        return str(option_id)
+
+    def resolve(self, choice):
+        """폼 값을 option_id 로 바꿉니다.
+
+        투표지(ballot_items.html)는 ``id:<option_id>`` 를 보내므로 선택지 이름이 숫자여도
+        ("2,1" 표결의 "2" 는 ``id:1``) 헷갈리지 않습니다. 접두사가 없으면 선택지 이름으로,
+        그래도 없으면 이전 투표지가 보낸 option_id 숫자로 읽습니다. option_id 는 ASCII
+        숫자만 읽습니다 ("²", "١" 같은 유니코드 숫자는 없는 선택지).
+        """
+        if isinstance(choice, int):
+            option_id = choice
+        else:
+            if choice.startswith(FORM_ID_PREFIX):
+                choice = choice[len(FORM_ID_PREFIX):]
+            else:
+                label_id = self.ids.get(normalize_label(choice))
+                if label_id is not None:
+                    return label_id
+            if not (choice.isascii() and choice.isdigit()):
+                return None
+            option_id = int(choice)
+        return option_id if 1 <= option_id <= len(self.labels) else None
+
+
+class OptionCache:
+    """vote_id 별 파싱된 선택지 캐시.
+
+    선택지는 표결 생성 후 바뀌지 않으므로, 활성 상태가 바뀌는 create_vote /
+    start_vote / end_vote 등이 올리는 ``settings.ballot_version`` 이 달라질 때만
+    vote_items 를 다시 읽습니다. 그 외에는 투표 검증이 dict 조회로 끝납니다.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._version = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def snapshot(self, conn):
+        """현재 ballot_version 기준 {vote_id: VoteOptions} 를 반환합니다."""
+        version = BallotCache.version(conn)
+        with self._lock:
+            if version == self._version:
+                return self._items
+        items = {
+            row[0]: VoteOptions(row[0], parse_options(row[1]), bool(row[2]))
+            for row in conn.execute("SELECT vote_id, options, is_active FROM vote_items")
+        }
+        with self._lock:
+            self._items = items
+            self._version = version
+            self.reloads += 1
+        return items
+
+    def active(self, conn):
+        return {vid: opts for vid, opts in self.snapshot(conn).items() if opts.is_active}
+
+    def labelled(self, ballots):
+        """(vote_id, token, option_id) 목록을 감사 로그용 (vote_id, token, 선택지) 로 바꿉니다."""
+        with self._lock:
+            items = self._items
+        return [
+            (vote_id, token, items[vote_id].label(option_id) if vote_id in items else str(option_id))
+            for vote_id, token, option_id in ballots
+        ]
@@ -0,0 +1,176 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+
+from .keys import ITEM_ID, TOKEN_ID
+
+# 중복 투표는 예외 대신 건너뛰고 삽입 건수로 확인 (PostgreSQL 에서는 예외가 트랜잭션을 중단시킴).
+# (vote_id, token) UUID 는 정수 키로 바꿔 저장하며, 없는 토큰·표결이면 NOT NULL 위반
+INSERT_VOTE_SQL = (
+    f"INSERT INTO votes (item_id, token_id, option_id) VALUES ({ITEM_ID}, {TOKEN_ID}, ?) "
+    "ON CONFLICT(token_id, item_id) DO NOTHING"
+)
+
+_STOP = object()
+
+
+class DuplicateVote(sqlite3.IntegrityError):
+    """이미 투표한 (token, vote_id) 가 섞여 있음. 다른 UNIQUE 위반과 같이 처리됩니다."""
+
+
+def insert_ballots(conn, ballots):
+    """(vote_id, token, option_id) 목록을 삽입하고 건수를 반환합니다.
+
+    하나라도 이미 투표한 항목이면 ``DuplicateVote`` 를 올리며, 호출한 쪽에서
+    트랜잭션(또는 SAVEPOINT)을 롤백해 요청분 전체를 되돌립니다.
+    """
+    if not ballots:
+        return 0
+    inserted = conn.executemany(INSERT_VOTE_SQL, ballots).rowcount
+    if inserted != len(ballots):
+        raise DuplicateVote("UNIQUE constraint failed: votes.token_id, votes.item_id")
+    return inserted
+
+
+class _PendingBallots:
+    """writer 에 넘긴 한 요청분 투표와 그 커밋 결과."""
+
+    __slots__ = ("ballots", "done", "inserted", "error")
+
+    def __init__(self, ballots):
+        self.ballots = ballots
+        self.done = threading.Event()
+        self.inserted = 0
+        self.error = None
+
+
+class GroupCommitWriter:
+    """여러 요청의 투표를 하나의 트랜잭션으로 묶어 커밋하는 프로세스별 writer.
+
+    요청별 투표는 SAVEPOINT 로 격리되므로, 한 요청에서 UniqueConstraint
+    위반이 나면 그 요청분만 롤백되고 같은 배치의 다른 요청은 커밋됩니다.
+    ``submit()`` 은 자기 배치가 커밋된 뒤에 반환합니다.
+    """
+
+    def __init__(self, connect, max_batch=256, max_wait=0.005, on_insert=None, on_commit=None):
+        self._connect = connect
+        self._on_insert = on_insert
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._on_commit = on_commit
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.batches = 0
+        self.ballots = 0
+
+    def _ensure_started(self):
+        # gunicorn --preload 로 fork 된 워커에서는 스레드를 새로 띄워야 함
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name="vote-group-commit", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, ballots, timeout=30):
+        """(vote_id, token, option_id) 목록을 커밋하고 삽입 건수를 반환합니다.
+
+        중복 투표면 ``sqlite3.IntegrityError`` 를 그대로 올립니다.
+        """
+        if not ballots:
+            return 0
+        self._ensure_started()
+        pending = _PendingBallots(list(ballots))
+        self._queue.put(pending)
+        if not pending.done.wait(timeout):
+            raise TimeoutError("투표 일괄 커밋 대기 시간 초과")
+        if pending.error is not None:
+            raise pending.error
+        return pending.inserted
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def close(self, timeout=5.0):
+        """대기 중인 투표를 커밋한 뒤 writer 스레드를 멈춥니다. 다시 submit 하면 새로 띄웁니다."""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        count = len(first.ballots)
+        try:
+            while count < self.max_batch:
+                item = self._queue.get(timeout=self.max_wait)
+                if item is _STOP:
+                    # 이번 배치를 커밋한 뒤 종료
+                    self._queue.put(_STOP)
+                    break
+                batch.append(item)
+                count += len(item.ballots)
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            try:
+                self._commit_batch(batch)
+            except Exception as e:
+                logging.exception("투표 일괄 커밋 실패: %s", e)
+                for pending in batch:
+                    if not pending.done.is_set():
+                        pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+    def _commit_batch(self, batch):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for pending in batch:
+                conn.execute("SAVEPOINT ballot")
+                try:
+                    inserted = insert_ballots(conn, pending.ballots)
+                    if self._on_insert is not None:
+                        # 같은 SAVEPOINT 안에서 파생 데이터(집계 등) 갱신
+                        self._on_insert(conn, pending.ballots)
+                    pending.inserted = inserted
+                except sqlite3.IntegrityError as e:
+                    conn.execute("ROLLBACK TO ballot")
+                    pending.error = e
+                conn.execute("RELEASE ballot")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        self.batches += 1
+        for pending in batch:
+            if pending.error is None:
+                self.ballots += pending.inserted
+                if self._on_commit is not None:
+                    try:
+                        self._on_commit(pending.ballots)
+                    except Exception as e:
+                        logging.exception("커밋 후 처리 실패: %s", e)
@@ -0,0 +1,104 @@
+"""키오스크 일괄 입력 처리량 벤치마크 (HTML 폼 submit_vote vs JSON /admin/ballots).
+
+    python benchmarks/bench_bulk_ballots.py --ballots 2000 --batch 200
+
+폼 경로는 투표지 한 장마다 POST + 리다이렉트 + /vote 재렌더링을,
+JSON 경로는 --batch 장씩 한 요청으로 보냅니다. 각 경로를 별도 프로세스에서
+임시 DB 로 실행하고 ballots/sec 를 출력합니다.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(mode, ballots, batch):
+    sys.path.insert(0, ROOT)
+    app = importlib.import_module("app").app
+    server = sys.modules["app.server"]
+
+    conn = server.db()
+    conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', 'bench')")
+    conn.execute(
+        "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+        "VALUES ('v1', 'a1', 'bench', '찬성,반대', 1)"
+    )
+    conn.executemany(
+        "INSERT INTO tokens (token, serial_number) VALUES (?, ?)",
+        [(f"tok-{i}", i) for i in range(ballots)],
+    )
+    conn.commit()
+    conn.close()
+
+    requests = 0
+    with app.test_client() as client:
+        client.post("/login", data={"password": "bench"})
+        start = time.perf_counter()
+        if mode == "form":
+            for i in range(ballots):
+                # 키오스크 화면 흐름: 제출 → 리다이렉트된 투표지 다시 열기
+                client.post("/submit_vote", data={"token": f"tok-{i}", "choice_v1": "찬성"},
+                            follow_redirects=True)
+                requests += 1
+        else:
+            for lo in range(0, ballots, batch):
+                client.post("/admin/ballots", json=[
+                    {"token": f"tok-{i}", "vote_id": "v1", "choice": "찬성"}
+                    for i in range(lo, min(lo + batch, ballots))
+                ])
+                requests += 1
+        elapsed = time.perf_counter() - start
+
+    conn = server.db()
+    stored = conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+    conn.close()
+    return {
+        "ballots": ballots,
+        "requests": requests,
+        "stored": stored,
+        "seconds": round(elapsed, 3),
+        "ballots_per_sec": round(stored / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ballots", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=200, help="JSON 요청당 투표 수")
+    parser.add_argument("--child", choices=("form", "json"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_once(args.child, args.ballots, args.batch)))
+        return
+
+    results = {}
+    for mode in ("form", "json"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                SECRET_KEY="bench",
+                ADMIN_PASSWORD="bench",
+                DB_PATH=os.path.join(tmp, "bench.db"),
+                LOG_DIR=os.path.join(tmp, "log"),
+            )
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode,
+                 "--ballots", str(args.ballots), "--batch", str(args.batch)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[mode] = json.loads(out.strip().splitlines()[-1])
+    results["speedup"] = round(
+        results["json"]["ballots_per_sec"] / results["form"]["ballots_per_sec"], 1
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
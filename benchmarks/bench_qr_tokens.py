@@ -0,0 +1,79 @@
+"""QR 토큰 출력 생성 벤치마크 (순차/프로세스 풀 ZIP, 인쇄용 PDF/시트).
+
+    python benchmarks/bench_qr_tokens.py --sizes 100 1000 5000 --workers 4
+
+각 크기별로 소요 시간, 초당 토큰 수, 출력 크기, 한 번에 메모리에 머문 최대
+조각 크기(스트리밍이 아니면 ZIP 전체 크기와 같음)를 JSON 으로 출력합니다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+# app 패키지 import 시 server 설정이 로드되므로 임시 환경을 지정
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ADMIN_PASSWORD", "bench")
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="vote-bench-"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qr_batch import QrRenderer, stream_qr_zip  # noqa: E402
+from app.qr_sheets import build_qr_pdf, stream_qr_sheets_zip  # noqa: E402
+
+BASE_URL = "https://vote-system.fly.dev"
+
+
+def run(size, produce):
+    tokens = [(str(uuid.uuid4()), i + 1) for i in range(size)]
+    start = time.perf_counter()
+    total = 0
+    largest = 0
+    for chunk in produce(tokens):
+        total += len(chunk)
+        largest = max(largest, len(chunk))
+    elapsed = time.perf_counter() - start
+    return {
+        "tokens": size,
+        "seconds": round(elapsed, 3),
+        "tokens_per_sec": round(size / elapsed, 1),
+        "output_bytes": total,
+        "max_buffered_bytes": largest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--formats", nargs="+", default=["serial", "pool", "pdf", "sheets"],
+        choices=["serial", "pool", "pdf", "sheets"],
+    )
+    args = parser.parse_args()
+
+    serial = QrRenderer(0)
+    pooled = QrRenderer(args.workers, min_batch=1)
+    if "pool" in args.formats:
+        # 풀 기동 비용은 워커 수명 동안 한 번뿐이므로 측정에서 제외
+        list(pooled.render([("warmup", 0)] * args.workers))
+    producers = {
+        "serial": lambda tokens: stream_qr_zip(tokens, BASE_URL, serial),
+        "pool": lambda tokens: stream_qr_zip(tokens, BASE_URL, pooled),
+        "pdf": lambda tokens: [build_qr_pdf(tokens, BASE_URL)],
+        "sheets": lambda tokens: stream_qr_sheets_zip(tokens, BASE_URL),
+    }
+    try:
+        results = [
+            {fmt: run(size, producers[fmt]) for fmt in args.formats}
+            for size in args.sizes
+        ]
+    finally:
+        pooled.shutdown()
+    print(json.dumps({"workers": args.workers, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""토큰·표결 키 저장 방식별 DB 크기와 조회/삽입 속도 (UUID 문자열 vs 정수 키).
+
+    python benchmarks/bench_storage.py --tokens 10000 --items 50
+
+마이그레이션 5 이전(votes 에 UUID 문자열)과 이후(tokens.id / vote_items.id 정수 키)
+스키마에 같은 투표(토큰 × 표결)를 넣고 VACUUM 뒤 파일 크기, 투표 삽입 속도,
+토큰별 기존 투표 조회·표결별 집계 속도를 비교합니다. 이전 스키마 DB 를 제자리에서
+옮기는 마이그레이션 시간도 함께 잽니다.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.db import create_db_engine, raw_connection  # noqa: E402
+from app.keys import ITEM_ID  # noqa: E402
+from app.migrations import _use_integer_keys  # noqa: E402
+from app.write_queue import INSERT_VOTE_SQL  # noqa: E402
+
+# 마이그레이션 5 이전 스키마 (votes 와 그 인덱스에 UUID 문자열)
+LEGACY_SCHEMA = """
+CREATE TABLE vote_agendas (agenda_id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, created_at DATETIME);
+CREATE TABLE tokens (token VARCHAR PRIMARY KEY, serial_number INTEGER, created_at DATETIME);
+CREATE INDEX ix_tokens_serial_number ON tokens (serial_number);
+CREATE TABLE vote_items (
+    vote_id VARCHAR PRIMARY KEY, agenda_id VARCHAR NOT NULL REFERENCES vote_agendas (agenda_id),
+    title VARCHAR NOT NULL, options VARCHAR NOT NULL, is_active BOOLEAN, created_at DATETIME
+);
+CREATE INDEX ix_vote_items_is_active ON vote_items (is_active);
+CREATE INDEX ix_vote_items_agenda_id_created_at ON vote_items (agenda_id, created_at);
+CREATE TABLE votes (
+    id INTEGER NOT NULL PRIMARY KEY, vote_id VARCHAR REFERENCES vote_items (vote_id),
+    token VARCHAR REFERENCES tokens (token), option_id INTEGER NOT NULL,
+    timestamp DATETIME, voter_name VARCHAR, UNIQUE (token, vote_id)
+);
+CREATE INDEX ix_votes_vote_id_option_id ON votes (vote_id, option_id);
+"""
+
+LAYOUTS = {
+    "uuid_text": {
+        "insert": (
+            "INSERT INTO votes (vote_id, token, option_id) VALUES (?, ?, ?) "
+            "ON CONFLICT(token, vote_id) DO NOTHING"
+        ),
+        "prior_votes": "SELECT vote_id FROM votes WHERE token = ?",
+        "item_count": "SELECT COUNT(*) FROM votes WHERE vote_id = ?",
+    },
+    "integer_keys": {
+        "insert": INSERT_VOTE_SQL,
+        # TokenCache 와 같은 조회 (토큰 행을 읽은 뒤 정수 키로)
+        "prior_votes": (
+            "SELECT vote_items.vote_id FROM votes JOIN vote_items ON vote_items.id = votes.item_id "
+            "WHERE votes.token_id = (SELECT id FROM tokens WHERE token = ?)"
+        ),
+        "item_count": f"SELECT COUNT(*) FROM votes WHERE item_id = {ITEM_ID}",
+    },
+}
+
+
+def create(path, layout):
+    engine = create_db_engine(path)
+    conn = raw_connection(engine)
+    conn.executescript(LEGACY_SCHEMA)
+    if layout == "integer_keys":
+        _use_integer_keys(conn)
+    conn.commit()
+    return engine, conn
+
+
+def seed(conn, tokens, vote_ids):
+    conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', 'bench')")
+    conn.executemany(
+        "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+        "VALUES (?, 'a1', 'bench', '찬성,반대,기권', 1)",
+        [(vote_id,) for vote_id in vote_ids],
+    )
+    conn.executemany(
+        "INSERT INTO tokens (token, serial_number) VALUES (?, ?)",
+        [(token, serial) for serial, token in enumerate(tokens, 1)],
+    )
+    conn.commit()
+
+
+def file_size(conn, path):
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(path)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_layout(tmp, layout, tokens, vote_ids, batch, lookups):
+    path = os.path.join(tmp, f"{layout}.db")
+    engine, conn = create(path, layout)
+    sql = LAYOUTS[layout]
+    try:
+        seed(conn, tokens, vote_ids)
+        # 토큰 한 명이 모든 표결에 투표한 것처럼 한 요청분(batch)씩 커밋
+        ballots = [(vote_id, token, i % 3 + 1) for i, token in enumerate(tokens) for vote_id in vote_ids]
+
+        def insert():
+            for start in range(0, len(ballots), batch):
+                conn.executemany(sql["insert"], ballots[start:start + batch])
+                conn.commit()
+
+        insert_s = timed(insert)
+        size = file_size(conn, path)
+        sample = random.Random(0).sample(tokens, min(lookups, len(tokens)))
+        prior_s = timed(lambda: [conn.execute(sql["prior_votes"], (t,)).fetchall() for t in sample])
+        count_s = timed(lambda: [conn.execute(sql["item_count"], (v,)).fetchone() for v in vote_ids])
+        return {
+            "db_bytes": size,
+            "bytes_per_vote": round(size / len(ballots), 1),
+            "insert_votes_per_sec": round(len(ballots) / insert_s),
+            "prior_votes_lookup_us": round(prior_s / len(sample) * 1e6, 1),
+            "item_count_ms": round(count_s / len(vote_ids) * 1000, 2),
+        }, path
+    finally:
+        conn.close()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=10000)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=50, help="커밋당 투표 수 (투표지 한 장)")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    tokens = [str(uuid.uuid4()) for _ in range(args.tokens)]
+    vote_ids = [str(uuid.uuid4()) for _ in range(args.items)]
+    results = {"tokens": args.tokens, "items": args.items, "votes": args.tokens * args.items}
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = None
+        for layout in LAYOUTS:
+            results[layout], path = run_layout(
+                tmp, layout, tokens, vote_ids, args.batch, args.lookups
+            )
+            if layout == "uuid_text":
+                legacy_path = path
+
+        # 기존 DB 를 제자리에서 정수 키로 옮기는 시간 (마이그레이션 5 + VACUUM)
+        migrated = os.path.join(tmp, "migrated.db")
+        shutil.copy(legacy_path, migrated)
+        engine = create_db_engine(migrated)
+        conn = raw_connection(engine)
+        try:
+            start = time.perf_counter()
+            _use_integer_keys(conn)
+            conn.commit()
+            size = file_size(conn, migrated)
+            results["migration"] = {
+                "seconds": round(time.perf_counter() - start, 2),
+                "db_bytes": size,
+            }
+        finally:
+            conn.close()
+            engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""submit_vote 처리량 벤치마크 (직접 커밋 vs 일괄 커밋).
+
+    python benchmarks/bench_submit_vote.py --ballots 500 --concurrency 32
+
+각 모드를 별도 프로세스에서 임시 DB 로 실행하고 ballots/sec 를 출력합니다.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(ballots, concurrency):
+    sys.path.insert(0, ROOT)
+    app = importlib.import_module("app").app
+    server = sys.modules["app.server"]
+
+    conn = server.db()
+    conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', 'bench')")
+    conn.execute(
+        "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+        "VALUES ('v1', 'a1', 'bench', '찬성,반대', 1)"
+    )
+    conn.executemany(
+        "INSERT INTO tokens (token, serial_number) VALUES (?, ?)",
+        [(f"tok-{i}", i) for i in range(ballots)],
+    )
+    conn.commit()
+    conn.close()
+
+    def cast(i):
+        with app.test_client() as client:
+            rv = client.post("/submit_vote", data={"token": f"tok-{i}", "choice_v1": "찬성"})
+            return rv.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(cast, range(ballots)))
+    elapsed = time.perf_counter() - start
+
+    conn = server.db()
+    stored = conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+    conn.close()
+    return {
+        "ballots": ballots,
+        "stored": stored,
+        "errors": sum(1 for s in statuses if s != 302),
+        "seconds": round(elapsed, 3),
+        "ballots_per_sec": round(stored / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ballots", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--synchronous", default="FULL", help="SQLite synchronous PRAGMA")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_once(args.ballots, args.concurrency)))
+        return
+
+    results = {}
+    for mode, flag in (("direct", "0"), ("group_commit", "1")):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                SECRET_KEY="bench",
+                ADMIN_PASSWORD="bench",
+                DB_PATH=os.path.join(tmp, "bench.db"),
+                LOG_DIR=os.path.join(tmp, "log"),
+                DB_SYNCHRONOUS=args.synchronous,
+                VOTE_GROUP_COMMIT=flag,
+            )
+            out = subprocess.run(
+                [sys.executable, __file__, "--child",
+                 "--ballots", str(args.ballots), "--concurrency", str(args.concurrency)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[mode] = json.loads(out.strip().splitlines()[-1])
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
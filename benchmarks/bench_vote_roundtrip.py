@@ -0,0 +1,104 @@
+"""투표지 제출 왕복 벤치마크 (폼 POST + 리다이렉트 vs fetch JSON 제출).
+
+    python benchmarks/bench_vote_roundtrip.py --ballots 1000 --items 5
+
+폼 경로는 투표지마다 POST → 302 → /vote 재렌더링(토큰 확인·투표지·회의명)을,
+fetch 경로는 POST 한 번으로 표결별 결과 JSON 만 받습니다. 각 경로를 별도
+프로세스에서 임시 DB 로 실행하고 투표지당 요청 수와 지연(p50/p95)을 출력합니다.
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(mode, ballots, items):
+    sys.path.insert(0, ROOT)
+    app = importlib.import_module("app").app
+    server = sys.modules["app.server"]
+
+    vote_ids = [f"v{i}" for i in range(items)]
+    conn = server.db()
+    conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', 'bench')")
+    conn.executemany(
+        "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+        "VALUES (?, 'a1', 'bench', '찬성,반대,기권', 1)",
+        [(vote_id,) for vote_id in vote_ids],
+    )
+    conn.executemany(
+        "INSERT INTO tokens (token, serial_number) VALUES (?, ?)",
+        [(f"tok-{i}", i) for i in range(ballots)],
+    )
+    conn.commit()
+    conn.close()
+
+    requests = 0
+    latencies = []
+    with app.test_client() as client:
+        for i in range(ballots):
+            data = {"token": f"tok-{i}", **{f"choice_{v}": "1" for v in vote_ids}}
+            start = time.perf_counter()
+            if mode == "form":
+                rv = client.post("/submit_vote", data=data, follow_redirects=True)
+                requests += 1 + len(rv.history)
+            else:
+                rv = client.post("/submit_vote", data=data, headers={"Accept": "application/json"})
+                requests += 1
+            latencies.append(time.perf_counter() - start)
+
+    conn = server.db()
+    stored = conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+    conn.close()
+    latencies.sort()
+    return {
+        "ballots": ballots,
+        "stored": stored,
+        "requests_per_ballot": round(requests / ballots, 2),
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 2),
+        "latency_ms_p95": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "ballots_per_sec": round(ballots / sum(latencies), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ballots", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=5, help="투표지의 표결 수")
+    parser.add_argument("--child", choices=("form", "fetch"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_once(args.child, args.ballots, args.items)))
+        return
+
+    results = {}
+    for mode in ("form", "fetch"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                SECRET_KEY="bench",
+                ADMIN_PASSWORD="bench",
+                DB_PATH=os.path.join(tmp, "bench.db"),
+                LOG_DIR=os.path.join(tmp, "log"),
+            )
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode,
+                 "--ballots", str(args.ballots), "--items", str(args.items)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[mode] = json.loads(out.strip().splitlines()[-1])
+    results["speedup"] = round(
+        results["fetch"]["ballots_per_sec"] / results["form"]["ballots_per_sec"], 1
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
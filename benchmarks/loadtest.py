@@ -0,0 +1,296 @@
+"""투표 흐름 부하 테스트 / 벤치마크.
+
+임시 DB_PATH 로 앱을 띄우고 토큰·안건·표결을 심은 뒤, 회의 상황별 시나리오를
+동시성 단계별로 실행해 처리량과 p50/p95/p99 지연을 JSON 으로 출력합니다.
+
+    python benchmarks/loadtest.py --concurrency 1 16 64 --requests 500 -o before.json
+    python benchmarks/loadtest.py --concurrency 1 16 64 --requests 500 --compare before.json
+
+시나리오
+  vote_open     : 유권자들이 QR 을 찍고 /vote 를 여는 상황
+  submit_burst  : 표결 시작 직후 /submit_vote 가 몰리는 상황 (요청마다 새 토큰)
+  status_poll   : 관리자/프로젝터가 /admin/status 를 새로고침하는 상황
+  qr_generate   : 현장에서 의결권을 추가 발급하는 상황 (/admin/generate_tokens)
+
+--server gunicorn 을 주면 배포와 같은 gevent 워커로 실행합니다 (gunicorn 필요).
+"""
+import argparse
+import http.cookiejar
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("vote_open", "submit_burst", "status_poll", "qr_generate")
+ADMIN_PASSWORD = "loadtest"
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(latencies, errors, elapsed):
+    lat = sorted(latencies)
+    ms = lambda v: round(v * 1000, 2) if v is not None else None  # noqa: E731
+    return {
+        "requests": len(lat) + errors,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(lat) / elapsed, 1) if elapsed else None,
+        "p50_ms": ms(percentile(lat, 50)),
+        "p95_ms": ms(percentile(lat, 95)),
+        "p99_ms": ms(percentile(lat, 99)),
+        "max_ms": ms(lat[-1] if lat else None),
+    }
+
+
+def seed(env, tokens, agendas, items):
+    """앱 모듈을 같은 환경으로 import 해 스키마를 만들고 데이터를 심습니다."""
+    os.environ.update(env)
+    sys.path.insert(0, ROOT)
+    import importlib
+
+    app = importlib.import_module("app").app
+    server = sys.modules["app.server"]
+    conn = server.db()
+    try:
+        vote_ids = []
+        for a in range(agendas):
+            agenda_id = f"agenda-{a}"
+            conn.execute(
+                "INSERT INTO vote_agendas (agenda_id, title, created_at) VALUES (?, ?, datetime('now'))",
+                (agenda_id, f"제{a + 1}호 안건"),
+            )
+            for i in range(items):
+                vote_id = f"vote-{a}-{i}"
+                conn.execute(
+                    "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active, created_at) "
+                    "VALUES (?, ?, ?, '찬성,반대,기권', 1, datetime('now'))",
+                    (vote_id, agenda_id, f"표결 {i + 1}"),
+                )
+                vote_ids.append(vote_id)
+        conn.executemany(
+            "INSERT INTO tokens (token, serial_number, created_at) VALUES (?, ?, datetime('now'))",
+            [(f"load-{n:06d}", n + 1) for n in range(tokens)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return app, vote_ids
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, app, env, workers):
+    port = free_port()
+    if kind == "werkzeug":
+        from werkzeug.serving import make_server
+
+        srv = make_server("127.0.0.1", port, app, threaded=True)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{port}", srv.shutdown
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:app", "-k", "gevent",
+         "-w", str(workers), "-b", f"127.0.0.1:{port}", "--log-level", "warning"],
+        cwd=ROOT, env=dict(os.environ, **env),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                break
+        except OSError:
+            time.sleep(0.1)
+    else:
+        proc.kill()
+        raise RuntimeError("gunicorn 이 시작되지 않았습니다")
+
+    def stop():
+        proc.terminate()
+        proc.wait(10)
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def admin_opener(base):
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), _NoRedirect)
+    try:
+        opener.open(base + "/login", data=urllib.parse.urlencode({"password": ADMIN_PASSWORD}).encode())
+    except urllib.error.HTTPError as e:
+        if e.code != 302:
+            raise
+    return opener
+
+
+def make_request(scenario, base, vote_ids, token_counter, admin, qr_count):
+    """시나리오 한 건을 실행할 (opener, url, data, 성공 상태코드) 를 반환합니다."""
+    plain = urllib.request.build_opener(_NoRedirect)
+    if scenario == "vote_open":
+        n = next(token_counter["read"]) % token_counter["total"]
+        return plain, f"{base}/vote?token=load-{n:06d}", None, (200,)
+    if scenario == "submit_burst":
+        n = next(token_counter["write"])
+        form = {"token": f"load-{n:06d}"}
+        form.update({f"choice_{vid}": "찬성" for vid in vote_ids})
+        return plain, f"{base}/submit_vote", urllib.parse.urlencode(form).encode(), (302,)
+    if scenario == "status_poll":
+        vid = vote_ids[next(token_counter["read"]) % len(vote_ids)]
+        return admin, f"{base}/admin/status?vote_id={vid}", None, (200,)
+    if scenario == "qr_generate":
+        data = urllib.parse.urlencode({"count": qr_count, "format": "pdf"}).encode()
+        return admin, f"{base}/admin/generate_tokens", data, (200,)
+    raise ValueError(scenario)
+
+
+def run_scenario(scenario, base, vote_ids, counters, admin, requests, concurrency, qr_count):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors
+        opener, url, data, ok = make_request(scenario, base, vote_ids, counters, admin, qr_count)
+        start = time.perf_counter()
+        try:
+            with opener.open(url, data=data, timeout=60) as resp:
+                resp.read()
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except Exception:
+            status = None
+        elapsed = time.perf_counter() - start
+        with lock:
+            if status in ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current, baseline):
+    """시나리오·동시성별 rps 와 p95 변화를 출력합니다."""
+    rows = []
+    for scenario, levels in current["results"].items():
+        for level, cur in levels.items():
+            old = baseline.get("results", {}).get(scenario, {}).get(level)
+            if not old or not old.get("rps") or not cur.get("rps"):
+                continue
+            rows.append({
+                "scenario": scenario,
+                "concurrency": int(level),
+                "rps_change_pct": round((cur["rps"] / old["rps"] - 1) * 100, 1),
+                "p95_change_pct": round((cur["p95_ms"] / old["p95_ms"] - 1) * 100, 1)
+                if old.get("p95_ms") else None,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=300, help="시나리오·동시성 단계별 요청 수")
+    parser.add_argument("--qr-requests", type=int, default=4, help="qr_generate 요청 수")
+    parser.add_argument("--qr-count", type=int, default=50, help="qr_generate 요청당 토큰 수")
+    parser.add_argument("--agendas", type=int, default=3)
+    parser.add_argument("--items", type=int, default=2, help="안건별 활성 표결 수")
+    parser.add_argument("--tokens", type=int, default=None, help="기본값: 필요한 만큼")
+    parser.add_argument("--server", choices=("werkzeug", "gunicorn"), default="werkzeug")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn 워커 수")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    tokens = args.tokens or args.requests * len(args.concurrency) + 1
+    tmp = tempfile.mkdtemp(prefix="vote-loadtest-")
+    env = {
+        "SECRET_KEY": "loadtest",
+        "ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "DATA_DIR": tmp,
+        "DB_PATH": os.path.join(tmp, "data.db"),
+        "LOG_DIR": os.path.join(tmp, "log"),
+    }
+    app, vote_ids = seed(env, tokens, args.agendas, args.items)
+    base, stop = start_server(args.server, app, env, args.workers)
+
+    counters = {"read": itertools.count(), "write": itertools.count(), "total": tokens}
+    results = {}
+    try:
+        admin = admin_opener(base)
+        for scenario in args.scenarios:
+            results[scenario] = {}
+            for level in args.concurrency:
+                requests = args.qr_requests if scenario == "qr_generate" else args.requests
+                results[scenario][str(level)] = run_scenario(
+                    scenario, base, vote_ids, counters, admin,
+                    requests, level, args.qr_count,
+                )
+                print(f"{scenario:13s} c={level:<4d} {results[scenario][str(level)]}", file=sys.stderr)
+    finally:
+        stop()
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "server": args.server,
+        "config": {
+            "requests": args.requests, "agendas": args.agendas, "items": args.items,
+            "tokens": tokens, "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"] = {
+            "baseline_revision": baseline.get("revision"),
+            "rows": compare(report, baseline),
+        }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
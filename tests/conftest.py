@@ -0,0 +1,75 @@
+import os
+import importlib
+import sys
+import pytest
+
+# 환경변수 없이 app 하위 모듈을 import 하는 테스트가 있으므로 미리 채워 둠
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ADMIN_PASSWORD", "test")
+
+
+@pytest.fixture
+def server_env():
+    """앱을 만들 때 더 넣을 환경변수. 테스트 파일에서 같은 이름의 fixture 로 덮어씁니다."""
+    return {}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch, server_env):
+    monkeypatch.setenv("SECRET_KEY", "test")
+    monkeypatch.setenv("ADMIN_PASSWORD", "admin")
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setenv("LOG_DIR", str(tmp_path / "log"))
+    for name, value in server_env.items():
+        monkeypatch.setenv(name, value)
+    if "app.server" in sys.modules:
+        importlib.reload(sys.modules["app.server"])
+    app_module = importlib.reload(importlib.import_module("app"))
+    # 새 환경변수(DB_PATH 등)로 앱을 다시 만듦
+    app_module.app = app_module.create_app()
+    return sys.modules["app.server"]
+
+
+@pytest.fixture
+def client(server):
+    app = sys.modules["app"].app
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def admin_client(client):
+    client.post("/login", data={"password": "admin"})
+    return client
+
+
+@pytest.fixture
+def seed(server):
+    """안건 a1 에 표결과 토큰을 넣는 함수를 돌려줍니다.
+
+    ``vote_ids`` 는 진행 중, ``closed_ids`` 는 종료된 표결로 넣습니다.
+    ``tokens`` 가 정수면 ``tok-0`` 부터 그 수만큼 만듭니다.
+    """
+    def seed(tokens=("tok-1",), vote_ids=("v1",), closed_ids=(), options="찬성,반대",
+             title="찬반", db=None):
+        if isinstance(tokens, int):
+            tokens = [f"tok-{i}" for i in range(tokens)]
+        conn = (db or server.db)()
+        try:
+            conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', '제1호 안건')")
+            conn.executemany(
+                "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+                "VALUES (?, 'a1', ?, ?, ?)",
+                [(vote_id, title, options, 1) for vote_id in vote_ids]
+                + [(vote_id, title, options, 0) for vote_id in closed_ids],
+            )
+            conn.executemany(
+                "INSERT INTO tokens (token, serial_number) VALUES (?, ?)",
+                [(token, serial) for serial, token in enumerate(tokens, 1)],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    return seed
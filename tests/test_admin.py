@@ -11,7 +11,7 @@ def client(tmp_path):
     if "app.server" in sys.modules:
         importlib.reload(sys.modules["app.server"])
     module = importlib.reload(importlib.import_module("app"))
-    app = module.app
+    app = module.create_app()
     app.config['TESTING'] = True
     with app.test_client() as client:
         yield client
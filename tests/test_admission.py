@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+import pytest
+
+from app.admission import QUEUE_FULL, TIMEOUT, AdmissionClass, AdmissionController
+
+
+def controller(max_wait=1.0):
+    return AdmissionController([
+        AdmissionClass("vote", 1, queue=1),
+        AdmissionClass("bulk", 1, queue=1, yields_to=("vote",)),
+    ], max_wait=max_wait)
+
+
+def test_rejects_when_queue_full_and_admits_after_release():
+    admission = controller()
+    assert admission.acquire("vote")[0]
+
+    waiter = {}
+    thread = threading.Thread(target=lambda: waiter.update(result=admission.acquire("vote")))
+    thread.start()
+    while admission.stats()[("vote", "waiting")] == 0:
+        time.sleep(0.001)
+
+    # 실행 1 + 대기 1 이 찼으므로 세 번째는 기다리지 않고 거절
+    assert admission.acquire("vote") == (False, QUEUE_FULL)
+
+    admission.release("vote")
+    thread.join()
+    assert waiter["result"][0]
+    assert admission.stats()[("vote", "active")] == 1
+    assert admission.rejections()[("vote", QUEUE_FULL)] == 1
+
+
+def test_waiting_times_out():
+    admission = controller(max_wait=0.05)
+    admission.acquire("vote")
+    assert admission.acquire("vote") == (False, TIMEOUT)
+    assert admission.stats()[("vote", "waiting")] == 0
+
+
+def test_bulk_yields_to_waiting_votes():
+    admission = controller(max_wait=0.05)
+    admission.acquire("vote")
+    thread = threading.Thread(target=admission.acquire, args=("vote",))
+    thread.start()
+    while admission.stats()[("vote", "waiting")] == 0:
+        time.sleep(0.001)
+
+    # bulk 자리는 비어 있지만 투표 제출이 기다리는 동안은 들어가지 않음
+    assert admission.acquire("bulk") == (False, TIMEOUT)
+    admission.release("vote")
+    thread.join()
+    assert admission.acquire("bulk")[0]
+
+
+@pytest.fixture
+def server_env():
+    return {
+        "ADMISSION_VOTE_LIMIT": "1",
+        "ADMISSION_VOTE_QUEUE": "0",
+        "ADMISSION_BULK_LIMIT": "1",
+        "ADMISSION_BULK_QUEUE": "0",
+        "ADMISSION_ADMIN_QUEUE": "0",
+        "LIVE_LONG_POLL_SEC": "2",
+    }
+
+
+def test_full_vote_queue_returns_fast_503(server, client):
+    conn = server.db()
+    try:
+        conn.execute("INSERT INTO tokens (token, serial_number) VALUES ('tok-1', 1)")
+        conn.commit()
+    finally:
+        conn.close()
+
+    # 다른 요청이 투표 제출 자리를 차지하고 있는 상태
+    assert server.admission.acquire("vote")[0]
+    rv = client.post("/submit_vote", data={"token": "tok-1"}, headers={"Accept": "application/json"})
+    assert rv.status_code == 503
+    assert rv.headers["Retry-After"] == "2"
+    body = rv.get_json()
+    assert body["results"] == {} and body["messages"][0][0] == "error"
+
+    rv = client.post("/submit_vote", data={"token": "tok-1"})
+    assert rv.status_code == 503 and "잠시 후" in rv.get_data(as_text=True)
+
+    # 투표지 보기(read)는 다른 대기열이라 영향 없음
+    assert client.get("/vote?token=tok-1").status_code == 200
+
+    server.admission.release("vote")
+    rv = client.post("/submit_vote", data={"token": "tok-1"}, headers={"Accept": "application/json"})
+    assert rv.status_code == 200
+    assert server.admission.stats()[("vote", "active")] == 0
+
+    client.post("/login", data={"password": "admin"})
+    text = client.get("/admin/metrics").get_data(as_text=True)
+    assert 'vote_admission_rejected_total{class="vote",reason="queue_full"} 2' in text
+    assert 'vote_admission_requests{class="vote",state="active"} 0' in text
+
+
+def test_export_holds_bulk_slot_until_streamed(server, client):
+    client.post("/login", data={"password": "admin"})
+    rv = client.get("/admin/export_results?kind=tallies&format=csv", buffered=False)
+    assert server.admission.stats()[("bulk", "active")] == 1
+    assert client.get("/admin/export_results?kind=tallies&format=csv").status_code == 503
+    rv.get_data()
+    rv.close()
+    assert server.admission.stats()[("bulk", "active")] == 0
+
+
+def test_results_long_polls_do_not_take_admin_slots(server, seed):
+    seed(closed_ids=("v2",))
+    app = sys.modules["app"].app
+    statuses = []
+
+    def poll():
+        with app.test_client() as poller:
+            poller.post("/login", data={"password": "admin"})
+            # 투표가 없으므로 LIVE_LONG_POLL_SEC 동안 열려 있음
+            statuses.append(poller.get("/admin/results/v1?since=0").status_code)
+
+    pollers = [threading.Thread(target=poll) for _ in range(server.ADMISSION_ADMIN_LIMIT)]
+    for thread in pollers:
+        thread.start()
+    time.sleep(0.5)
+    assert server.admission.stats()[("admin", "active")] == 0
+    with app.test_client() as admin:
+        admin.post("/login", data={"password": "admin"})
+        assert admin.get("/admin/start_vote/v2").status_code == 302
+    for thread in pollers:
+        thread.join(10)
+    assert statuses == [204] * server.ADMISSION_ADMIN_LIMIT
@@ -0,0 +1,70 @@
+import csv
+import io
+from zipfile import ZipFile
+import pytest
+
+
+@pytest.fixture(params=["0", "1"], ids=["direct", "group_commit"])
+def server_env(request):
+    return {"VOTE_GROUP_COMMIT": request.param}
+
+
+def audit_rows(server):
+    # 따로 flush 하지 않음: 응답이 나간 시점에 이미 커밋되어 있어야 함
+    conn = server.db()
+    try:
+        return [tuple(r) for r in conn.execute(
+            "SELECT timestamp, vote_id, token, choice FROM audit_log ORDER BY id"
+        )]
+    finally:
+        conn.close()
+
+
+def test_committed_ballots_are_logged_once(server, client, seed):
+    seed(tokens=("tok-1", "tok-2"))
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성"})
+    client.post("/submit_vote", data={"token": "tok-2", "choice_v1": "반대"})
+    client.post("/submit_vote", data={"token": "tok-2", "choice_v1": "찬성"})
+    rows = audit_rows(server)
+    assert [(r[1], r[2], r[3]) for r in rows] == [
+        ("v1", "tok-1", "찬성"),
+        ("v1", "tok-2", "반대"),
+    ]
+
+
+def test_rolled_back_ballots_are_not_logged(server, client, monkeypatch, seed):
+    seed(tokens=("tok-1", "tok-2"))
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성"})
+
+    def fail(conn, ballots):
+        raise server.sqlite3.IntegrityError("forced")
+
+    monkeypatch.setattr(server.tallies, "record", fail)
+    monkeypatch.setattr(server.vote_writer, "_on_insert", fail)
+    client.post("/submit_vote", data={"token": "tok-2", "choice_v1": "반대"})
+    assert [r[2] for r in audit_rows(server)] == ["tok-1"]
+
+
+def test_log_survives_token_deletion(server, client, seed):
+    seed(tokens=("tok-1", "tok-2"))
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성"})
+    client.post("/login", data={"password": "admin"})
+    client.post("/admin/delete_tokens")
+    assert [r[2] for r in audit_rows(server)] == ["tok-1"]
+
+
+def test_export_logs_includes_table_and_old_segments(server, client, seed):
+    seed(tokens=("tok-1", "tok-2"))
+    (server.LOG_DIR / "votes_20240101_123.csv").write_text(
+        "timestamp,vote_id,token,choice\n2024-01-01 09:00:00,v0,tok-old,찬성\n", encoding="utf-8"
+    )
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성"})
+    client.post("/login", data={"password": "admin"})
+    rv = client.get("/admin/export_logs")
+    assert rv.mimetype == "application/zip"
+    with ZipFile(io.BytesIO(rv.get_data())) as zipf:
+        assert zipf.namelist() == ["votes_20240101_123.csv", "votes_audit.csv"]
+        assert "tok-old" in zipf.read("votes_20240101_123.csv").decode("utf-8")
+        rows = list(csv.reader(io.StringIO(zipf.read("votes_audit.csv").decode("utf-8"))))
+    assert rows[0] == ["timestamp", "vote_id", "token", "choice"]
+    assert [r[1:] for r in rows[1:]] == [["v1", "tok-1", "찬성"]]
@@ -0,0 +1,48 @@
+def test_vote_page_served_from_snapshot(server, client, seed):
+    seed(vote_ids=(), closed_ids=("v1",), title="예산안 승인")
+    client.get("/vote?token=tok-1")
+    misses = server.ballot_cache.misses
+    for _ in range(5):
+        rv = client.get("/vote?token=tok-1")
+        assert rv.status_code == 200
+    assert server.ballot_cache.misses == misses
+    assert server.ballot_cache.hits >= 5
+
+
+def test_admin_changes_invalidate_snapshot(server, client, seed):
+    seed(vote_ids=(), closed_ids=("v1",), title="예산안 승인")
+    assert "예산안 승인" not in client.get("/vote?token=tok-1").get_data(as_text=True)
+
+    client.post("/login", data={"password": "admin"})
+    client.get("/admin/start_vote/v1")
+    body = client.get("/vote?token=tok-1").get_data(as_text=True)
+    assert "예산안 승인" in body
+    assert 'name="choice_v1"' in body
+
+    client.post("/admin/set_meeting_title", json={"meeting_title": "임시총회"})
+    assert "임시총회" in client.get("/vote?token=tok-1").get_data(as_text=True)
+
+    client.get("/admin/end_vote/v1")
+    assert "현재 진행 중인 투표가 없습니다." in client.get("/vote?token=tok-1").get_data(as_text=True)
+
+
+def test_version_is_shared_across_workers(server, seed):
+    seed(vote_ids=(), closed_ids=("v1",), title="예산안 승인")
+    builds = []
+
+    def build(conn, version):
+        builds.append(version)
+        return server.BallotSnapshot(version, "", [], "")
+
+    worker_a, worker_b = server.BallotCache(), server.BallotCache()
+    conn = server.db()
+    try:
+        worker_a.get(conn, build)
+        worker_b.get(conn, build)
+        worker_a.bump(conn)
+        conn.commit()
+        worker_b.get(conn, build)
+        worker_b.get(conn, build)
+    finally:
+        conn.close()
+    assert builds == [0, 0, 1]
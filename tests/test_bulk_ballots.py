@@ -0,0 +1,69 @@
+import sqlite3
+import sys
+
+from app.bulk_ballots import validate_ballots
+from app.vote_options import VoteOptions
+
+
+def test_bulk_ballots_per_ballot_results(server, admin_client, seed):
+    seed(tokens=("tok-1", "tok-2"), closed_ids=("v2",))
+    rv = admin_client.post("/admin/ballots", json={"ballots": [
+        {"token": "tok-1", "vote_id": "v1", "choice": "찬성"},
+        {"token": "tok-1", "vote_id": "v1", "choice": "반대"},
+        {"token": "nope", "vote_id": "v1", "choice": "찬성"},
+        {"token": "tok-2", "vote_id": "v2", "choice": "찬성"},
+        {"token": "tok-2", "vote_id": "v1", "choice": "모름"},
+        {"token": "tok-2", "vote_id": "v1"},
+        {"token": "tok-2", "vote_id": "v1", "choice": "반대"},
+    ]})
+    assert rv.status_code == 200
+    body = rv.get_json()
+    assert [r["status"] for r in body["results"]] == [
+        "ok", "duplicate", "invalid_token", "inactive_vote", "invalid_choice", "invalid", "ok",
+    ]
+    assert body["accepted"] == 2
+    assert body["rejected"] == 5
+    conn = server.db()
+    try:
+        assert server.tallies.snapshot(conn, "v1").counts == {"찬성": 1, "반대": 1}
+    finally:
+        conn.close()
+
+
+def test_bulk_ballots_rejects_prior_votes(server, admin_client, seed):
+    seed(tokens=("tok-1", "tok-2"), closed_ids=("v2",))
+    admin_client.post("/admin/ballots", json=[{"token": "tok-1", "vote_id": "v1", "choice": "찬성"}])
+    rv = admin_client.post("/admin/ballots", json=[{"token": "tok-1", "vote_id": "v1", "choice": "반대"}])
+    assert rv.get_json()["results"][0]["status"] == "duplicate"
+
+
+def test_bulk_ballots_bad_payload(admin_client):
+    assert admin_client.post("/admin/ballots", json={"foo": 1}).status_code == 400
+    assert admin_client.post("/admin/ballots", data="x").status_code == 400
+
+
+def test_bulk_ballots_requires_login(server):
+    app = sys.modules["app"].app
+    with app.test_client() as anon:
+        rv = anon.post("/admin/ballots", json=[])
+    assert rv.status_code == 302
+
+
+def test_validation_query_count_is_constant():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE tokens (id INTEGER PRIMARY KEY, token VARCHAR UNIQUE);
+        CREATE TABLE vote_items (id INTEGER PRIMARY KEY, vote_id VARCHAR UNIQUE);
+        CREATE TABLE votes (item_id INTEGER, token_id INTEGER, option_id INTEGER);
+        """
+    )
+    conn.executemany("INSERT INTO tokens (token) VALUES (?)", [(f"t{i}",) for i in range(1200)])
+    statements = []
+    conn.set_trace_callback(statements.append)
+    ballots = [{"token": f"t{i}", "vote_id": "v1", "choice": "찬성"} for i in range(1200)]
+    active = {"v1": VoteOptions("v1", ("찬성", "반대"), True)}
+    insert_queue, results = validate_ballots(conn, ballots, active)
+    assert len(insert_queue) == 1200
+    # 토큰 3묶음 + 기존 투표 3묶음 (표결·선택지는 캐시에서 확인)
+    assert len(statements) == 6
@@ -0,0 +1,114 @@
+import sys
+import pytest
+
+
+@pytest.fixture(params=["0", "1"], ids=["direct", "group_commit"])
+def server_env(request):
+    return {"QR_WORKERS": "0", "VOTE_GROUP_COMMIT": request.param}
+
+
+def counters(server):
+    conn = server.db()
+    try:
+        return server.counters.snapshot(conn)
+    finally:
+        conn.close()
+
+
+def recomputed(server):
+    other = server.DashboardCounters()
+    conn = server.db()
+    try:
+        other.recompute(conn)
+        return other.snapshot(conn)
+    finally:
+        conn.close()
+
+
+def rows(server, sql):
+    conn = server.db()
+    try:
+        return [r[0] for r in conn.execute(sql)]
+    finally:
+        conn.close()
+
+
+def test_counters_follow_admin_and_vote_flow(server, admin_client):
+    admin_client.post("/admin/create_agenda", data={"agenda_title": "제1호 안건"})
+    agenda_id = rows(server, "SELECT agenda_id FROM vote_agendas")[0]
+    for title in ("표결 A", "표결 B"):
+        admin_client.post("/admin/create_vote", data={"agenda_id": agenda_id, "title": title, "options": "찬성,반대"})
+    vote_a, vote_b = rows(server, "SELECT vote_id FROM vote_items ORDER BY title")
+    admin_client.post("/admin/generate_tokens", data={"count": "3"}).get_data()
+    tokens = rows(server, "SELECT token FROM tokens ORDER BY serial_number")
+
+    admin_client.get(f"/admin/start_vote/{vote_a}")
+    admin_client.get(f"/admin/start_vote/{vote_a}")  # 이미 진행 중이면 변화 없음
+    admin_client.get(f"/admin/start_vote/{vote_b}")
+    admin_client.post("/submit_vote", data={"token": tokens[0], "choice_" + vote_a: "1", "choice_" + vote_b: "2"})
+    admin_client.post("/submit_vote", data={"token": tokens[1], "choice_" + vote_b: "1"})
+    admin_client.post("/submit_vote", data={"token": tokens[1], "choice_" + vote_a: "1"})
+
+    totals, agendas = counters(server)
+    assert totals == {
+        "used_tokens": 2, "total_tokens": 3, "total_agendas": 1, "total_items": 2, "active_items": 2,
+    }
+    assert agendas == {agenda_id: (2, 2)}
+    assert (totals, agendas) == recomputed(server)
+
+    # tokens[1] 은 A 에도 투표했으므로 B 삭제 후에도 사용 토큰으로 남음
+    admin_client.get(f"/admin/end_vote/{vote_b}")
+    admin_client.get(f"/admin/cleanup_vote/{vote_b}")
+    totals, agendas = counters(server)
+    assert totals["total_items"] == 1
+    assert totals["active_items"] == 1
+    assert totals["used_tokens"] == 2
+    assert (totals, agendas) == recomputed(server)
+
+    admin_client.post("/admin/delete_tokens")
+    admin_client.get(f"/admin/delete_agenda/{agenda_id}")
+    totals, agendas = counters(server)
+    assert totals == dict.fromkeys(totals, 0)
+    assert agendas == {}
+    assert (totals, agendas) == recomputed(server)
+
+
+def test_bulk_ballots_count_used_tokens_once(server, admin_client):
+    admin_client.post("/admin/create_agenda", data={"agenda_title": "제1호 안건"})
+    agenda_id = rows(server, "SELECT agenda_id FROM vote_agendas")[0]
+    for title in ("표결 A", "표결 B"):
+        admin_client.post("/admin/create_vote", data={"agenda_id": agenda_id, "title": title, "options": "찬성,반대"})
+    vote_ids = rows(server, "SELECT vote_id FROM vote_items")
+    for vote_id in vote_ids:
+        admin_client.get(f"/admin/start_vote/{vote_id}")
+    admin_client.post("/admin/generate_tokens", data={"count": "2"}).get_data()
+    tokens = rows(server, "SELECT token FROM tokens")
+
+    admin_client.post("/admin/ballots", json=[
+        {"token": token, "vote_id": vote_id, "option_id": 1}
+        for token in tokens for vote_id in vote_ids
+    ])
+    assert counters(server)[0]["used_tokens"] == 2
+    assert counters(server) == recomputed(server)
+
+
+def test_dashboard_reads_counters(server, admin_client):
+    admin_client.post("/admin/create_agenda", data={"agenda_title": "제1호 안건"})
+    admin_client.post("/admin/generate_tokens", data={"count": "4"}).get_data()
+    body = admin_client.get("/admin").get_data(as_text=True)
+    assert "총 안건 수: 1" in body
+    assert "활성 토큰 수: 4" in body
+    assert "표결 0개 · 진행 중 0개" in body
+
+
+def test_recompute_command_repairs_drift(server):
+    conn = server.db()
+    try:
+        conn.execute("UPDATE dashboard_counters SET value = 99 WHERE name = 'total_tokens'")
+        conn.commit()
+    finally:
+        conn.close()
+    runner = sys.modules["app"].app.test_cli_runner()
+    result = runner.invoke(args=["recompute-counters"])
+    assert result.exit_code == 0, result.output
+    assert counters(server)[0]["total_tokens"] == 0
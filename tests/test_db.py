@@ -0,0 +1,72 @@
+import os
+import sys
+import pytest
+
+
+def test_connection_uses_wal(server):
+    conn = server.db()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    finally:
+        conn.close()
+
+
+def test_connections_return_to_pool(server):
+    conn = server.db()
+    assert server.pool_stats(server.engine)["checked_out"] == 1
+    conn.close()
+    stats = server.pool_stats(server.engine)
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] >= 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork 미지원")
+def test_forked_worker_does_not_inherit_pooled_connections(server):
+    # gunicorn --preload: 마스터가 앱을 만들며 연 커넥션이 풀에 남아 있음
+    server.db().close()
+    assert server.pool_stats(server.engine)["checked_in"] >= 1
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            checked_in = server.pool_stats(server.engine)["checked_in"]
+            conn = server.db()
+            conn.execute("SELECT 1").fetchone()
+            conn.close()
+            os.write(write_fd, str(checked_in).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as f:
+        assert f.read() == "0"
+    # 부모의 커넥션은 그대로 사용 가능
+    conn = server.db()
+    try:
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_orm_session_shares_pool(server):
+    server.set_meeting_title("정기총회")
+    conn = server.db()
+    try:
+        assert server.get_meeting_title(conn) == "정기총회"
+    finally:
+        conn.close()
+    assert server.get_meeting_title() == "정기총회"
+    assert server.pool_stats(server.engine)["checked_out"] == 0
+
+
+def test_db_stats_requires_login(server):
+    app = sys.modules["app"].app
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        rv = client.get("/admin/db_stats")
+        assert rv.status_code == 302
+        client.post("/login", data={"password": "admin"})
+        rv = client.get("/admin/db_stats")
+        assert rv.status_code == 200
+        assert "checked_out" in rv.get_json()
@@ -0,0 +1,97 @@
+import os
+import csv
+import io
+import json
+from zipfile import ZipFile
+
+from app.exports import stream_files_zip, stream_results
+
+
+def seed_ballots(server, admin_client, voters=5):
+    conn = server.db()
+    try:
+        conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', '제1호 안건')")
+        conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a2', '제2호 안건')")
+        conn.execute(
+            "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+            "VALUES ('v1', 'a1', '예산안', '찬성,반대,기권', 1)"
+        )
+        conn.execute(
+            "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+            "VALUES ('v2', 'a2', '결산안', '찬성,반대', 1)"
+        )
+        conn.executemany(
+            "INSERT INTO tokens (token, serial_number) VALUES (?, ?)",
+            [(f"tok-{i}", i) for i in range(voters)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    admin_client.post("/admin/ballots", json=[
+        {"token": f"tok-{i}", "vote_id": "v1", "option_id": 1 if i < 4 else 2}
+        for i in range(voters)
+    ])
+
+
+def test_tally_csv(server, admin_client):
+    seed_ballots(server, admin_client)
+    rv = admin_client.get("/admin/export_results?kind=tallies&format=csv")
+    assert rv.status_code == 200
+    assert rv.is_streamed
+    assert rv.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(rv.get_data().decode("utf-8-sig"))))
+    v1 = {r["option"]: r for r in rows if r["vote_id"] == "v1"}
+    assert v1["찬성"]["count"] == "4"
+    assert v1["찬성"]["percent"] == "80.0"
+    assert v1["기권"]["count"] == "0"
+    assert {r["vote_id"] for r in rows} == {"v1", "v2"}
+
+
+def test_agenda_filter_and_ndjson(server, admin_client):
+    seed_ballots(server, admin_client)
+    rv = admin_client.get("/admin/export_results?kind=tallies&format=ndjson&agenda_id=a2")
+    rows = [json.loads(line) for line in rv.get_data(as_text=True).splitlines()]
+    assert [(r["vote_id"], r["option"], r["count"]) for r in rows] == [("v2", "찬성", 0), ("v2", "반대", 0)]
+
+
+def test_ballot_rows_are_anonymous(server, admin_client):
+    seed_ballots(server, admin_client)
+    rv = admin_client.get("/admin/export_results?kind=ballots&format=ndjson")
+    rows = [json.loads(line) for line in rv.get_data(as_text=True).splitlines()]
+    assert len(rows) == 5
+    assert [r["seq"] for r in rows] == [1, 2, 3, 4, 5]
+    assert all("token" not in r for r in rows)
+    assert "tok-" not in rv.get_data(as_text=True)
+
+
+def test_results_are_streamed_in_chunks(server, admin_client):
+    seed_ballots(server, admin_client, voters=25)
+    chunks = list(stream_results(server.db, "ballots", "csv", fetch_size=10))
+    assert len(chunks) >= 3
+    body = b"".join(chunks).decode("utf-8-sig")
+    assert len(body.splitlines()) == 26
+
+
+def test_bad_export_format(admin_client):
+    rv = admin_client.get("/admin/export_results?kind=tallies&format=xlsx")
+    assert rv.status_code == 302
+
+
+def test_export_logs_streams_zip(server, admin_client, tmp_path):
+    seed_ballots(server, admin_client)
+    rv = admin_client.get("/admin/export_logs")
+    assert rv.status_code == 200
+    assert rv.is_streamed
+    with ZipFile(io.BytesIO(rv.get_data())) as zipf:
+        names = zipf.namelist()
+        assert names and all(n.startswith("votes_") for n in names)
+
+
+def test_stream_files_zip_chunks_large_file(tmp_path):
+    path = tmp_path / "votes_big.csv"
+    payload = os.urandom(300 * 1024)
+    path.write_bytes(payload)
+    chunks = list(stream_files_zip([path], chunk_size=64 * 1024))
+    assert len(chunks) > 3
+    with ZipFile(io.BytesIO(b"".join(chunks))) as zipf:
+        assert zipf.read("votes_big.csv") == payload
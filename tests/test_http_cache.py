@@ -0,0 +1,78 @@
+import os
+import gzip
+import re
+
+from app.http_cache import IMMUTABLE
+
+STYLE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "static", "style.css")
+
+
+def style_url(client):
+    html = client.get("/vote?token=tok-1").get_data(as_text=True)
+    return re.search(r'href="(/static/style\.css\?v=\w+)"', html).group(1)
+
+
+def test_fingerprinted_static_is_immutable_and_precompressed(server, client, seed):
+    seed()
+    url = style_url(client)
+    with open(STYLE_PATH, "rb") as f:
+        original = f.read()
+
+    rv = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert rv.headers["Cache-Control"] == IMMUTABLE
+    assert rv.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in rv.headers["Vary"]
+    assert gzip.decompress(rv.get_data()) == original
+
+    # 압축한 표현의 ETag 로 재검증하면 본문 없이 304
+    again = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": rv.headers["ETag"]})
+    assert again.status_code == 304 and again.get_data() == b""
+
+    # 지문이 없거나 틀리면 짧게만 캐시, 압축을 받지 않는 클라이언트는 원본
+    rv = client.get("/static/style.css?v=old")
+    assert rv.headers["Cache-Control"] == "public, max-age=3600"
+    assert "Content-Encoding" not in rv.headers and rv.get_data() == original
+
+
+def test_vote_page_revalidates_with_ballot_etag(server, client, seed):
+    seed()
+    rv = client.get("/vote?token=tok-1")
+    etag = rv.headers["ETag"]
+    assert etag.startswith('W/"') and rv.headers["Cache-Control"] == "private, no-cache"
+
+    rv = client.get("/vote?token=tok-1", headers={"If-None-Match": etag})
+    assert rv.status_code == 304 and rv.get_data() == b""
+
+    # 투표하면 (토큰 상태가 바뀌므로) 다시 렌더링
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "1"},
+                headers={"Accept": "application/json"})
+    rv = client.get("/vote?token=tok-1", headers={"If-None-Match": etag})
+    assert rv.status_code == 200
+    etag = rv.headers["ETag"]
+
+    # 관리자가 투표지를 바꾸면 (세대 증가) 다시 렌더링
+    client.post("/login", data={"password": "admin"})
+    client.post("/admin/set_meeting_title", json={"meeting_title": "정기총회"})
+    rv = client.get("/vote?token=tok-1", headers={"If-None-Match": etag})
+    assert rv.status_code == 200 and "정기총회" in rv.get_data(as_text=True)
+
+
+def test_flash_page_is_not_cached(server, client, seed):
+    seed()
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "1"})
+    rv = client.get("/vote?token=tok-1")
+    assert "성공적으로 제출" in rv.get_data(as_text=True)
+    assert "ETag" not in rv.headers
+
+
+def test_html_and_json_are_compressed_above_threshold(server, client, seed):
+    seed()
+    rv = client.get("/vote?token=tok-1", headers={"Accept-Encoding": "gzip"})
+    assert rv.headers["Content-Encoding"] == "gzip"
+    assert "찬반" in gzip.decompress(rv.get_data()).decode()
+
+    # 작은 응답은 압축하지 않음
+    rv = client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "1"},
+                     headers={"Accept": "application/json", "Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in rv.headers
+    assert rv.get_json()["results"] == {"v1": "ok"}
@@ -0,0 +1,113 @@
+import pytest
+
+from app.write_queue import insert_ballots
+
+
+@pytest.fixture
+def server_env():
+    return {"LIVE_MAX_UPDATES_PER_SEC": "20", "LIVE_LONG_POLL_SEC": "0.3"}
+
+
+class CountingConnection:
+    def __init__(self, conn, counter):
+        self._conn = conn
+        self._counter = counter
+
+    def execute(self, *args):
+        self._counter["queries"] += 1
+        return self._conn.execute(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+OPTION_IDS = {"찬성": 1, "반대": 2}
+
+
+def cast(server, token, choice):
+    conn = server.db()
+    try:
+        ballot = [("v1", token, OPTION_IDS[choice])]
+        insert_ballots(conn, ballot)
+        server.tallies.record(conn, ballot)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def counting_broadcaster(server):
+    counter = {"connections": 0, "queries": 0}
+
+    def connect():
+        counter["connections"] += 1
+        return CountingConnection(server.db(), counter)
+
+    return server.TallyBroadcaster(connect, server.TallyEngine()), counter
+
+
+def test_subscribers_do_not_multiply_db_reads(server, seed):
+    seed(tokens=5)
+    live, counter = counting_broadcaster(server)
+    few = [live.subscribe("v1", start=False) for _ in range(2)]
+    cast(server, "tok-0", "찬성")
+    live.poll_once()
+    reads_for_few = dict(counter)
+
+    live2, counter2 = counting_broadcaster(server)
+    many = [live2.subscribe("v1", start=False) for _ in range(500)]
+    live2.poll_once()
+    assert counter2 == reads_for_few
+    for sub in few + many:
+        assert sub.get(0)["total"] == 1
+
+
+def test_unchanged_total_skips_snapshot(server, seed):
+    seed(tokens=5)
+    live, counter = counting_broadcaster(server)
+    live.subscribe("v1", start=False)
+    live.poll_once()
+    before = counter["queries"]
+    live.poll_once()
+    assert counter["queries"] - before == 1
+
+
+def test_updates_are_coalesced(server, seed):
+    seed(tokens=5)
+    live, _ = counting_broadcaster(server)
+    sub = live.subscribe("v1", start=False)
+    live.poll_once()
+    assert sub.get(0)["total"] == 0
+    for i, choice in enumerate(["찬성", "반대", "찬성"]):
+        cast(server, f"tok-{i}", choice)
+    live.poll_once()
+    payload = sub.get(0)
+    assert payload["total"] == 3
+    assert payload["delta"] == {"찬성": 2, "반대": 1}
+    assert sub.get(0) is None
+
+
+def test_sse_stream(server, client, seed):
+    seed(tokens=5)
+    cast(server, "tok-0", "찬성")
+    # 집계 스트림은 관리자만
+    assert client.get("/admin/status/stream?vote_id=v1").status_code == 302
+    client.post("/login", data={"password": "admin"})
+    rv = client.get("/admin/status/stream?vote_id=v1", buffered=False)
+    assert rv.mimetype == "text/event-stream"
+    chunks = iter(rv.response)
+    assert next(chunks).startswith(b"retry:")
+    event = next(chunks).decode()
+    assert event.startswith("event: tally")
+    assert '"total": 1' in event
+    rv.close()
+
+
+def test_long_poll(server, client, seed):
+    seed(tokens=5)
+    cast(server, "tok-0", "찬성")
+    client.post("/login", data={"password": "admin"})
+    rv = client.get("/admin/results/v1?since=0")
+    assert rv.status_code == 200
+    assert rv.get_json()["total"] == 1
+    rv = client.get("/admin/results/v1?since=1")
+    assert rv.status_code == 204
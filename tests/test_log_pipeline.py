@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import pytest
+
+from app.log_pipeline import (
+    OVERFLOW_DROP_NEW,
+    OVERFLOW_DROP_OLDEST,
+    QueuedLogHandler,
+    configure_logging,
+    set_request_id,
+)
+
+
+def make_record(msg, *args):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def read_json_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = configure_logging(tmp_path / "runtime.log", max_bytes=2000, backup_count=2)
+    yield handler
+    logging.getLogger().removeHandler(handler)
+    handler.stop()
+
+
+def test_records_are_json_with_request_id(tmp_path, handler):
+    set_request_id("req-1")
+    try:
+        logging.info("토큰 %d개 생성", 3)
+    finally:
+        set_request_id(None)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.exception("실패")
+    handler.stop()
+
+    first, second = read_json_lines(tmp_path / "runtime.log")
+    assert first["message"] == "토큰 3개 생성"
+    assert first["request_id"] == "req-1"
+    assert first["level"] == "INFO"
+    assert second["request_id"] is None
+    assert "RuntimeError: boom" in second["exc"]
+
+
+def test_log_file_rotates_by_size(tmp_path, handler):
+    for i in range(30):
+        logging.info("회전 테스트 %d", i)
+    handler.stop()
+    assert (tmp_path / "runtime.log.1").exists()
+    assert not (tmp_path / "runtime.log.3").exists()
+
+
+@pytest.mark.parametrize("overflow, kept", [
+    (OVERFLOW_DROP_NEW, ["a", "b"]),
+    (OVERFLOW_DROP_OLDEST, ["b", "c"]),
+])
+def test_overflow_policy(overflow, kept):
+    handler = QueuedLogHandler([], max_queue=2, overflow=overflow)
+    for msg in ("a", "b", "c"):
+        handler.enqueue(handler.prepare(make_record(msg)))
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == kept
+    assert handler.dropped == 1
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        QueuedLogHandler([], overflow="spill")
+
+
+def test_request_id_header(server):
+    app = sys.modules["app"].app
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        assert len(client.get("/login").headers["X-Request-ID"]) == 32
+        resp = client.get("/login", headers={"X-Request-ID": "proxy-42"})
+        assert resp.headers["X-Request-ID"] == "proxy-42"
+
+
+def test_writes_do_not_block_gevent_hub(tmp_path):
+    # gunicorn -k gevent 처럼 monkey patch 한 프로세스에서, 느린 파일 쓰기 동안에도
+    # 다른 greenlet 이 계속 실행되어야 함
+    pytest.importorskip("gevent")
+    code = (
+        "from gevent import monkey; monkey.patch_all()\n"
+        "import gevent, logging, sys, time\n"
+        "from app.log_pipeline import configure_logging\n"
+        "real_sleep = monkey.get_original('time', 'sleep')\n"
+        "handler = configure_logging(sys.argv[1])\n"
+        "file_handler = handler.handlers[0]\n"
+        "emit = file_handler.emit\n"
+        "def slow_emit(record):\n"
+        "    real_sleep(0.5)\n"
+        "    emit(record)\n"
+        "file_handler.emit = slow_emit\n"
+        "logging.info('느린 쓰기')\n"
+        "start = time.perf_counter()\n"
+        "for _ in range(5):\n"
+        "    gevent.sleep(0.02)\n"
+        "elapsed = time.perf_counter() - start\n"
+        "handler.stop()\n"
+        "print('elapsed', elapsed)\n"
+    )
+    log_file = tmp_path / "runtime.log"
+    result = subprocess.run(
+        [sys.executable, "-c", code, str(log_file)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    elapsed = float([l for l in result.stdout.splitlines() if l.startswith("elapsed ")][-1].split()[1])
+    assert elapsed < 0.4
+    assert [r["message"] for r in read_json_lines(log_file)] == ["느린 쓰기"]
@@ -0,0 +1,120 @@
+import pytest
+
+from app.meetings import MeetingRegistry, token_meeting_id
+
+
+def create_meeting(admin_client, title="임시총회"):
+    rv = admin_client.post("/admin/meetings", data={"meeting_title": title})
+    assert rv.status_code == 302
+    meeting_id = rv.headers["Location"].split("/m/", 1)[1].split("/", 1)[0]
+    return meeting_id
+
+
+def count_votes(meeting):
+    conn = meeting.db()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_token_meeting_id():
+    assert token_meeting_id("ab12cd34.7f0c") == "ab12cd34"
+    assert token_meeting_id("7f0c-uuid") is None
+    assert token_meeting_id("../x.7f0c") is None
+    assert token_meeting_id(None) is None
+
+
+def test_meeting_has_own_shard_and_urls(server, admin_client, tmp_path):
+    meeting_id = create_meeting(admin_client)
+    assert (tmp_path / "meetings" / f"{meeting_id}.db").is_file()
+
+    page = admin_client.get(f"/m/{meeting_id}/admin").get_data(as_text=True)
+    assert "임시총회" in page
+    assert f"/m/{meeting_id}/admin/create_agenda" in page
+    # 기본 회의 대시보드의 회의 목록에도 나타남
+    assert f"/m/{meeting_id}/admin" in admin_client.get("/admin").get_data(as_text=True)
+    assert server.get_meeting_title() == "회의명 미설정"
+
+
+def test_vote_is_routed_by_token_prefix(server, admin_client, seed):
+    meeting_id = create_meeting(admin_client)
+    meeting = server.meetings.get(meeting_id)
+    token = meeting.new_token()
+    assert token.startswith(f"{meeting_id}.")
+    seed(tokens=[token], db=meeting.db)
+
+    # QR 은 /vote?token=... 이므로 URL 에 회의 ID 가 없어도 토큰으로 찾아감
+    assert "찬반" in admin_client.get(f"/vote?token={token}").get_data(as_text=True)
+    rv = admin_client.post("/submit_vote", data={"token": token, "choice_v1": "1"})
+    assert rv.status_code == 302
+    assert count_votes(meeting) == 1
+    assert count_votes(server.default_meeting) == 0
+    assert rv.headers["Location"] == f"/vote?token={token}"
+
+
+def test_unknown_meeting_is_404(admin_client):
+    assert admin_client.get("/m/nope/admin").status_code == 404
+    assert admin_client.get("/vote?token=nope.abc").status_code == 404
+
+
+def test_archive_moves_shard(server, admin_client, tmp_path):
+    meeting_id = create_meeting(admin_client)
+    rv = admin_client.post(f"/admin/meetings/{meeting_id}/archive")
+    assert rv.status_code == 302
+    assert not (tmp_path / "meetings" / f"{meeting_id}.db").exists()
+    assert (tmp_path / "meetings" / "archive" / f"{meeting_id}.db").is_file()
+    assert admin_client.get(f"/m/{meeting_id}/admin").status_code == 404
+
+
+def test_least_recently_used_shard_is_closed(server, tmp_path):
+    registry = MeetingRegistry(
+        tmp_path / "shards", server.open_meeting, server.default_meeting, max_open=1
+    )
+    first = registry.create("first")
+    registry.create("second")
+    assert registry.evictions == 1
+    assert [m.meeting_id for m in registry.opened()] == ["default", "second"]
+    # 닫힌 회의는 다음 요청 때 다시 열림
+    reopened = registry.get("first")
+    assert reopened is not first
+    assert registry.ids() == ["first", "second"]
+
+
+def test_shard_archived_by_another_worker_is_dropped(server, admin_client, tmp_path):
+    meeting_id = create_meeting(admin_client)
+    # 같은 샤드 폴더를 쓰는 다른 워커
+    other = MeetingRegistry(
+        tmp_path / "meetings", server.open_meeting, server.default_meeting
+    )
+    held = other.checkout(meeting_id)
+
+    rv = admin_client.post(f"/admin/meetings/{meeting_id}/archive")
+    assert rv.status_code == 302
+    shard = tmp_path / "meetings" / f"{meeting_id}.db"
+    assert not shard.exists()
+
+    # 캐시된 회의도 파일을 다시 확인하고, 처리 중인 요청이 끝나면 닫음
+    with pytest.raises(KeyError):
+        other.get(meeting_id)
+    assert not held.closed
+    other.release(held)
+    assert held.closed
+    assert not shard.exists()
+    assert other.opened() == [server.default_meeting]
+
+
+def test_meeting_in_use_is_not_evicted_or_archived(server, tmp_path):
+    registry = MeetingRegistry(
+        tmp_path / "shards", server.open_meeting, server.default_meeting, max_open=1
+    )
+    first = registry.checkout(registry.create("first").meeting_id)
+    registry.create("second")
+    assert registry.evictions == 0 and not first.closed
+    with pytest.raises(RuntimeError):
+        registry.archive("first")
+
+    registry.release(first)
+    registry.create("third")
+    assert first.closed
+    assert [m.meeting_id for m in registry.opened()] == ["default", "third"]
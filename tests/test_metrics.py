@@ -0,0 +1,89 @@
+import pstats
+
+from app.metrics import Histogram, Metrics, SlowRequestProfiler
+
+
+def sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} 없음")
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("latency_seconds", "지연", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value, '/a"b')
+    lines = list(hist.render())
+    assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a\\"b"} 4' in lines
+    assert 'latency_seconds_sum{route="/a\\"b"} 4.05' in lines
+
+
+def test_metrics_requires_login(client):
+    resp = client.get("/admin/metrics")
+    assert resp.status_code == 302
+
+
+def test_metrics_counts_requests_and_queries(server, client):
+    client.post("/login", data={"password": "admin"})
+    client.get("/vote?token=missing")
+    client.get("/vote?token=missing")
+
+    resp = client.get("/admin/metrics")
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain; version=0.0.4")
+    text = resp.get_data(as_text=True)
+
+    assert sample(text, 'vote_http_request_duration_seconds_count{route="/vote",method="GET"}') == 2
+    assert sample(text, 'vote_http_requests_total{route="/login",method="POST",status="302"}') == 1
+    # 토큰 검증은 db() 커넥션으로 쿼리하므로 요청당 쿼리 수가 잡힘
+    assert sample(text, 'vote_db_queries_per_request_sum{route="/vote"}') > 0
+    assert sample(text, 'vote_db_query_duration_seconds_count{source="raw"}') > 0
+    assert sample(text, 'vote_db_pool{meeting="default",state="checked_out"}') == 0
+    assert "vote_token_cache_events_total" in text
+    assert "vote_ballot_cache_events_total" in text
+
+
+def test_metrics_counts_orm_queries(server, client):
+    client.post("/login", data={"password": "admin"})
+    client.post("/admin/set_meeting_title", data={"meeting_title": "정기총회"})
+    text = client.get("/admin/metrics").get_data(as_text=True)
+    assert sample(text, 'vote_db_query_duration_seconds_count{source="orm"}') > 0
+
+
+def test_query_outside_request_is_not_attributed():
+    metrics = Metrics()
+    metrics.observe_query("raw", 0.001)
+    stats = metrics.begin_request()
+    metrics.observe_query("raw", 0.002)
+    metrics.end_request(stats, "/x", "GET", 200, 0.01)
+    assert stats.queries == 1
+    assert metrics.query_seconds.count("raw") == 2
+    assert metrics.request_queries.count("/x") == 1
+
+
+def test_slow_request_profiler_dumps_only_slow_requests(tmp_path):
+    profiler = SlowRequestProfiler(tmp_path / "profiles", threshold_ms=50)
+
+    profile = profiler.start()
+    assert profile is not None
+    # 한 번에 하나만 프로파일링
+    assert profiler.start() is None
+    assert profiler.finish(profile, "/vote", 0.01) is None
+
+    profile = profiler.start()
+    sum(range(1000))
+    path = profiler.finish(profile, "/admin/results/<vote_id>", 0.2)
+    assert path.parent == tmp_path / "profiles"
+    assert "admin_results_vote_id_200ms" in path.name
+    pstats.Stats(str(path))
+    assert profiler.dumps == 1
+
+
+def test_slow_request_profiler_disabled_by_default(tmp_path):
+    profiler = SlowRequestProfiler(tmp_path, threshold_ms=0)
+    assert profiler.start() is None
+    assert profiler.finish(None, "/vote", 10.0) is None
@@ -0,0 +1,111 @@
+import sqlite3
+import pytest
+
+from app.keys import ITEM_ID, TOKEN_ID
+from app.migrations import MIGRATIONS, migrate, schema_version
+
+# 요청 경로의 핫 쿼리와 사용해야 하는 인덱스
+HOT_QUERIES = {
+    "vote_active_items": (
+        """
+        SELECT va.agenda_id, va.title as agenda_title,
+               vi.vote_id, vi.title as subtitle, vi.options
+        FROM vote_items vi
+        JOIN vote_agendas va ON vi.agenda_id = va.agenda_id
+        WHERE vi.is_active = TRUE
+        ORDER BY va.created_at ASC, vi.created_at ASC
+        """,
+        (),
+        "ix_vote_items_is_active",
+    ),
+    "token_lookup": ("SELECT * FROM tokens WHERE token = ?", ("t",), "sqlite_autoindex_tokens_1"),
+    "token_prior_votes": (
+        "SELECT vote_items.vote_id FROM votes "
+        "JOIN vote_items ON vote_items.id = votes.item_id WHERE votes.token_id = ?",
+        (1,),
+        "sqlite_autoindex_votes_1",
+    ),
+    "max_serial": ("SELECT COALESCE(MAX(serial_number), 0) FROM tokens", (), "ix_tokens_serial_number"),
+    "delete_agenda_items": (
+        "SELECT vote_id FROM vote_items WHERE agenda_id = ?", ("a",),
+        "ix_vote_items_agenda_id_created_at",
+    ),
+    "delete_votes_by_item": (f"DELETE FROM votes WHERE item_id = {ITEM_ID}", ("v",), "ix_votes_item_id_option_id"),
+    "dashboard_items": (
+        "SELECT * FROM vote_items ORDER BY agenda_id ASC, created_at ASC", (),
+        "ix_vote_items_agenda_id_created_at",
+    ),
+    "vote_status_item": ("SELECT * FROM vote_items WHERE vote_id = ?", ("v",), "sqlite_autoindex_vote_items_1"),
+    "tally_total": (
+        "SELECT total FROM vote_tally_totals WHERE vote_id = ?", ("v",),
+        "sqlite_autoindex_vote_tally_totals_1",
+    ),
+    "tally_counts": (
+        "SELECT option_id, count FROM vote_tallies WHERE vote_id = ?", ("v",),
+        "sqlite_autoindex_vote_tallies_1",
+    ),
+    "token_vote_count": (f"SELECT COUNT(*) FROM votes WHERE token_id = {TOKEN_ID}", ("t",), "sqlite_autoindex_votes_1"),
+    "dashboard_counters": ("SELECT value FROM dashboard_counters WHERE name = ?", ("n",),
+                           "sqlite_autoindex_dashboard_counters_1"),
+}
+
+def query_plan(conn, sql, params):
+    return " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_queries_use_index(server, name):
+    sql, params, index = HOT_QUERIES[name]
+    conn = server.db()
+    try:
+        plan = query_plan(conn, sql, params)
+    finally:
+        conn.close()
+    assert f"INDEX {index}" in plan, plan
+
+
+def test_startup_records_schema_version(server):
+    conn = server.db()
+    try:
+        assert schema_version(conn) == MIGRATIONS[-1][0]
+        assert migrate(conn) == []
+    finally:
+        conn.close()
+
+
+def test_upgrades_existing_database_in_place(tmp_path):
+    # 마이그레이션 도입 이전 data.db 형태 (인덱스·schema_version 없음)
+    conn = sqlite3.connect(tmp_path / "old.db")
+    conn.executescript(
+        """
+        CREATE TABLE settings (key VARCHAR PRIMARY KEY, value VARCHAR);
+        CREATE TABLE tokens (token VARCHAR PRIMARY KEY, serial_number INTEGER, created_at DATETIME);
+        CREATE TABLE vote_agendas (agenda_id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, created_at DATETIME);
+        CREATE TABLE vote_items (vote_id VARCHAR PRIMARY KEY, agenda_id VARCHAR NOT NULL,
+            title VARCHAR NOT NULL, options VARCHAR NOT NULL, is_active BOOLEAN, created_at DATETIME);
+        CREATE TABLE votes (id INTEGER PRIMARY KEY AUTOINCREMENT, vote_id VARCHAR, token VARCHAR,
+            choice VARCHAR, timestamp DATETIME, voter_name VARCHAR, UNIQUE (token, vote_id));
+        INSERT INTO vote_items (vote_id, agenda_id, title, options) VALUES ('v1', 'a1', '찬반', ' 찬성 ,반대,,반대');
+        INSERT INTO votes (vote_id, token, choice) VALUES ('v1', 't1', '찬성');
+        INSERT INTO votes (vote_id, token, choice) VALUES ('v1', 't2', '반대');
+        INSERT INTO votes (vote_id, token, choice) VALUES ('v1', 't3', '무효');
+        INSERT INTO tokens (token, serial_number) VALUES ('t1', 1), ('t7', 7);
+        """
+    )
+    assert migrate(conn) == [m[0] for m in MIGRATIONS]
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"ix_votes_item_id_option_id", "ix_tokens_serial_number"} <= indexes
+    # 선택지는 정규화되고, 선택지에 없던 기존 투표는 선택지 끝에 보존
+    assert conn.execute("SELECT options FROM vote_items").fetchone()[0] == "찬성,반대,무효"
+    # 투표는 정수 키로 옮기며, 이미 지운 토큰(t2, t3)의 투표도 보존
+    assert conn.execute(
+        "SELECT tokens.token, votes.token_id, votes.option_id FROM votes "
+        "LEFT JOIN tokens ON tokens.id = votes.token_id ORDER BY votes.id"
+    ).fetchall() == [("t1", 1, 1), (None, 3, 2), (None, 4, 3)]
+    assert conn.execute("SELECT token FROM tokens ORDER BY id").fetchall() == [("t1",), ("t7",)]
+    # 토큰 일련번호 시퀀스는 기존 최댓값에서 이어 감
+    assert conn.execute("SELECT value FROM sequences WHERE name = 'token_serial'").fetchone()[0] == 7
+    # 감사 로그 테이블 (기존 CSV 세그먼트는 LOG_DIR 에 그대로 둠)
+    assert conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0] == 0
+    assert migrate(conn) == []
+    conn.close()
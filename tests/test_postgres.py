@@ -0,0 +1,291 @@
+import os
+import importlib
+import sqlite3
+import threading
+import types
+import pytest
+
+from app.db import is_database_url, postgres_url
+from app.postgres import PgConnection, Row, translate_sql
+from app.write_queue import DuplicateVote, insert_ballots
+
+# 실제 PostgreSQL 로 돌릴 때: TEST_DATABASE_URL=postgresql://... (테이블을 지우고 다시 만듦)
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+# psycopg 처럼 DB-API 이름을 따르는 드라이버 예외
+class DriverError(Exception):
+    pass
+
+
+class IntegrityError(DriverError):
+    pass
+
+
+class UniqueViolation(IntegrityError):
+    pass
+
+
+class StandInCursor:
+    """psycopg 커서 대신: %s 파라미터를 받아 autocommit SQLite 에서 실행합니다."""
+
+    def __init__(self, driver):
+        self._driver = driver
+        self._cursor = driver.sqlite.cursor()
+
+    def _sql(self, sql):
+        self._driver.statements.append(sql)
+        # SQLite 는 쓰기를 이미 하나씩 실행하므로 쓰기 잠금은 같은 인자를 돌려주는 함수로 대신함
+        return (sql.replace(" ISOLATION LEVEL REPEATABLE READ", "").replace("pg_advisory_xact_lock", "abs")
+                .replace("%s", "?").replace("%%", "%"))
+
+    def execute(self, sql, params):
+        try:
+            self._cursor.execute(self._sql(sql), params)
+        except sqlite3.IntegrityError as e:
+            raise UniqueViolation(str(e)) from e
+
+    def executemany(self, sql, params):
+        try:
+            self._cursor.executemany(self._sql(sql), params)
+        except sqlite3.IntegrityError as e:
+            raise UniqueViolation(str(e)) from e
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class StandInDriver:
+    def __init__(self, path):
+        self.sqlite = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.autocommit = False
+        self.statements = []
+
+    def cursor(self):
+        return StandInCursor(self)
+
+
+class Pooled:
+    def __init__(self, driver):
+        self.driver_connection = driver
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+STAND_IN_DBAPI = types.SimpleNamespace(Error=DriverError)
+
+
+@pytest.fixture
+def pg(tmp_path):
+    driver = StandInDriver(tmp_path / "standin.db")
+    driver.sqlite.executescript(
+        """
+        CREATE TABLE tokens (id INTEGER PRIMARY KEY, token VARCHAR UNIQUE);
+        CREATE TABLE vote_items (id INTEGER PRIMARY KEY, vote_id VARCHAR UNIQUE);
+        CREATE TABLE votes (id INTEGER PRIMARY KEY, item_id INTEGER NOT NULL,
+            token_id INTEGER NOT NULL, option_id INTEGER NOT NULL, UNIQUE (token_id, item_id));
+        INSERT INTO tokens (token) VALUES ('t1');
+        INSERT INTO vote_items (vote_id) VALUES ('v1'), ('v2'), ('v3');
+        """
+    )
+    return PgConnection(Pooled(driver), STAND_IN_DBAPI)
+
+
+def count_votes(pg):
+    return pg.execute("SELECT COUNT(*) AS n FROM votes").fetchone()["n"]
+
+
+def test_translate_sql():
+    assert translate_sql("SELECT * FROM t WHERE a = ? AND b = ?") == (
+        "SELECT * FROM t WHERE a = %s AND b = %s"
+    )
+    # 문자열 리터럴 안의 ? 는 파라미터가 아니며, % 는 드라이버용으로 이스케이프
+    assert translate_sql("SELECT '50%?' || ? WHERE x LIKE 'a%'") == (
+        "SELECT '50%%?' || %s WHERE x LIKE 'a%%'"
+    )
+
+
+def test_database_url():
+    assert is_database_url("postgres://u:p@db:5432/vote")
+    assert not is_database_url("/data/data.db")
+    assert postgres_url("postgres://u:p@db/vote") == "postgresql+psycopg://u:p@db/vote"
+    assert postgres_url("postgresql+psycopg2://db/vote") == "postgresql+psycopg2://db/vote"
+
+
+def test_row_behaves_like_sqlite_row():
+    row = Row(["vote_id", "total"], ("v1", 3))
+    assert row["total"] == 3 and row[0] == "v1"
+    assert dict(zip(row.keys(), row)) == {"vote_id": "v1", "total": 3}
+    vote_id, total = row
+    assert (vote_id, total) == ("v1", 3)
+    with pytest.raises(IndexError):
+        row["missing"]
+
+
+def test_dml_opens_transaction_like_sqlite3(pg):
+    count_votes(pg)
+    assert not pg.in_transaction
+    pg.execute("INSERT INTO votes (item_id, token_id, option_id) VALUES (?, ?, ?)", (1, 1, 1))
+    assert pg.in_transaction
+    pg.rollback()
+    assert count_votes(pg) == 0
+
+    # 쓰기 트랜잭션은 시작하면서 DB 단위 쓰기 잠금을, 읽기용 BEGIN 은 스냅샷으로
+    lock = "SELECT pg_advisory_xact_lock(%s)"
+    assert pg._conn.statements[1:3] == ["BEGIN", lock]
+    pg.execute("BEGIN IMMEDIATE")
+    pg.rollback()
+    pg.execute("BEGIN")
+    pg.commit()
+    assert pg._conn.statements[-5:] == [
+        "BEGIN", lock, "ROLLBACK", "BEGIN ISOLATION LEVEL REPEATABLE READ", "COMMIT",
+    ]
+
+
+def test_duplicate_ballots_and_driver_errors(pg):
+    assert insert_ballots(pg, [("v1", "t1", 1), ("v2", "t1", 2)]) == 2
+    pg.commit()
+    # 중복은 ON CONFLICT DO NOTHING 으로 건너뛰고 건수로 확인
+    with pytest.raises(DuplicateVote):
+        insert_ballots(pg, [("v1", "t1", 2), ("v3", "t1", 1)])
+    pg.rollback()
+    assert count_votes(pg) == 2
+
+    # 그 밖의 드라이버 예외는 같은 종류의 sqlite3 예외로
+    with pytest.raises(sqlite3.IntegrityError) as excinfo:
+        pg.execute("INSERT INTO votes (item_id, token_id, option_id) VALUES (1, 1, 1)")
+    assert isinstance(excinfo.value.__cause__, UniqueViolation)
+
+
+def test_close_restores_driver_and_returns_to_pool(pg):
+    assert pg._conn.autocommit is True
+    pg.execute("INSERT INTO votes (item_id, token_id, option_id) VALUES (?, ?, ?)", (1, 1, 1))
+    pooled = pg._pooled
+    pg.close()
+    assert pooled.closed
+    assert pg._conn.autocommit is False
+    assert pg._conn.statements[-1] == "ROLLBACK"
+
+
+def test_app_sql_runs_through_adapter(server):
+    # 앱이 만든 스키마 위에서 집계·카운터 SQL 이 %s 파라미터로도 그대로 동작하는지
+    pg = PgConnection(Pooled(StandInDriver(server.DB_PATH)), STAND_IN_DBAPI)
+    try:
+        pg.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', '제1호 안건')")
+        pg.execute(
+            "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+            "VALUES ('v1', 'a1', '찬반', '찬성,반대', TRUE)"
+        )
+        pg.execute("INSERT INTO tokens (token, serial_number) VALUES ('t1', 1), ('t2', 2)")
+        ballots = [("v1", "t1", 1), ("v1", "t2", 2)]
+        insert_ballots(pg, ballots)
+        server.tallies.record(pg, ballots)
+        server.counters.record(pg, ballots)
+        server.ballot_cache.bump(pg)
+        pg.commit()
+        server.counters.recompute(pg)
+        snap = server.tallies.snapshot(pg, "v1")
+        assert snap.counts == {"찬성": 1, "반대": 1}
+        totals, agendas = server.counters.snapshot(pg)
+        assert totals["active_items"] == 1 and totals["used_tokens"] == 2
+        assert agendas == {"a1": (1, 1)}
+    finally:
+        pg.close()
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL 미설정")
+def test_votes_against_postgres(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+
+    engine = create_engine(postgres_url(TEST_DATABASE_URL))
+    server = importlib.import_module("app.server")
+    server.Base.metadata.drop_all(engine)
+    engine.dispose()
+
+    monkeypatch.setenv("DATABASE_URL", TEST_DATABASE_URL)
+    importlib.reload(server)
+    app = importlib.reload(importlib.import_module("app")).create_app()
+    app.config['TESTING'] = True
+
+    conn = server.db()
+    try:
+        conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', '제1호 안건')")
+        conn.execute(
+            "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+            "VALUES ('v1', 'a1', '찬반', '찬성,반대', TRUE)"
+        )
+        conn.execute("INSERT INTO tokens (token, serial_number) VALUES ('tok-1', 1)")
+        conn.commit()
+    finally:
+        conn.close()
+
+    with app.test_client() as client:
+        client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성"})
+        client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "반대"})
+    conn = server.db()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0] == 1
+        snap = server.tallies.snapshot(conn, "v1")
+        assert snap.counts == {"찬성": 1}
+    finally:
+        conn.close()
+    server.default_meeting.close()
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL 미설정")
+def test_concurrent_bulk_ballots_against_postgres(monkeypatch):
+    # 여러 요청이 같은 토큰으로 동시에 입력해도 요청 전체가 500 이 되지 않고
+    # 투표별 결과로 나뉘며, 사용 토큰 카운터가 두 번 세지 않아야 함
+    from sqlalchemy import create_engine
+
+    engine = create_engine(postgres_url(TEST_DATABASE_URL))
+    server = importlib.import_module("app.server")
+    server.Base.metadata.drop_all(engine)
+    engine.dispose()
+
+    monkeypatch.setenv("DATABASE_URL", TEST_DATABASE_URL)
+    importlib.reload(server)
+    app = importlib.reload(importlib.import_module("app")).create_app()
+    app.config['TESTING'] = True
+
+    conn = server.db()
+    try:
+        conn.execute("INSERT INTO vote_agendas (agenda_id, title) VALUES ('a1', '제1호 안건')")
+        for vote_id in ("v1", "v2"):
+            conn.execute(
+                "INSERT INTO vote_items (vote_id, agenda_id, title, options, is_active) "
+                "VALUES (?, 'a1', '찬반', '찬성,반대', TRUE)",
+                (vote_id,),
+            )
+        conn.execute("INSERT INTO tokens (token, serial_number) VALUES ('tok-1', 1), ('tok-2', 2)")
+        conn.commit()
+    finally:
+        conn.close()
+
+    responses = []
+
+    def post(vote_id):
+        with app.test_client() as client:
+            client.post("/login", data={"password": "admin"})
+            responses.append(client.post("/admin/ballots", json=[
+                {"token": token, "vote_id": vote_id, "choice": "찬성"} for token in ("tok-1", "tok-2")
+            ]))
+
+    threads = [threading.Thread(target=post, args=(vote_id,)) for vote_id in ("v1", "v2") * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert [rv.status_code for rv in responses] == [200] * len(threads)
+    assert sum(rv.get_json()["accepted"] for rv in responses) == 4
+    conn = server.db()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0] == 4
+        totals, _ = server.counters.snapshot(conn)
+        assert totals["used_tokens"] == 2
+    finally:
+        conn.close()
+    server.default_meeting.close()
@@ -0,0 +1,81 @@
+import io
+import sys
+from zipfile import ZipFile
+import pytest
+
+from app.qr_batch import QrRenderer, stream_qr_zip
+from app.qr_sheets import build_qr_pdf
+
+
+@pytest.fixture
+def server_env():
+    return {"QR_WORKERS": "0"}
+
+
+def test_generate_tokens_streams_zip(admin_client):
+    rv = admin_client.post("/admin/generate_tokens", data={"count": "3"})
+    assert rv.status_code == 200
+    assert rv.mimetype == "application/zip"
+    with ZipFile(io.BytesIO(rv.get_data())) as zipf:
+        assert zipf.namelist() == ["token_001.png", "token_002.png", "token_003.png"]
+        assert zipf.read("token_001.png").startswith(b"\x89PNG")
+
+    rv = admin_client.post("/admin/generate_tokens", data={"count": "2"})
+    with ZipFile(io.BytesIO(rv.get_data())) as zipf:
+        assert zipf.namelist() == ["token_004.png", "token_005.png"]
+
+    server = sys.modules["app.server"]
+    conn = server.db()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0] == 5
+    finally:
+        conn.close()
+
+
+def test_stream_yields_incrementally():
+    tokens = [(f"tok-{i}", i) for i in range(1, 4)]
+    chunks = list(stream_qr_zip(tokens, "http://localhost", QrRenderer(0)))
+    assert len(chunks) > len(tokens)
+    with ZipFile(io.BytesIO(b"".join(chunks))) as zipf:
+        assert zipf.testzip() is None
+        assert len(zipf.namelist()) == 3
+
+
+def test_process_pool_preserves_order():
+    renderer = QrRenderer(2, min_batch=1, window=2)
+    try:
+        items = [(f"http://localhost/vote?token={i}", i) for i in range(1, 6)]
+        serials = [serial for serial, _ in renderer.render(items)]
+    finally:
+        renderer.shutdown()
+    assert serials == [1, 2, 3, 4, 5]
+
+
+def test_generate_tokens_pdf(admin_client):
+    rv = admin_client.post("/admin/generate_tokens", data={"count": "25", "format": "pdf", "cols": "4", "rows": "5"})
+    assert rv.status_code == 200
+    assert rv.mimetype == "application/pdf"
+    body = rv.get_data()
+    assert body.startswith(b"%PDF")
+    assert b"/Count 2" in body
+
+
+def test_generate_tokens_sheets(admin_client):
+    rv = admin_client.post("/admin/generate_tokens", data={"count": "7", "format": "sheets", "cols": "2", "rows": "3"})
+    assert rv.mimetype == "application/zip"
+    with ZipFile(io.BytesIO(rv.get_data())) as zipf:
+        assert zipf.namelist() == ["tokens_001-006.png", "tokens_007-007.png"]
+
+
+def test_generate_tokens_rejects_bad_grid(admin_client):
+    rv = admin_client.post("/admin/generate_tokens", data={"count": "1", "format": "pdf", "cols": "0"})
+    assert rv.status_code == 302
+
+
+def test_pdf_without_tokens(admin_client):
+    with pytest.raises(ValueError):
+        build_qr_pdf([], "http://vote.test")
+    rv = admin_client.post("/admin/generate_tokens", data={"count": "0", "format": "pdf"})
+    assert rv.status_code == 302
+    rv = admin_client.get("/admin")
+    assert "1 이상" in rv.get_data(as_text=True)
@@ -0,0 +1,74 @@
+import os
+import re
+import subprocess
+import sys
+
+# 콜드 스타트 예산: import app + 앱 생성(로깅·DB 준비)까지의 시간 (초)
+STARTUP_BUDGET_S = float(os.getenv("STARTUP_BUDGET_S", "2.5"))
+# 토큰을 생성할 때만 필요한 모듈
+LAZY_MODULES = ("qrcode", "PIL", "app.qr_sheets", "concurrent.futures.process")
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def run_python(code, tmp_path):
+    env = dict(
+        os.environ,
+        SECRET_KEY="test",
+        ADMIN_PASSWORD="admin",
+        DB_PATH=str(tmp_path / "data.db"),
+        LOG_DIR=str(tmp_path / "log"),
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            imports[match.group(4)] = int(match.group(2))
+    return result.stdout, imports
+
+
+STARTUP = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "app.app\n"
+    "seconds = time.perf_counter() - start\n"
+    "from app import server\n"
+    "print('startup', seconds, server.default_meeting.schema_changed)\n"
+)
+
+
+def startup_result(out):
+    # 로그도 stdout 으로 나가므로 마지막 결과 줄만 읽음
+    _, seconds, schema_changed = [l for l in out.splitlines() if l.startswith("startup ")][-1].split()
+    return float(seconds), schema_changed == "True"
+
+
+def test_startup_within_budget_and_skips_qr(tmp_path):
+    out, imports = run_python(STARTUP, tmp_path)
+    seconds, _ = startup_result(out)
+    slowest = sorted(imports.items(), key=lambda kv: -kv[1])[:5]
+    assert seconds < STARTUP_BUDGET_S, f"시작 {seconds:.2f}s, 누적 import 상위: {slowest}"
+    assert not [name for name in LAZY_MODULES if name in imports]
+
+
+def test_second_start_skips_schema_work(tmp_path):
+    out, _ = run_python(STARTUP, tmp_path)
+    assert startup_result(out)[1]
+    # 이미 최신 스키마면 create_all·집계 재계산을 건너뜀
+    out, _ = run_python(STARTUP, tmp_path)
+    assert not startup_result(out)[1]
+
+
+def test_package_import_does_not_start_server(tmp_path):
+    # QR 프로세스 풀의 spawn 자식은 app 패키지만 import 하므로 서버 초기화가 일어나면 안 됨
+    _, imports = run_python("import app.qr_batch", tmp_path)
+    assert "app.server" not in imports
+    assert "sqlalchemy" not in imports
+    assert not (tmp_path / "data.db").exists()
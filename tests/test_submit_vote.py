@@ -0,0 +1,97 @@
+import pytest
+
+
+@pytest.fixture(params=["0", "1"], ids=["direct", "group_commit"])
+def server_env(request):
+    return {"VOTE_GROUP_COMMIT": request.param}
+
+
+def count_votes(server):
+    conn = server.db()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def flashes(client):
+    with client.session_transaction() as sess:
+        return [message for _, message in sess.get("_flashes", [])]
+
+
+def test_submit_vote_records_ballots(server, client, seed):
+    seed(vote_ids=("v1", "v2"))
+    rv = client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성", "choice_v2": "반대"})
+    assert rv.status_code == 302
+    assert "2개 항목에 투표가 성공적으로 제출되었습니다." in flashes(client)
+    assert count_votes(server) == 2
+
+
+def test_submit_vote_duplicate_is_excluded(server, client, seed):
+    seed()
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성"})
+    flashes(client)
+    client.get("/vote?token=tok-1")
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "반대"})
+    assert "1개 항목은 이미 투표하여 제외되었습니다." in flashes(client)
+    assert count_votes(server) == 1
+
+
+def test_group_commit_isolates_constraint_violation(server, seed):
+    seed(tokens=("tok-1", "tok-2"))
+    server.vote_writer.submit([("v1", "tok-1", "찬성")])
+    with pytest.raises(server.sqlite3.IntegrityError):
+        server.vote_writer.submit([("v1", "tok-1", "반대")])
+    assert server.vote_writer.submit([("v1", "tok-2", "반대")]) == 1
+    assert count_votes(server) == 2
+
+
+def test_votes_of_deleted_tokens_stay_detached(server, client, seed):
+    seed()
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "찬성"})
+    client.post("/login", data={"password": "admin"})
+    client.post("/admin/delete_tokens")
+    # 지운 토큰의 정수 키는 다시 쓰지 않으므로 새 토큰은 투표하지 않은 상태로 시작
+    conn = server.db()
+    try:
+        conn.execute("INSERT INTO tokens (token, serial_number) VALUES ('tok-2', 1)")
+        conn.commit()
+    finally:
+        conn.close()
+    flashes(client)
+    client.post("/submit_vote", data={"token": "tok-2", "choice_v1": "반대"})
+    assert "1개 항목에 투표가 성공적으로 제출되었습니다." in flashes(client)
+    assert count_votes(server) == 2
+
+
+def submit_json(client, data):
+    return client.post("/submit_vote", data=data, headers={"Accept": "application/json"})
+
+
+def test_fetch_submission_returns_results_without_redirect(server, client, seed):
+    seed(vote_ids=("v1", "v2"))
+    rv = submit_json(client, {"token": "tok-1", "choice_v1": "찬성", "choice_v2": "없는 선택"})
+    assert rv.status_code == 200
+    assert rv.get_json() == {
+        "results": {"v1": "ok", "v2": "invalid_choice"},
+        "messages": [
+            ["success", "1개 항목에 투표가 성공적으로 제출되었습니다."],
+            ["warning", "1개 항목은 종료되었거나 잘못된 선택이라 제외되었습니다."],
+        ],
+    }
+    # flash 를 쓰지 않으므로 세션 쿠키도 건드리지 않음
+    assert "Set-Cookie" not in rv.headers
+    assert count_votes(server) == 1
+
+    rv = submit_json(client, {"token": "tok-1", "choice_v1": "반대"})
+    assert rv.get_json()["results"] == {"v1": "duplicate"}
+    # 다시 열면 이미 투표한 표결을 완료로 표시
+    assert '["v1"]' in client.get("/vote?token=tok-1").get_data(as_text=True)
+
+
+def test_fetch_submission_rejects_unknown_token(server, client, seed):
+    seed()
+    rv = submit_json(client, {"token": "nope", "choice_v1": "찬성"})
+    assert rv.status_code == 403
+    assert rv.get_json()["messages"] == [["error", "유효하지 않거나 만료된 토큰입니다."]]
+    assert count_votes(server) == 0
@@ -0,0 +1,100 @@
+from app.write_queue import insert_ballots
+
+
+def snapshot(server, vote_id="v1"):
+    conn = server.db()
+    try:
+        return server.tallies.snapshot(conn, vote_id)
+    finally:
+        conn.close()
+
+
+def test_tally_updates_on_submit(server, client, seed):
+    seed(tokens=5)
+    for i, choice in enumerate(["찬성", "찬성", "반대"]):
+        client.post("/submit_vote", data={"token": f"tok-{i}", "choice_v1": choice})
+    snap = snapshot(server)
+    assert snap.total == 3
+    assert snap.counts == {"찬성": 2, "반대": 1}
+    assert [r["choice"] for r in snap.recent] == ["반대", "찬성", "찬성"]
+
+
+def test_recent_is_bounded_ring_buffer(server, seed):
+    seed(tokens=15)
+    conn = server.db()
+    try:
+        for i in range(15):
+            ballot = [("v1", f"tok-{i}", 1 if i < 14 else 2)]
+            insert_ballots(conn, ballot)
+            server.tallies.record(conn, ballot)
+        conn.commit()
+    finally:
+        conn.close()
+    snap = snapshot(server)
+    assert snap.total == 15
+    assert len(snap.recent) == server.tallies.recent_size
+    assert snap.recent[0]["choice"] == "반대"
+
+
+def test_rebuild_matches_votes_table(server, seed):
+    seed(tokens=5)
+    conn = server.db()
+    try:
+        insert_ballots(conn, [("v1", "tok-0", 1), ("v1", "tok-1", 2), ("v1", "tok-2", 2)])
+        conn.commit()
+        server.tallies.rebuild(conn)
+    finally:
+        conn.close()
+    snap = snapshot(server)
+    assert snap.total == 3
+    assert snap.counts == {"찬성": 1, "반대": 2}
+    assert [r["choice"] for r in snap.recent] == ["반대", "반대", "찬성"]
+
+
+def test_snapshot_sees_other_workers_inserts(server, client, seed):
+    seed(tokens=5)
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "찬성"})
+    assert snapshot(server).total == 1
+    # 다른 워커의 캐시를 흉내: 새 엔진도 같은 요약 테이블을 읽음
+    other = server.TallyEngine()
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "반대"})
+    conn = server.db()
+    try:
+        assert other.snapshot(conn, "v1").counts == {"찬성": 1, "반대": 1}
+    finally:
+        conn.close()
+    assert snapshot(server).total == 2
+
+
+def test_cleanup_vote_clears_tally(server, client, seed):
+    seed(tokens=5)
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "찬성"})
+    client.post("/login", data={"password": "admin"})
+    client.get("/admin/cleanup_vote/v1")
+    snap = snapshot(server)
+    assert snap.total == 0
+    assert snap.counts == {}
+
+
+def test_results_api(server, client, seed):
+    seed(tokens=5)
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "찬성"})
+    assert client.get("/admin/results/v1").status_code == 302
+    client.post("/login", data={"password": "admin"})
+    rv = client.get("/admin/results/v1")
+    assert rv.status_code == 200
+    assert rv.get_json()["counts"] == {"찬성": 1}
+    assert client.get("/admin/results/missing").status_code == 404
+
+
+def test_status_page_renders_tally(server, client, seed):
+    seed(tokens=5)
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "찬성"})
+    # 익명으로는 페이지도 갱신 채널(스트림·long-poll)도 열리지 않음
+    for url in ("/admin/status?vote_id=v1", "/admin/status/stream?vote_id=v1", "/admin/results/v1?since=0"):
+        rv = client.get(url)
+        assert rv.status_code == 302 and "/login" in rv.headers["Location"]
+    client.post("/login", data={"password": "admin"})
+    rv = client.get("/admin/status?vote_id=v1")
+    assert rv.status_code == 200
+    assert "100.0%" in rv.get_data(as_text=True)
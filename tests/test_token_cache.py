@@ -0,0 +1,135 @@
+import sqlite3
+import pytest
+
+from app.token_cache import BloomFilter, TokenCache
+from app.write_queue import insert_ballots
+
+
+@pytest.fixture
+def server_env():
+    return {"QR_WORKERS": "0"}
+
+
+class CountingConnection:
+    """실행된 SQL 을 기록하는 sqlite3 커넥션 래퍼."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.queries = []
+
+    def execute(self, sql, params=()):
+        self.queries.append(sql)
+        return self._conn.execute(sql, params)
+
+
+@pytest.fixture
+def conn():
+    raw = sqlite3.connect(":memory:")
+    raw.executescript(
+        """
+        CREATE TABLE settings (key VARCHAR PRIMARY KEY, value VARCHAR);
+        CREATE TABLE tokens (id INTEGER PRIMARY KEY, token VARCHAR UNIQUE, serial_number INTEGER);
+        CREATE TABLE vote_items (id INTEGER PRIMARY KEY, vote_id VARCHAR UNIQUE);
+        CREATE TABLE votes (item_id INTEGER, token_id INTEGER, option_id INTEGER, UNIQUE (token_id, item_id));
+        INSERT INTO tokens (token, serial_number) VALUES ('tok-1', 1), ('tok-2', 2);
+        INSERT INTO vote_items (vote_id) VALUES ('v1');
+        INSERT INTO votes VALUES (1, 1, 1);
+        """
+    )
+    yield CountingConnection(raw)
+    raw.close()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    items = [f"tok-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 100
+
+
+def test_repeated_lookup_is_served_from_cache(conn):
+    cache = TokenCache(check_interval=60)
+    entry = cache.get(conn, "tok-1")
+    assert entry.serial_number == 1
+    assert entry.voted == {"v1"}
+
+    conn.queries.clear()
+    for _ in range(5):
+        assert cache.get(conn, "tok-1") is entry
+    assert conn.queries == []
+    assert cache.stats()["hits"] == 5
+    assert cache.stats()["misses"] == 1
+
+
+def test_unknown_token_rejected_without_query(conn):
+    cache = TokenCache(check_interval=60)
+    cache.get(conn, "tok-1")
+    conn.queries.clear()
+    for i in range(50):
+        assert cache.get(conn, f"probe-{i}") is None
+    assert conn.queries == []
+    assert cache.stats()["bloom_rejects"] == 50
+
+
+def test_token_version_bump_rebuilds(conn):
+    cache = TokenCache(check_interval=0)
+    assert cache.get(conn, "tok-3") is None
+    conn.execute("INSERT INTO tokens (token, serial_number) VALUES ('tok-3', 3)")
+    TokenCache.bump(conn)
+    assert cache.get(conn, "tok-3").serial_number == 3
+
+
+def test_mark_voted_updates_cached_entry(conn):
+    cache = TokenCache(check_interval=60)
+    cache.get(conn, "tok-2")
+    cache.mark_voted("tok-2", ["v2"])
+    assert cache.get(conn, "tok-2").voted == {"v2"}
+
+
+def flashes(client):
+    with client.session_transaction() as sess:
+        return [message for _, message in sess.get("_flashes", [])]
+
+
+def test_stale_voted_set_is_refreshed_on_conflict(server, client, seed):
+    seed()
+    client.get("/vote?token=tok-1")
+    # 다른 워커가 같은 토큰으로 먼저 투표 (이 워커의 캐시는 모름)
+    conn = server.db()
+    try:
+        insert_ballots(conn, [("v1", "tok-1", 1)])
+        conn.commit()
+    finally:
+        conn.close()
+
+    client.post("/submit_vote", data={"token": "tok-1", "choice_v1": "반대"})
+    assert "1개 항목은 이미 투표하여 제외되었습니다." in flashes(client)
+
+
+def test_delete_tokens_invalidates_cache(server, client, seed):
+    seed()
+    client.get("/vote?token=tok-1")
+    client.post("/login", data={"password": "admin"})
+    client.post("/admin/delete_tokens")
+    rv = client.get("/vote?token=tok-1")
+    assert "유효하지 않은 토큰입니다.".encode() in rv.data
+
+
+def test_generated_tokens_are_accepted(server, client, seed):
+    seed()
+    client.get("/vote?token=tok-1")
+    client.post("/login", data={"password": "admin"})
+    client.post("/admin/generate_tokens", data={"count": 1, "format": "zip"}).get_data()
+    conn = server.db()
+    try:
+        token = conn.execute("SELECT token FROM tokens WHERE serial_number = 2").fetchone()[0]
+    finally:
+        conn.close()
+    rv = client.get(f"/vote?token={token}")
+    assert "유효하지 않은 토큰입니다.".encode() not in rv.data
+
+    stats = client.get("/admin/cache_stats").get_json()
+    assert stats["token"]["misses"] >= 1
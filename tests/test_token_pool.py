@@ -0,0 +1,190 @@
+import os
+import io
+import subprocess
+import sys
+from zipfile import ZipFile
+import pytest
+
+from app.token_pool import TokenPool, allocate_serials, reset_serials
+
+
+@pytest.fixture
+def server_env():
+    return {
+        "QR_WORKERS": "0",
+        "BASE_URL": "http://vote.test/",
+        "TOKEN_POOL_SIZE": "5",
+        "TOKEN_POOL_BATCH": "3",
+        "TOKEN_POOL_FILL_ON_START": "0",
+    }
+
+
+@pytest.fixture
+def server(server, monkeypatch):
+    # 요청 뒤 백그라운드 채우기 대신 테스트에서 직접 fill() 함
+    monkeypatch.setattr(server.default_meeting.token_pool, "kick", lambda base_url=None: None)
+    yield server
+    server.default_meeting.token_pool.close()
+
+
+def fill(pool):
+    while pool.fill():
+        pass
+
+
+def query(server, sql):
+    conn = server.db()
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def zip_entries(rv):
+    with ZipFile(io.BytesIO(rv.get_data())) as zipf:
+        return {name: zipf.read(name) for name in zipf.namelist()}
+
+
+def test_allocate_serials_does_not_overlap(server):
+    conn = server.db()
+    try:
+        assert list(allocate_serials(conn, 3)) == [1, 2, 3]
+        # 시퀀스를 거치지 않고 들어간 토큰 번호는 건너뜀
+        conn.execute("INSERT INTO tokens (token, serial_number) VALUES ('imported', 10)")
+        assert list(allocate_serials(conn, 2)) == [11, 12]
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_generate_tokens_uses_prerendered_pool(server, admin_client):
+    pool = server.default_meeting.token_pool
+    fill(pool)
+    pooled = query(server, "SELECT token, serial_number, base_url, png FROM token_pool ORDER BY serial_number")
+    assert [row[1] for row in pooled] == [1, 2, 3, 4, 5]
+    assert {row[2] for row in pooled} == {"http://vote.test"}
+    assert all(bytes(row[3]).startswith(b"\x89PNG") for row in pooled)
+    # 예비 토큰은 꺼내기 전까지 투표에 쓸 수 없음
+    assert query(server, "SELECT COUNT(*) FROM tokens")[0][0] == 0
+
+    entries = zip_entries(admin_client.post("/admin/generate_tokens", data={"count": "3"}))
+    assert entries == {f"token_{row[1]:03d}.png": bytes(row[3]) for row in pooled[:3]}
+    assert [row[0] for row in query(server, "SELECT token FROM tokens ORDER BY serial_number")] == [
+        row[0] for row in pooled[:3]
+    ]
+
+    # 예비분이 모자라면 나머지는 그 자리에서 발급
+    entries = zip_entries(admin_client.post("/admin/generate_tokens", data={"count": "4"}))
+    assert sorted(entries) == ["token_004.png", "token_005.png", "token_006.png", "token_007.png"]
+    assert pool.stats() == {"minted": 5, "claimed": 5, "shortfall": 2}
+    assert query(server, "SELECT COUNT(*) FROM token_pool")[0][0] == 0
+
+
+def test_delete_tokens_restarts_serials(server, admin_client):
+    fill(server.default_meeting.token_pool)
+    admin_client.post("/admin/generate_tokens", data={"count": "2"}).get_data()
+    admin_client.post("/admin/delete_tokens")
+    assert query(server, "SELECT COUNT(*) FROM token_pool")[0][0] == 0
+
+    entries = zip_entries(admin_client.post("/admin/generate_tokens", data={"count": "1"}))
+    assert list(entries) == ["token_001.png"]
+
+
+def test_reset_during_fill_discards_batch(server):
+    meeting = server.default_meeting
+
+    class ResettingRenderer:
+        # 렌더링하는 사이에 "모든 의결권 삭제"가 일어난 경우
+        def render(self, items):
+            conn = meeting.db()
+            try:
+                reset_serials(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            return [(serial, b"png") for _, serial in items]
+
+    pool = TokenPool(meeting.db, meeting.new_token, ResettingRenderer, target=3, base_url="http://vote.test")
+    assert pool.fill() == 0
+    assert query(server, "SELECT COUNT(*) FROM token_pool")[0][0] == 0
+
+
+def test_kick_fills_in_background(server):
+    meeting = server.default_meeting
+    pool = TokenPool(
+        meeting.db, meeting.new_token, server.get_qr_renderer, target=4, batch=3, base_url="http://vote.test"
+    )
+    pool.kick()
+    pool._thread.join(30)
+    assert query(server, "SELECT COUNT(*) FROM token_pool")[0][0] == 4
+    assert pool.stats()["minted"] == 4
+
+
+def test_dashboard_does_not_start_refill(server, admin_client, monkeypatch):
+    kicks = []
+    monkeypatch.setattr(server.default_meeting.token_pool, "kick", lambda base_url=None: kicks.append(base_url))
+    assert admin_client.get("/admin").status_code == 200
+    assert kicks == []
+    admin_client.post("/admin/generate_tokens", data={"count": "1"})
+    assert len(kicks) == 1
+
+
+@pytest.mark.parametrize("server_env", [{"BASE_URL": "http://vote.test", "TOKEN_POOL_SIZE": "4", "QR_WORKERS": "0"}])
+def test_startup_fills_pool(server):
+    # 배포 직후 첫 토큰 생성도 예비분에서 꺼내도록 시작할 때 채움
+    server.default_meeting.token_pool._thread.join(30)
+    assert query(server, "SELECT COUNT(*) FROM token_pool")[0][0] == 4
+
+
+def test_only_one_process_fills_at_a_time(server):
+    meeting = server.default_meeting
+    # 같은 DB 를 쓰는 두 워커의 예비분
+    pools = [
+        TokenPool(meeting.db, meeting.new_token, server.get_qr_renderer, target=3, batch=3,
+                  base_url="http://vote.test")
+        for _ in range(2)
+    ]
+    assert pools[0]._acquire_lease()
+    assert pools[1].fill() == 0
+    pools[0]._release_lease()
+    assert pools[1].fill() == 3
+    assert pools[0].fill() == 0
+    assert query(server, "SELECT COUNT(*) FROM token_pool")[0][0] == 3
+
+
+def test_refill_under_gevent_worker(tmp_path):
+    # gunicorn -k gevent 처럼 monkey patch 한 프로세스에서 QR 프로세스 풀로 채움
+    pytest.importorskip("gevent")
+    code = (
+        "from gevent import monkey; monkey.patch_all()\n"
+        "import app, sys\n"
+        "app.app\n"
+        "server = sys.modules['app.server']\n"
+        "pool = server.default_meeting.token_pool\n"
+        "pool.kick()\n"
+        "pool._thread.join(60)\n"
+        "conn = server.db()\n"
+        "print(pool.size(conn), server.get_qr_renderer()._executor is not None)\n"
+        "conn.close()\n"
+    )
+    env = dict(
+        os.environ,
+        SECRET_KEY="test",
+        ADMIN_PASSWORD="admin",
+        DB_PATH=str(tmp_path / "data.db"),
+        LOG_DIR=str(tmp_path / "log"),
+        BASE_URL="http://vote.test",
+        TOKEN_POOL_SIZE="8",
+        TOKEN_POOL_BATCH="4",
+        QR_WORKERS="2",
+        QR_POOL_MIN_BATCH="2",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    size, used_process_pool = result.stdout.split()[-2:]
+    assert int(size) == 8
+    assert used_process_pool == "True"
@@ -0,0 +1,157 @@
+import sqlite3
+
+from app.vote_options import VoteOptions, parse_options
+
+
+def flashes(client):
+    with client.session_transaction() as sess:
+        return [message for _, message in sess.get("_flashes", [])]
+
+
+def stored_votes(server):
+    conn = server.db()
+    try:
+        return [tuple(r) for r in conn.execute(
+            "SELECT tokens.token, votes.option_id FROM votes "
+            "JOIN tokens ON tokens.id = votes.token_id ORDER BY votes.id"
+        )]
+    finally:
+        conn.close()
+
+
+def test_parse_options_normalises():
+    assert parse_options(" 찬성 , 반대,,찬성,  기  권 ") == ("찬성", "반대", "기 권")
+    opts = VoteOptions("v1", parse_options("찬성,반대"), True)
+    assert opts.resolve("2") == 2
+    assert opts.resolve(" 찬성") == 1
+    assert opts.resolve("3") is None
+    assert opts.resolve("모름") is None
+
+
+def test_numeric_labels_and_unicode_digits():
+    # 숫자로 된 선택지 이름은 option_id 보다 먼저 맞춤
+    opts = VoteOptions("v1", parse_options("100,200"), True)
+    assert opts.resolve("100") == 1
+    assert opts.resolve("200") == 2
+    assert opts.resolve("2") == 2
+    # isdigit() 이 참인 유니코드 숫자도 int() 로 읽지 않음
+    for choice in ("²", "١", "１"):
+        assert opts.resolve(choice) is None
+
+
+def test_prefixed_form_value_is_always_an_option_id():
+    # 이름이 option_id 와 겹치는 선택지: "2" 는 1번, "1" 은 2번
+    opts = VoteOptions("v1", parse_options("2,1"), True)
+    assert opts.resolve("id:1") == 1
+    assert opts.resolve("id:2") == 2
+    assert opts.resolve("1") == 2
+    for choice in ("id:3", "id:", "id:²", "id:찬성"):
+        assert opts.resolve(choice) is None
+
+
+def test_ballot_with_numeric_labels_records_picked_option(server, client, seed):
+    seed(tokens=3, options="2,1")
+    body = client.get("/vote?token=tok-0").get_data(as_text=True)
+    # 화면의 "2" 선택지는 1번 option_id 로 제출됨
+    assert 'value="id:1"' in body
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "id:1"})
+    assert stored_votes(server) == [("tok-0", 1)]
+    client.post("/login", data={"password": "admin"})
+    assert client.get("/admin/results/v1").get_json()["counts"] == {"2": 1}
+
+
+def test_ballot_posts_option_ids(server, client, seed):
+    seed(tokens=3, options="찬성,반대,기권")
+    body = client.get("/vote?token=tok-0").get_data(as_text=True)
+    assert 'value="id:3"' in body
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "id:3"})
+    assert stored_votes(server) == [("tok-0", 3)]
+    client.post("/login", data={"password": "admin"})
+    rv = client.get("/admin/results/v1")
+    assert rv.get_json()["counts"] == {"기권": 1}
+
+
+def test_unknown_option_is_rejected(server, client, seed):
+    seed(tokens=3, options="찬성,반대,기권")
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "아무거나"})
+    assert "1개 항목은 종료되었거나 잘못된 선택이라 제외되었습니다." in flashes(client)
+    assert stored_votes(server) == []
+
+
+def test_unicode_digit_choice_is_rejected_not_500(server, client, seed):
+    seed(tokens=3, options="찬성,반대,기권")
+    rv = client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "²"})
+    assert rv.status_code == 302
+    assert "1개 항목은 종료되었거나 잘못된 선택이라 제외되었습니다." in flashes(client)
+    assert stored_votes(server) == []
+
+
+def test_inactive_vote_is_rejected(server, client, seed):
+    seed(tokens=3, vote_ids=(), closed_ids=("v1",), options="찬성,반대,기권")
+    client.post("/submit_vote", data={"token": "tok-0", "choice_v1": "1"})
+    assert "1개 항목은 종료되었거나 잘못된 선택이라 제외되었습니다." in flashes(client)
+    assert stored_votes(server) == []
+
+
+def test_end_vote_invalidates_cache_across_workers(server, client, seed):
+    seed(tokens=3, options="찬성,반대,기권")
+    other = server.OptionCache()
+    conn = server.db()
+    try:
+        assert "v1" in other.active(conn)
+    finally:
+        conn.close()
+
+    client.post("/login", data={"password": "admin"})
+    client.get("/admin/end_vote/v1")
+    conn = server.db()
+    try:
+        assert "v1" not in other.active(conn)
+        # 버전이 그대로면 다시 읽지 않음
+        reloads = other.reloads
+        other.active(conn)
+        assert other.reloads == reloads
+    finally:
+        conn.close()
+
+
+def test_create_vote_stores_normalised_options(server, client, seed):
+    seed(tokens=3, options="찬성,반대,기권")
+    client.post("/login", data={"password": "admin"})
+    client.post("/admin/create_vote", data={"agenda_id": "a1", "title": "새 표결", "options": " 예 ,아니오,예"})
+    conn = server.db()
+    try:
+        row = conn.execute("SELECT options FROM vote_items WHERE title = '새 표결'").fetchone()
+    finally:
+        conn.close()
+    assert row[0] == "예,아니오"
+
+
+def test_existing_database_is_migrated_on_startup(tmp_path, request):
+    # 선택지 문자열을 저장하던 이전 data.db (server fixture 가 여는 경로에 미리 만듦)
+    path = tmp_path / "test.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE settings (key VARCHAR PRIMARY KEY, value VARCHAR);
+        CREATE TABLE tokens (token VARCHAR PRIMARY KEY, serial_number INTEGER, created_at DATETIME);
+        CREATE TABLE vote_agendas (agenda_id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, created_at DATETIME);
+        CREATE TABLE vote_items (vote_id VARCHAR PRIMARY KEY, agenda_id VARCHAR NOT NULL,
+            title VARCHAR NOT NULL, options VARCHAR NOT NULL, is_active BOOLEAN, created_at DATETIME);
+        CREATE TABLE votes (id INTEGER PRIMARY KEY AUTOINCREMENT, vote_id VARCHAR, token VARCHAR,
+            choice VARCHAR, timestamp DATETIME, voter_name VARCHAR, UNIQUE (token, vote_id));
+        CREATE TABLE vote_tallies (vote_id VARCHAR, choice VARCHAR, count INTEGER, PRIMARY KEY (vote_id, choice));
+        INSERT INTO settings VALUES ('schema_version', '1');
+        INSERT INTO vote_items VALUES ('v1', 'a1', '찬반', '찬성,반대', 1, NULL);
+        INSERT INTO tokens VALUES ('t1', 1, NULL), ('t2', 2, NULL);
+        INSERT INTO votes (vote_id, token, choice) VALUES ('v1', 't1', '반대'), ('v1', 't2', '반대');
+        """
+    )
+    conn.close()
+
+    server = request.getfixturevalue("server")
+    conn = server.db()
+    try:
+        assert server.tallies.snapshot(conn, "v1").counts == {"반대": 2}
+    finally:
+        conn.close()